@@ -70,8 +70,8 @@ def create_button_demo():
     status_font = app.theme_manager.get_font('status')
     
     info_text = f"""
-当前按钮字体：{button_font[1]}pt {button_font[2]}
-当前状态字体：{status_font[1]}pt {status_font[2]}
+当前按钮字体：{button_font.cget('size')}pt {button_font.cget('weight')}
+当前状态字体：{status_font.cget('size')}pt {status_font.cget('weight')}
 窗口缩放因子：{getattr(app, 'current_scale_factor', 1.0):.2f}x
     """
     
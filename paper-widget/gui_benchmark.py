@@ -0,0 +1,479 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+界面性能基准测试（可在无显示器的环境中自动运行）
+在虚拟X服务器（Xvfb）中运行 PaperWidget，数据来自按随机种子生成的合成缓存，
+依次测量刷新、调整窗口大小、切换主题、滚动和冷启动，每项先预热再多次测量，
+输出各项的百分位数（JSON），并按阈值和基线检查性能回退，回退时以非零状态退出。
+
+用法:
+    python gui_benchmark.py                                  # 结果写入 gui_benchmark.json
+    python gui_benchmark.py --baseline old.json              # 与上一版本比较
+    python gui_benchmark.py --thresholds limits.json         # 自定义绝对阈值
+    python gui_benchmark.py --warmup 0 --iterations 1 --cold-iterations 1 --papers 200
+                                                             # 冒烟测试：确认各场景都能完成
+
+基线：仓库中没有预先记录的基线（各机器的绝对耗时不可比）。在用于比较的机器上对基准提交
+运行一次，把输出的JSON作为之后的 --baseline；没有基线时只按阈值检查。
+某个场景的界面一直不收敛时，pump_until 超时并报告场景名称和虚拟列表的状态。
+"""
+
+import time
+
+# 冷启动子进程的计时起点（在其余导入之前记录）
+STARTED_AT = time.perf_counter()
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+
+# 各场景 p95 的默认上限（毫秒），可用 --thresholds 覆盖
+DEFAULT_THRESHOLDS = {
+    'refresh': {'p95': 250},
+    'resize': {'p95': 150},
+    'theme_switch': {'p95': 400},
+    'scroll': {'p95': 50},
+    'cold_start': {'p95': 4000},
+    'cold_start_snapshot': {'p95': 3000},
+}
+
+# 与基线比较时检查的统计量
+BASELINE_METRICS = ('p50', 'p95')
+
+# 交替调整到的窗口尺寸（宽度跨过缩放档位，既有换行变化也有字号变化）
+RESIZE_SIZES = [(700, 800), (950, 900), (600, 700), (1200, 1000), (820, 850)]
+
+CONFERENCES = {
+    'ai': ['NeurIPS', 'ICML', 'ICLR', 'AAAI', 'CVPR', 'ICCV', 'ACL', 'EMNLP'],
+    'security': ['IEEE S&P', 'USENIX Security', 'CCS', 'NDSS'],
+}
+
+WORDS = ('learning neural robust secure adversarial graph transformer attack privacy '
+         'federated diffusion language vision model detection efficient scalable '
+         'benchmark inference reasoning agent defense protocol network').split()
+
+
+# ---------------------------------------------------------------------------
+# 环境准备
+# ---------------------------------------------------------------------------
+
+def start_virtual_display(width=1280, height=1024):
+    """没有显示器时启动 Xvfb，返回进程（已有 DISPLAY 或非X11平台时返回None）"""
+    if not sys.platform.startswith('linux') or os.environ.get('DISPLAY'):
+        return None
+
+    xvfb = shutil.which('Xvfb')
+    if xvfb is None:
+        raise RuntimeError("没有可用的显示器，且未安装 Xvfb")
+
+    for display in range(99, 199):
+        if os.path.exists(f"/tmp/.X11-unix/X{display}") or os.path.exists(f"/tmp/.X{display}-lock"):
+            continue
+        process = subprocess.Popen(
+            [xvfb, f":{display}", '-screen', '0', f'{width}x{height}x24', '-nolisten', 'tcp'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        # 等待X服务器就绪
+        for _ in range(50):
+            if os.path.exists(f"/tmp/.X11-unix/X{display}"):
+                os.environ['DISPLAY'] = f":{display}"
+                return process
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+        process.kill()
+    raise RuntimeError("无法启动 Xvfb")
+
+
+def synthetic_papers(count, seed):
+    """按随机种子生成合成论文（同一种子每次相同）"""
+    rng = random.Random(seed)
+    today = datetime.now()
+    papers = []
+    for i in range(count):
+        conference_type = rng.choice(list(CONFERENCES))
+        title_words = rng.randint(6, 22)
+        author_count = rng.randint(1, 12)
+        papers.append({
+            'id': f"{2500 + i // 10000}.{i % 10000:05d}",
+            'version': 1,
+            'title': ' '.join(rng.choice(WORDS) for _ in range(title_words)).capitalize(),
+            'authors': ', '.join(f"Author{rng.randint(1, count)} Name{rng.randint(1, 500)}"
+                                 for _ in range(author_count)),
+            'published': (today - timedelta(days=rng.randint(0, 60))).strftime('%Y-%m-%d'),
+            'pdf_url': f"http://arxiv.org/pdf/{2500 + i // 10000}.{i % 10000:05d}v1",
+            'conference': rng.choice(CONFERENCES[conference_type]),
+            'conference_year': str(today.year),
+            'confidence': round(rng.uniform(0.75, 1.0), 3),
+            'categories': 'cs.LG' if conference_type == 'ai' else 'cs.CR',
+            'abstract': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(80, 200))),
+            'comment': f"Accepted at {rng.choice(CONFERENCES[conference_type])}",
+        })
+    return papers
+
+
+def prepare_workspace(args):
+    """在临时目录中准备配置文件和合成缓存，返回 (配置路径, 数据库路径)"""
+    workspace = args.workspace
+    os.makedirs(os.path.join(workspace, 'data'), exist_ok=True)
+
+    with open(os.path.join(ROOT_DIR, 'config.json'), 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    config['settings'].update({
+        'papers_per_refresh': args.papers_per_refresh,
+        'window_width': 700,
+        'window_height': 800,
+        'followed_authors_only': False,
+        'card_renderer': args.renderer,
+    })
+    config_path = os.path.join(workspace, 'config.json')
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+
+    db_path = os.path.join(workspace, 'data', 'papers_cache.db')
+    if not os.path.exists(db_path):
+        from api.arxiv_fetcher_fuzzy import FuzzyArxivFetcher
+        from api.database import DatabaseManager
+
+        fetcher = FuzzyArxivFetcher(config=config, db=DatabaseManager(db_path))
+        fetcher.save_papers_to_cache(synthetic_papers(args.papers, args.seed))
+    return config_path, db_path
+
+
+def create_widget(config_path, db_path, started_at=None):
+    from api.app_context import configure_app_context
+    from gui.main_window import PaperWidget
+
+    configure_app_context(config_path, db_path)
+    return PaperWidget(started_at=started_at)
+
+
+# ---------------------------------------------------------------------------
+# 测量
+# ---------------------------------------------------------------------------
+
+def pump_until(root, predicate, timeout=10.0, what="界面响应", describe=None):
+    """
+    处理Tk事件（含空闲回调）直到条件满足，超时抛出异常
+    what: 等待的内容（出现在超时信息中）；describe: 返回当前状态描述的函数，便于定位不收敛的条件
+    """
+    deadline = time.perf_counter() + timeout
+    while True:
+        root.update()
+        if predicate():
+            return
+        if time.perf_counter() > deadline:
+            state = f"：{describe()}" if describe is not None else ""
+            raise TimeoutError(f"等待{what}超时（{timeout:g}s）{state}")
+        time.sleep(0.0005)
+
+
+def list_settled(app):
+    """虚拟列表没有待处理的可见范围更新和分块渲染"""
+    return app.card_list._update_pending is None and app.card_list._render_pending is None
+
+
+def describe_app(app):
+    """超时信息中的界面状态"""
+    card_list = app.card_list
+    return (f"update_pending={card_list._update_pending is not None} "
+            f"render_pending={card_list._render_pending is not None} "
+            f"pending_indices={len(card_list._pending_indices)} active={len(card_list.active)} "
+            f"count={card_list.count} resize_timer={app.resize_timer is not None} "
+            f"window={app.root.winfo_width()}x{app.root.winfo_height()} last_size={app.last_window_size}")
+
+
+def percentile(sorted_values, fraction):
+    """线性插值的百分位数"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(samples):
+    values = sorted(samples)
+    return {
+        'count': len(values),
+        'min': values[0],
+        'mean': sum(values) / len(values),
+        'p50': percentile(values, 0.50),
+        'p90': percentile(values, 0.90),
+        'p95': percentile(values, 0.95),
+        'p99': percentile(values, 0.99),
+        'max': values[-1],
+        'samples': [round(value, 3) for value in samples],
+    }
+
+
+def measure(name, action, warmup, iterations):
+    """预热后多次执行 action（返回毫秒数），汇总为统计结果"""
+    for _ in range(warmup):
+        action()
+    samples = [action() for _ in range(iterations)]
+    result = summarize(samples)
+    print(f"  {name:<20} p50 {result['p50']:8.2f} ms   p95 {result['p95']:8.2f} ms   max {result['max']:8.2f} ms")
+    return result
+
+
+def bench_refresh(app):
+    """从点击刷新到新一批卡片绘制完成"""
+    shown = []
+    original = app._show_papers
+
+    def show_papers(papers):
+        original(papers)
+        shown.append(True)
+
+    app._show_papers = show_papers
+
+    def action():
+        shown.clear()
+        start = time.perf_counter()
+        app.refresh_papers()
+        pump_until(app.root, lambda: shown and list_settled(app),
+                   what="刷新完成", describe=lambda: f"shown={bool(shown)} {describe_app(app)}")
+        return (time.perf_counter() - start) * 1000
+
+    return action
+
+
+def bench_resize(app):
+    """从改变窗口大小到字号、换行和卡片位置更新完成"""
+    sizes = iter(RESIZE_SIZES * 1000)
+
+    def action():
+        width, height = next(sizes)
+        start = time.perf_counter()
+        app.root.geometry(f"{width}x{height}")
+        pump_until(app.root, lambda: (app.last_window_size == (width, height)
+                                      and app.resize_timer is None and list_settled(app)),
+                   what=f"调整到 {width}x{height}", describe=lambda: describe_app(app))
+        return (time.perf_counter() - start) * 1000
+
+    return action
+
+
+def bench_theme_switch(app):
+    """切换主题并完成重新着色和余量区补齐"""
+    def action():
+        start = time.perf_counter()
+        app.toggle_theme()
+        pump_until(app.root, lambda: list_settled(app), what="主题切换完成", describe=lambda: describe_app(app))
+        return (time.perf_counter() - start) * 1000
+
+    return action
+
+
+def bench_scroll(app):
+    """滚动一步并完成可见范围更新（到底部后回到顶部）"""
+    canvas = app.canvas
+
+    def action():
+        if canvas.yview()[1] >= 1.0:
+            canvas.yview_moveto(0)
+            app.root.update()
+        start = time.perf_counter()
+        canvas.yview_scroll(3, "units")
+        pump_until(app.root, lambda: list_settled(app), what="滚动完成", describe=lambda: describe_app(app))
+        return (time.perf_counter() - start) * 1000
+
+    return action
+
+
+def bench_cold_start(args, keep_snapshot):
+    """每次在新进程中启动窗口，测量到首张卡片绘制完成的时间"""
+    snapshot_path = os.path.join(args.workspace, 'data', 'last_view.json')
+
+    def action():
+        if not keep_snapshot and os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
+        child = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--cold-start-child', '--workspace', args.workspace],
+            capture_output=True, text=True, env=os.environ.copy(), timeout=120
+        )
+        if child.returncode != 0:
+            # 子进程的超时信息（含界面状态）在 stderr 的最后几行
+            raise RuntimeError("冷启动子进程失败:\n" + "\n".join(child.stderr.strip().splitlines()[-5:]))
+        # 子进程最后一行是结果JSON，之前可能有日志输出
+        return json.loads(child.stdout.strip().splitlines()[-1])['first_card_ms']
+
+    return action
+
+
+def run_cold_start_child(args):
+    """冷启动子进程：启动窗口，等首张卡片绘制完成，保存快照后输出耗时"""
+    config_path = os.path.join(args.workspace, 'config.json')
+    db_path = os.path.join(args.workspace, 'data', 'papers_cache.db')
+    app = create_widget(config_path, db_path, started_at=STARTED_AT)
+    pump_until(app.root, lambda: 'first_card_ms' in app.startup_metrics, timeout=60,
+               what="首张卡片", describe=lambda: describe_app(app))
+    app.save_view_snapshot()
+    app.root.destroy()
+    print(json.dumps(app.startup_metrics))
+
+
+def run_benchmarks(args):
+    config_path, db_path = prepare_workspace(args)
+
+    results = {}
+    print("冷启动（新进程）:")
+    results['cold_start'] = measure('cold_start', bench_cold_start(args, keep_snapshot=False),
+                                    min(args.warmup, 1), args.cold_iterations)
+    # 上面最后一次运行已保存快照
+    results['cold_start_snapshot'] = measure('cold_start_snapshot', bench_cold_start(args, keep_snapshot=True),
+                                             min(args.warmup, 1), args.cold_iterations)
+
+    print("交互（同一窗口）:")
+    app = create_widget(config_path, db_path)
+    app.root.geometry("700x800+0+0")
+    pump_until(app.root, lambda: bool(app.current_papers), timeout=60,
+               what="初始论文", describe=lambda: describe_app(app))
+
+    for name, factory in (('refresh', bench_refresh), ('resize', bench_resize),
+                          ('theme_switch', bench_theme_switch), ('scroll', bench_scroll)):
+        results[name] = measure(name, factory(app), args.warmup, args.iterations)
+
+    app.root.destroy()
+    return results
+
+
+# ---------------------------------------------------------------------------
+# 回退检查
+# ---------------------------------------------------------------------------
+
+def check_regressions(results, thresholds, baseline, max_regression, noise_floor):
+    """返回回退说明列表：超过绝对阈值，或比基线慢超过 max_regression（且差值超过噪声下限）"""
+    failures = []
+    for scenario, limits in thresholds.items():
+        stats = results.get(scenario)
+        if stats is None:
+            continue
+        for metric, limit in limits.items():
+            if stats[metric] > limit:
+                failures.append(f"{scenario}.{metric} = {stats[metric]:.2f} ms，超过阈值 {limit} ms")
+
+    if baseline:
+        for scenario, stats in results.items():
+            old = baseline.get(scenario)
+            if not old:
+                continue
+            for metric in BASELINE_METRICS:
+                if metric not in old:
+                    continue
+                allowed = old[metric] * (1 + max_regression)
+                if stats[metric] > allowed and stats[metric] - old[metric] > noise_floor:
+                    failures.append(f"{scenario}.{metric} = {stats[metric]:.2f} ms，"
+                                    f"基线 {old[metric]:.2f} ms（+{(stats[metric] / old[metric] - 1) * 100:.0f}%）")
+    return failures
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="论文推送组件界面性能基准测试")
+    parser.add_argument('--output', default='gui_benchmark.json', help="结果JSON文件")
+    parser.add_argument('--baseline', help="上一版本的结果JSON，用于检查回退")
+    parser.add_argument('--thresholds', help="各场景绝对阈值JSON，如 {\"refresh\": {\"p95\": 200}}")
+    parser.add_argument('--max-regression', type=float, default=0.25, help="相对基线允许变慢的比例")
+    parser.add_argument('--noise-floor', type=float, default=2.0, help="小于该毫秒数的变化不算回退")
+    parser.add_argument('--papers', type=int, default=2000, help="合成缓存中的论文数")
+    parser.add_argument('--papers-per-refresh', type=int, default=100, help="每次刷新显示的论文数")
+    parser.add_argument('--renderer', choices=('widgets', 'canvas'), default='widgets', help="卡片渲染方式")
+    parser.add_argument('--seed', type=int, default=42, help="合成数据的随机种子")
+    parser.add_argument('--warmup', type=int, default=3, help="每项预热次数")
+    parser.add_argument('--iterations', type=int, default=30, help="每项测量次数")
+    parser.add_argument('--cold-iterations', type=int, default=5, help="冷启动测量次数")
+    parser.add_argument('--workspace', help="合成缓存所在目录（默认使用临时目录）")
+    parser.add_argument('--cold-start-child', action='store_true', help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.cold_start_child:
+        run_cold_start_child(args)
+        return 0
+
+    temp_dir = None
+    if args.workspace is None:
+        temp_dir = tempfile.mkdtemp(prefix='paper_widget_bench_')
+        args.workspace = temp_dir
+
+    display = start_virtual_display()
+    try:
+        results = run_benchmarks(args)
+    finally:
+        if display is not None:
+            display.terminate()
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    if args.thresholds:
+        with open(args.thresholds, 'r', encoding='utf-8') as f:
+            thresholds.update(json.load(f))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get('results')
+
+    failures = check_regressions(results, thresholds, baseline, args.max_regression, args.noise_floor)
+
+    import tkinter as tk
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'environment': {
+            'python': platform.python_version(),
+            'tk': tk.TkVersion,
+            'platform': platform.platform(),
+        },
+        'parameters': {
+            'papers': args.papers,
+            'papers_per_refresh': args.papers_per_refresh,
+            'renderer': args.renderer,
+            'seed': args.seed,
+            'warmup': args.warmup,
+            'iterations': args.iterations,
+            'cold_iterations': args.cold_iterations,
+        },
+        'results': results,
+        'thresholds': thresholds,
+        'regressions': failures,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已写入 {args.output}")
+
+    if failures:
+        print("\n性能回退:")
+        for failure in failures:
+            print(f"  ✗ {failure}")
+        return 1
+    print("未发现性能回退")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
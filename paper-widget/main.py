@@ -1,27 +1,36 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import time
+
+# 进程启动时刻（在其余导入之前记录），用于统计首张卡片的显示耗时
+STARTED_AT = time.perf_counter()
+
 import sys
 import os
-import tkinter as tk
-from tkinter import messagebox
-import threading
-import json
 
 # 添加src目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+# 启动分析模式（PAPER_WIDGET_PROFILE_STARTUP=1 或 --profile-startup）：统计之后每个导入的耗时
+from gui.startup_profile import ImportProfiler, profiling_requested
+PROFILER = ImportProfiler() if profiling_requested() else None
+if PROFILER is not None:
+    PROFILER.install()
+
+import tkinter as tk
+from tkinter import messagebox
+
 from gui.main_window import PaperWidget
 from gui.tray_icon import TrayIcon
-try:
-    from api.arxiv_fetcher_fuzzy import FuzzyArxivFetcher as ArxivFetcher
-except ImportError:
-    from api.arxiv_fetcher import ArxivFetcher
+
+if PROFILER is not None:
+    PROFILER.mark("导入模块")
 
 class PaperWidgetApp:
     def __init__(self):
         # 创建主窗口
-        self.widget = PaperWidget()
+        self.widget = PaperWidget(started_at=STARTED_AT)
         
         # 创建托盘图标
         self.tray_icon = TrayIcon(self.widget)
@@ -43,7 +52,7 @@ class PaperWidgetApp:
     
     def check_initial_data(self):
         """检查是否需要初始化数据"""
-        db_path = os.path.join("data", "papers_cache.db")
+        db_path = self.widget.context.db.path
         
         if not os.path.exists(db_path) or os.path.getsize(db_path) < 1000:
             # 数据库不存在或为空，提示用户
@@ -53,18 +62,8 @@ class PaperWidgetApp:
             )
             
             if response:
-                # 在后台线程中更新数据
-                def init_data():
-                    try:
-                        fetcher = ArxivFetcher()
-                        fetcher.update_cache()
-                        self.widget.root.after(0, lambda: messagebox.showinfo("完成", "论文数据初始化完成！"))
-                        self.widget.root.after(0, self.widget.refresh_papers)
-                    except Exception as e:
-                        self.widget.root.after(0, lambda: messagebox.showerror("错误", f"初始化失败: {str(e)}"))
-                
-                thread = threading.Thread(target=init_data, daemon=True)
-                thread.start()
+                # 使用窗口共享的获取器在后台更新（带进度和取消），不再另建获取器与之并发写库
+                self.widget.update_cache_async()
     
     def run(self):
         """运行应用程序"""
@@ -74,6 +73,12 @@ class PaperWidgetApp:
         # 运行主窗口
         self.widget.run()
 
+def report_startup_profile():
+    """首次绘制完成后输出启动分析报告"""
+    PROFILER.mark("首次绘制")
+    PROFILER.uninstall()
+    print(PROFILER.report())
+
 def main():
     """主函数"""
     try:
@@ -89,6 +94,9 @@ def main():
         
         # 创建并运行应用
         app = PaperWidgetApp()
+        if PROFILER is not None:
+            PROFILER.mark("创建窗口")
+            app.widget.root.after_idle(report_startup_profile)
         app.run()
         
     except Exception as e:
@@ -67,6 +67,7 @@ class PerformanceMonitor:
             print(f"最大耗时: {max_time:.2f}ms")
             print(f"最小耗时: {min_time:.2f}ms")
             print(f"性能等级: {'优秀' if avg_time < 50 else '良好' if avg_time < 100 else '一般' if avg_time < 200 else '需优化'}")
+            print(f"原地更新的换行标签数: {self.app.layout.get_wrap_label_count()}")
         
     def test_scroll_smoothness(self):
         """测试滚动流畅度"""
@@ -131,6 +132,7 @@ class PerformanceMonitor:
             print(f"平均切换耗时: {avg_switch_time:.2f}ms")
             print(f"最大切换耗时: {max_switch_time:.2f}ms")
             print(f"切换性能: {'优秀' if avg_switch_time < 100 else '良好' if avg_switch_time < 200 else '一般' if avg_switch_time < 500 else '需优化'}")
+            print(f"原地着色控件数: {self.app.theme_manager.get_themed_widget_count()}")
     
     def run_all_tests(self):
         """运行所有性能测试"""
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+性能分析隔离测试 - 刷新和并行的数据库更新各自只统计自己的耗时
+刷新的查询经数据服务交给工作线程执行，其耗时应计入刷新；
+同时在另一个线程中进行的更新（分页下载）不应计入刷新的报告。
+不需要显示器，直接运行：python profiling_test.py
+"""
+
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from api import profiling
+from gui.data_service import PaperDataService
+
+
+class QueueDispatcher:
+    """代替 UIDispatcher：回调放进队列，由主线程取出执行"""
+
+    def __init__(self):
+        self.callbacks = queue.Queue()
+
+    def post(self, callback, *args):
+        self.callbacks.put((callback, args))
+
+    def run_one(self, timeout=5):
+        callback, args = self.callbacks.get(timeout=timeout)
+        callback(*args)
+
+
+@profiling.profiled('db', 'random_papers')
+def slow_query():
+    time.sleep(0.05)
+    return ['paper']
+
+
+def slow_pages(pages):
+    for page in range(pages):
+        time.sleep(0.1)
+        yield page
+
+
+def run_update(update_started, runs):
+    @profiling.profiled_run('update')
+    def update():
+        runs['update'] = profiling.current_run()
+        update_started.set()
+        for _ in profiling.timed_iter('network', slow_pages(5)):
+            pass
+
+    update()
+
+
+def main():
+    profiling.set_enabled(True)
+    profiling.set_report_dir(tempfile.mkdtemp(prefix="paper-widget-profiles-"))
+
+    dispatcher = QueueDispatcher()
+    data_service = PaperDataService(dispatcher, lambda: None)
+
+    runs = {}
+    update_started = threading.Event()
+    update_thread = threading.Thread(target=run_update, args=(update_started, runs))
+    update_thread.start()
+    update_started.wait()
+
+    # 更新的第一页下载进行到一半时开始刷新
+    time.sleep(0.05)
+    refresh = profiling.start_run('refresh')
+    with profiling.activate(refresh):
+        data_service.submit(slow_query, lambda papers: None)
+
+    # 结果回到“主线程”后绘制
+    dispatcher.run_one()
+    with profiling.activate(refresh), profiling.span('tk', 'show_papers'):
+        time.sleep(0.02)
+    refresh_report = profiling.finish_run(refresh)
+    update_thread.join()
+
+    update = runs['update']
+    print(f"刷新: {refresh.category_seconds}")
+    print(f"更新: {update.category_seconds}")
+    print(f"刷新报告: {refresh_report}")
+
+    assert refresh.category_seconds['network'] == 0.0, "刷新报告中混入了更新的网络耗时"
+    assert 0.04 <= refresh.category_seconds['db'] < 0.2, "工作线程中的查询没有计入刷新"
+    assert 0.01 <= refresh.category_seconds['tk'] < 0.2
+    assert update.category_seconds['db'] == 0.0, "更新报告中混入了刷新的数据库耗时"
+    assert 0.45 <= update.category_seconds['network'] < 1.0
+
+    # 分析开始之前就已开始的埋点不计入
+    late = profiling.start_run('late')
+    with profiling.span('db', 'before'):
+        with profiling.activate(late):
+            pass
+    profiling.finish_run(late)
+    assert late.category_seconds['db'] == 0.0
+
+    print("✅ 性能分析隔离测试通过")
+
+
+if __name__ == "__main__":
+    main()
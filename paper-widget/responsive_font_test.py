@@ -55,9 +55,9 @@ def test_responsive_fonts():
             current_scale = getattr(app, 'current_scale_factor', 1.0)
             print(f"当前缩放因子: {current_scale:.2f}")
             
-            # 检查字体缓存是否被正确清除
-            font_cache_size = len(getattr(app.theme_manager, '_font_cache', {}))
-            print(f"字体缓存大小: {font_cache_size}")
+            # 共享字体数量（每个字体角色一个，不随缩放增加）
+            font_count = len(getattr(app.theme_manager, '_named_fonts', {}))
+            print(f"共享字体数量: {font_count}")
             
             # 模拟用户操作：刷新论文显示
             if app.current_papers:
@@ -66,9 +66,9 @@ def test_responsive_fonts():
                 app.root.update()
                 
                 # 验证字体是否正确应用了缩放
-                test_font = app.theme_manager.get_font('title', current_scale)
+                test_font = app.theme_manager.get_font('title')
                 expected_size = max(8, int(16 * current_scale))  # 基础标题字体是16
-                actual_size = test_font[1]
+                actual_size = test_font.cget('size')
                 
                 print(f"标题字体期望大小: {expected_size}, 实际大小: {actual_size}")
                 
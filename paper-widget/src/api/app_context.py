@@ -0,0 +1,128 @@
+"""
+进程级应用上下文
+整个进程共用一份解析后的 config.json、一个数据库管理器和一个获取器（含匹配器），
+界面、托盘和首次初始化都从这里取，不再各自读取配置、初始化数据库和创建获取器。
+config.json 在磁盘上被修改后可热重载：配置字典原地更新，获取器下次读取即生效。
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set
+
+try:
+    from .database import DatabaseManager
+    from .arxiv_fetcher_fuzzy import FuzzyArxivFetcher as ArxivFetcher
+except ImportError:
+    from database import DatabaseManager
+    from arxiv_fetcher_fuzzy import FuzzyArxivFetcher as ArxivFetcher
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_CONFIG_PATH = os.path.join(ROOT_DIR, "config.json")
+DEFAULT_DB_PATH = os.path.join(ROOT_DIR, "data", "papers_cache.db")
+
+# 配置重新加载后的回调：参数为发生变化的顶层配置项名称
+ConfigListener = Callable[[Set[str]], None]
+
+
+def _load_config(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    if not isinstance(config, dict) or not isinstance(config.get('settings'), dict):
+        raise ValueError("配置文件缺少 settings")
+    return config
+
+
+class AppContext:
+    """进程内唯一的配置、数据库管理器和获取器"""
+
+    def __init__(self, config_path: str = DEFAULT_CONFIG_PATH, db_path: str = DEFAULT_DB_PATH):
+        self.config_path = config_path
+        self.config = _load_config(config_path)
+        self._config_mtime = self._stat_config()
+
+        self.db = DatabaseManager(db_path)
+        self.fetcher_class = ArxivFetcher
+
+        self._fetcher = None
+        self._fetcher_lock = threading.Lock()
+        self._config_listeners: List[ConfigListener] = []
+
+    def get_fetcher(self):
+        """返回共享的获取器，首次调用时创建（数据库迁移在此执行，可在后台线程中调用）"""
+        with self._fetcher_lock:
+            if self._fetcher is None:
+                self._fetcher = self.fetcher_class(config=self.config, db=self.db)
+            return self._fetcher
+
+    def add_config_listener(self, callback: ConfigListener):
+        self._config_listeners.append(callback)
+
+    def reload_if_changed(self) -> bool:
+        """
+        配置文件修改时间变化时重新加载（由界面定时调用，未变化时只有一次 stat）
+        新配置无法解析时保留旧配置；成功后原地更新配置字典并通知监听者
+        返回：是否加载了新配置
+        """
+        mtime = self._stat_config()
+        if mtime == self._config_mtime:
+            return False
+        self._config_mtime = mtime
+
+        try:
+            new_config = _load_config(self.config_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"配置文件无效，继续使用当前配置: {e}")
+            return False
+
+        changed = {key for key in set(self.config) | set(new_config)
+                   if self.config.get(key) != new_config.get(key)}
+        if not changed:
+            return False
+
+        # 逐项替换而不是清空后重建，后台线程读取时不会看到空配置
+        for key in changed:
+            if key in new_config:
+                self.config[key] = new_config[key]
+            else:
+                del self.config[key]
+
+        logger.info(f"配置已重新加载: {', '.join(sorted(changed))}")
+        for callback in self._config_listeners:
+            callback(changed)
+        return True
+
+    def _stat_config(self) -> Optional[int]:
+        try:
+            return os.stat(self.config_path).st_mtime_ns
+        except OSError:
+            return None
+
+
+_context: Optional[AppContext] = None
+_context_lock = threading.Lock()
+
+
+def configure_app_context(config_path: str = DEFAULT_CONFIG_PATH, db_path: str = DEFAULT_DB_PATH) -> AppContext:
+    """
+    使用指定的配置文件和数据库创建进程的应用上下文（如基准测试使用临时目录）
+    必须在第一次 get_app_context() 之前调用
+    """
+    global _context
+    with _context_lock:
+        if _context is not None:
+            raise RuntimeError("应用上下文已创建")
+        _context = AppContext(config_path, db_path)
+        return _context
+
+
+def get_app_context() -> AppContext:
+    """返回进程内唯一的应用上下文（首次调用时读取配置）"""
+    global _context
+    with _context_lock:
+        if _context is None:
+            _context = AppContext()
+        return _context
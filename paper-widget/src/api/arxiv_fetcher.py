@@ -1,52 +1,53 @@
-import arxiv
 import json
-import sqlite3
 import os
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import re
 
+try:
+    from .text_store import save_texts, load_texts
+    from . import author_index
+    from .arxiv_ids import parse_arxiv_id, select_newer_versions
+    from .database import DatabaseManager, writes_database
+    from . import retention
+except ImportError:
+    from text_store import save_texts, load_texts
+    import author_index
+    from arxiv_ids import parse_arxiv_id, select_newer_versions
+    from database import DatabaseManager, writes_database
+    import retention
+
 class ArxivFetcher:
-    def __init__(self, config_path: str = None):
-        if config_path is None:
-            # 获取项目根目录的配置文件路径
-            root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            config_path = os.path.join(root_dir, "config.json")
-        
-        with open(config_path, 'r', encoding='utf-8') as f:
-            self.config = json.load(f)
+    def __init__(self, config_path: str = None,
+                 config: Optional[Dict[str, Any]] = None, db: Optional[DatabaseManager] = None):
+        # config / db: 应用上下文共享的配置和数据库管理器，不传时自行读取
+        if config is None:
+            if config_path is None:
+                # 获取项目根目录的配置文件路径
+                root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+                config_path = os.path.join(root_dir, "config.json")
+            
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        self.config = config
         
         # 使用项目根目录的data文件夹
-        root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        self.db_path = os.path.join(root_dir, "data", "papers_cache.db")
+        if db is None:
+            root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            db = DatabaseManager(os.path.join(root_dir, "data", "papers_cache.db"))
+        self.db = db
+        self.db_path = db.path
         self._init_database()
         
     def _init_database(self):
-        # 确保data目录存在
-        data_dir = os.path.dirname(self.db_path)
-        os.makedirs(data_dir, exist_ok=True)
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS papers (
-                id TEXT PRIMARY KEY,
-                title TEXT NOT NULL,
-                authors TEXT NOT NULL,
-                abstract TEXT,
-                published DATE NOT NULL,
-                pdf_url TEXT,
-                conference TEXT,
-                categories TEXT,
-                fetched_date DATE DEFAULT CURRENT_DATE
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        # 确保data目录存在，并按版本原地升级表结构（共享的管理器只迁移一次）
+        self.db.initialize()
     
     def fetch_recent_papers(self, days_back: int = 90) -> List[Dict[str, Any]]:
         """获取最近指定天数内的论文"""
+        # arxiv 库较重，只在真正联网获取时导入
+        import arxiv
+        
         categories = self.config['settings']['arxiv_categories']
         papers = []
         
@@ -68,8 +69,10 @@ class ArxivFetcher:
                     if result.published.replace(tzinfo=None) < start_date:
                         continue
                     
+                    paper_id, version = parse_arxiv_id(result.entry_id)
                     paper = {
-                        'id': result.entry_id,
+                        'id': paper_id,
+                        'version': version,
                         'title': result.title,
                         'authors': ', '.join([author.name for author in result.authors]),
                         'abstract': result.summary,
@@ -119,39 +122,56 @@ class ArxivFetcher:
                 
         return None
     
+    @writes_database
     def save_papers_to_cache(self, papers: List[Dict[str, Any]]):
-        """保存论文到缓存数据库"""
-        conn = sqlite3.connect(self.db_path)
+        """保存论文到缓存数据库，论文出现新版本时原地更新"""
+        conn = self.db.connect()
         cursor = conn.cursor()
         
+        # 跳过比缓存更旧的版本
+        papers = select_newer_versions(cursor, papers)
+        
         for paper in papers:
             cursor.execute('''
-                INSERT OR REPLACE INTO papers 
-                (id, title, authors, abstract, published, pdf_url, conference, categories)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO papers 
+                (id, version, title, authors, published, pdf_url, conference, confidence, categories)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 1.0, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    version = excluded.version,
+                    title = excluded.title,
+                    authors = excluded.authors,
+                    published = excluded.published,
+                    pdf_url = excluded.pdf_url,
+                    conference = excluded.conference,
+                    categories = excluded.categories
             ''', (
                 paper['id'],
+                paper.get('version', 0),
                 paper['title'],
                 paper['authors'],
-                paper['abstract'],
                 paper['published'],
                 paper['pdf_url'],
                 paper['conference'],
                 paper['categories']
             ))
         
+        # 摘要压缩存放在paper_texts
+        save_texts(cursor, [(paper['id'], paper['abstract'], None) for paper in papers])
+        author_index.index_paper_authors(cursor, [(paper['id'], paper['authors']) for paper in papers])
+        
         conn.commit()
         conn.close()
     
-    def get_random_papers(self, count: int = 5) -> List[Dict[str, Any]]:
-        """从缓存中随机获取指定数量的论文"""
-        conn = sqlite3.connect(self.db_path)
+    def get_random_papers(self, count: int = 5, followed_only: bool = False) -> List[Dict[str, Any]]:
+        """从缓存中随机获取指定数量的论文，followed_only 时只看已关注作者"""
+        conn = self.db.connect()
         cursor = conn.cursor()
         
-        cursor.execute('''
+        follow_filter = f"AND {author_index.FOLLOWED_FILTER_SQL}" if followed_only else ""
+        cursor.execute(f'''
             SELECT id, title, authors, published, pdf_url, conference
             FROM papers
-            WHERE conference IS NOT NULL
+            WHERE conference IS NOT NULL {follow_filter}
             ORDER BY RANDOM()
             LIMIT ?
         ''', (count,))
@@ -170,6 +190,14 @@ class ArxivFetcher:
         conn.close()
         return papers
     
+    def get_paper_texts(self, paper_ids: List[str]) -> Dict[str, Dict[str, str]]:
+        """读取论文的摘要和评论（自动解压）"""
+        conn = self.db.connect()
+        cursor = conn.cursor()
+        texts = load_texts(cursor, list(paper_ids))
+        conn.close()
+        return texts
+    
     def update_cache(self):
         """更新论文缓存"""
         print("正在更新论文缓存...")
@@ -180,14 +208,10 @@ class ArxivFetcher:
         # 清理过期数据
         self._clean_old_papers()
     
+    @writes_database
     def _clean_old_papers(self):
-        """清理超过缓存期限的论文"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        """清理超过缓存期限的论文，分批删除并回收空闲页"""
         cutoff_date = (datetime.now() - timedelta(days=self.config['settings']['cache_days'])).strftime('%Y-%m-%d')
         
-        cursor.execute('DELETE FROM papers WHERE published < ?', (cutoff_date,))
-        
-        conn.commit()
-        conn.close()
\ No newline at end of file
+        deleted, reclaimed = retention.apply_retention(self.db, cutoff_date)
+        print(f"已清理 {deleted} 篇过期论文，回收 {reclaimed / 1024:.0f} KB")
\ No newline at end of file
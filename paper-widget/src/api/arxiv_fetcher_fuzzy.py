@@ -3,80 +3,95 @@
 支持更智能的会议识别
 """
 
-import arxiv
 import json
-import sqlite3
 import os
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable
 import logging
 
-# 导入模糊匹配器
-from fuzzy_matcher import ConferenceFuzzyMatcher
+# 导入模糊匹配器（既支持作为 api 包导入，也支持在本目录直接运行）
+try:
+    from .fuzzy_matcher import ConferenceFuzzyMatcher
+    from .text_store import save_texts, load_texts
+    from . import author_index
+    from .arxiv_ids import parse_arxiv_id, select_newer_versions
+    from .database import DatabaseManager, writes_database
+    from . import retention
+    from .progress import (UpdateProgress, ProgressCallback, ARXIV_PAGE_SIZE,
+                           CancellationToken, UpdateCancelled)
+    from .checkpoints import UpdateCheckpoints, RESUME_SCAN_PAGES
+    from . import profiling
+except ImportError:
+    from fuzzy_matcher import ConferenceFuzzyMatcher
+    from text_store import save_texts, load_texts
+    import author_index
+    from arxiv_ids import parse_arxiv_id, select_newer_versions
+    from database import DatabaseManager, writes_database
+    import retention
+    from progress import (UpdateProgress, ProgressCallback, ARXIV_PAGE_SIZE,
+                          CancellationToken, UpdateCancelled)
+    from checkpoints import UpdateCheckpoints, RESUME_SCAN_PAGES
+    import profiling
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class FuzzyArxivFetcher:
-    def __init__(self, config_path: str = None, debug: bool = False):
-        if config_path is None:
-            root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            config_path = os.path.join(root_dir, "config.json")
-        
-        with open(config_path, 'r', encoding='utf-8') as f:
-            self.config = json.load(f)
+    def __init__(self, config_path: str = None, debug: bool = False,
+                 config: Optional[Dict[str, Any]] = None, db: Optional[DatabaseManager] = None):
+        """
+        config / db: 应用上下文共享的配置和数据库管理器（见 app_context）；
+        不传时自行读取配置文件并使用默认数据库
+        """
+        if config is None:
+            if config_path is None:
+                root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+                config_path = os.path.join(root_dir, "config.json")
+            
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        self.config = config
         
-        root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        self.db_path = os.path.join(root_dir, "data", "papers_cache.db")
+        if db is None:
+            root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            db = DatabaseManager(os.path.join(root_dir, "data", "papers_cache.db"))
+        self.db = db
+        self.db_path = db.path
         self.debug = debug
         
-        # 初始化模糊匹配器
-        self.matcher = ConferenceFuzzyMatcher()
+        # 模糊匹配器只在更新和按会议搜索时用到，首次使用时再创建
+        self._matcher = None
         
         self._init_database()
     
+    @property
+    def matcher(self) -> ConferenceFuzzyMatcher:
+        if self._matcher is None:
+            self._matcher = ConferenceFuzzyMatcher()
+        return self._matcher
+    
     def _init_database(self):
-        """初始化数据库，增加置信度字段"""
-        data_dir = os.path.dirname(self.db_path)
-        os.makedirs(data_dir, exist_ok=True)
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS papers (
-                id TEXT PRIMARY KEY,
-                title TEXT NOT NULL,
-                authors TEXT NOT NULL,
-                abstract TEXT,
-                published DATE NOT NULL,
-                pdf_url TEXT,
-                conference TEXT,
-                conference_year TEXT,
-                confidence REAL,
-                categories TEXT,
-                comment TEXT,
-                fetched_date DATE DEFAULT CURRENT_DATE
-            )
-        ''')
-        
-        # 创建会议统计表
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS conference_stats (
-                conference TEXT PRIMARY KEY,
-                total_papers INTEGER,
-                avg_confidence REAL,
-                last_updated DATE DEFAULT CURRENT_DATE
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        """初始化数据库，按版本原地升级表结构（共享的管理器只迁移一次）"""
+        self.db.initialize()
     
-    def fetch_recent_papers(self, days_back: int = 90, max_per_category: int = 200) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    @profiling.profiled('other', 'fetch_recent_papers')
+    def fetch_recent_papers(self, days_back: int = 90, max_per_category: int = 200,
+                            progress: Optional[UpdateProgress] = None,
+                            on_papers: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+                            cancel_token: Optional[CancellationToken] = None,
+                            checkpoints: Optional[UpdateCheckpoints] = None
+                            ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
         """
         获取最近的论文并使用模糊匹配识别会议
+        progress: 进度跟踪器，按类别、页数和各阶段耗时上报进度
+        on_papers: 每取完一页就把新匹配的论文交给它（如写入缓存），不必等全部获取完
+        cancel_token: 取消令牌，在获取、匹配和写入之间检查，取消时抛出 UpdateCancelled
+        checkpoints: 更新断点，每页提交后记录；已完成的类别跳过，未完成的从断点继续
         返回：(论文列表, 统计信息)
         """
+        # arxiv 库（及其依赖的 feedparser/requests）较重，只在真正联网获取时导入
+        import arxiv
+        
         categories = self.config['settings']['arxiv_categories']
         all_papers = []
         stats = {
@@ -90,9 +105,31 @@ class FuzzyArxivFetcher:
         
         start_date = datetime.now() - timedelta(days=days_back)
         
-        for category in categories:
+        if progress is None:
+            progress = UpdateProgress()
+        progress.begin_fetch(categories, max_per_category)
+        
+        failed_categories = []
+        
+        for index, category in enumerate(categories):
+            checkpoint = checkpoints.get(category) if checkpoints else None
+            if checkpoint and checkpoint['completed']:
+                logger.info(f"跳过类别 {category}（上次更新已完成）")
+                progress.start_category(index, category, max_per_category)
+                continue
+            
+            offset = checkpoint['results_seen'] if checkpoint else 0
+            cursor = checkpoint['cursor'] if checkpoint else None
+            if offset and cursor:
+                # 退回一页，再按 cursor 对齐（期间的新投稿会让上次的位置后移）
+                offset = max(0, offset - ARXIV_PAGE_SIZE)
+            
             try:
-                logger.info(f"正在搜索类别: {category}")
+                if checkpoint and checkpoint['results_seen']:
+                    logger.info(f"正在搜索类别: {category}（从第 {checkpoint['last_page'] + 1} 页继续）")
+                else:
+                    logger.info(f"正在搜索类别: {category}")
+                progress.start_category(index, category, offset)
                 
                 search = arxiv.Search(
                     query=f"cat:{category}",
@@ -102,64 +139,44 @@ class FuzzyArxivFetcher:
                 )
                 
                 category_papers = []
+                pending = []  # 尚未交给 on_papers 的匹配论文
                 
-                for result in search.results():
-                    if result.published.replace(tzinfo=None) < start_date:
-                        continue
-                    
-                    stats['total_fetched'] += 1
-                    
-                    # 提取基本信息
-                    paper = {
-                        'id': result.entry_id,
-                        'title': result.title,
-                        'authors': ', '.join([author.name for author in result.authors]),
-                        'abstract': result.summary,
-                        'published': result.published.strftime('%Y-%m-%d'),
-                        'pdf_url': result.pdf_url,
-                        'categories': ', '.join(result.categories),
-                        'comment': result.comment if hasattr(result, 'comment') else "",
-                    }
-                    
-                    # 使用模糊匹配识别会议
-                    conference_info = self.matcher.is_conference_paper(
-                        paper['title'],
-                        paper['abstract'],
-                        paper['comment']
-                    )
+                results = progress.timed_iter('fetch', profiling.timed_iter('network', search.results(offset=offset)))
+                if cursor:
+                    results = self._skip_to_cursor(results, cursor, checkpoint['results_seen'], progress)
+                
+                for result in results:
+                    if cancel_token is not None:
+                        cancel_token.raise_if_cancelled()
                     
-                    if conference_info:
-                        paper['conference'] = conference_info['conference']
-                        paper['conference_year'] = conference_info.get('year', '')
-                        paper['confidence'] = conference_info['confidence']
-                        
-                        # 统计置信度分布
-                        stats['matched'] += 1
-                        if conference_info['confidence'] >= 0.9:
-                            stats['high_confidence'] += 1
-                        elif conference_info['confidence'] >= 0.75:
-                            stats['medium_confidence'] += 1
-                        else:
-                            stats['low_confidence'] += 1
-                        
+                    paper = self._match_result(result, start_date, stats, progress)
+                    if paper:
                         category_papers.append(paper)
-                        
-                        if self.debug:
-                            logger.debug(f"匹配: {paper['title'][:50]}... -> {conference_info['conference']} (置信度: {conference_info['confidence']:.2f})")
-                    else:
-                        stats['unmatched'] += 1
-                        if self.debug and 'workshop' not in paper['title'].lower():
-                            # 记录可能遗漏的论文（排除workshop）
-                            logger.debug(f"未匹配: {paper['title'][:50]}...")
-                            if paper['comment']:
-                                logger.debug(f"  Comment: {paper['comment'][:100]}")
+                        pending.append(paper)
+                    cursor = parse_arxiv_id(result.entry_id)[0]
+                    
+                    # 每取完一页提交一次并记录断点，新匹配的论文立即可以被刷新抽到
+                    if progress.category_results % ARXIV_PAGE_SIZE == 0:
+                        self._end_page(category, cursor, pending, on_papers, progress,
+                                       cancel_token, checkpoints)
+                
+                self._end_page(category, cursor, pending, on_papers, progress,
+                               cancel_token, checkpoints, completed=True)
                 
                 all_papers.extend(category_papers)
                 logger.info(f"  {category}: 获取 {stats['total_fetched']} 篇，匹配 {len(category_papers)} 篇")
                 
+            except UpdateCancelled:
+                logger.info(f"更新已取消（{category} 已保存到第 {progress.category_results // ARXIV_PAGE_SIZE} 页）")
+                raise
             except Exception as e:
+                failed_categories.append(category)
                 logger.error(f"获取 {category} 时出错: {e}")
         
+        # 所有类别都完成后清除断点，下次更新重新完整获取
+        if checkpoints and not failed_categories:
+            checkpoints.clear()
+        
         # 显示统计信息
         if stats['matched'] > 0:
             logger.info(f"\n统计信息:")
@@ -172,11 +189,116 @@ class FuzzyArxivFetcher:
         
         return all_papers, stats
     
+    def _skip_to_cursor(self, results, cursor: str, resumed_results: int, progress: UpdateProgress):
+        """
+        从断点继续：跳过 cursor（上次最后处理的论文）及其之前的结果
+        resumed_results: 断点记录的已处理结果数，用于报告位置的移动
+        在 RESUME_SCAN_PAGES 页内找不到 cursor 时放弃对齐，扫描过的结果照常处理
+        （重复处理只会原地更新已缓存的论文）
+        """
+        iterator = iter(results)
+        scanned = []
+        for result in iterator:
+            scanned.append(result)
+            if parse_arxiv_id(result.entry_id)[0] == cursor:
+                progress.results_skipped(len(scanned))
+                shift = progress.category_results - resumed_results
+                if shift:
+                    logger.info(f"断点位置移动了 {shift:+d} 条，已按 {cursor} 对齐")
+                yield from iterator
+                return
+            if len(scanned) >= RESUME_SCAN_PAGES * ARXIV_PAGE_SIZE:
+                break
+        
+        logger.warning(f"未找到断点 {cursor}，从第 {progress.category_results // ARXIV_PAGE_SIZE + 1} 页重新处理")
+        yield from scanned
+        yield from iterator
+    
+    def _match_result(self, result, start_date: datetime, stats: Dict[str, int],
+                      progress: UpdateProgress) -> Optional[Dict[str, Any]]:
+        """
+        处理一条arXiv结果：检查发布日期并识别会议
+        返回：匹配到会议的论文，时间范围外或未匹配时返回None
+        """
+        if result.published.replace(tzinfo=None) < start_date:
+            progress.result_fetched(in_range=False)
+            return None
+        
+        stats['total_fetched'] += 1
+        
+        # 提取基本信息
+        paper_id, version = parse_arxiv_id(result.entry_id)
+        paper = {
+            'id': paper_id,
+            'version': version,
+            'title': result.title,
+            'authors': ', '.join([author.name for author in result.authors]),
+            'abstract': result.summary,
+            'published': result.published.strftime('%Y-%m-%d'),
+            'pdf_url': result.pdf_url,
+            'categories': ', '.join(result.categories),
+            'comment': result.comment if hasattr(result, 'comment') else "",
+        }
+        
+        # 使用模糊匹配识别会议
+        with progress.timed('match'):
+            conference_info = self.matcher.is_conference_paper(
+                paper['title'],
+                paper['abstract'],
+                paper['comment']
+            )
+        
+        progress.result_fetched(matched=bool(conference_info))
+        
+        if not conference_info:
+            stats['unmatched'] += 1
+            if self.debug and 'workshop' not in paper['title'].lower():
+                # 记录可能遗漏的论文（排除workshop）
+                logger.debug(f"未匹配: {paper['title'][:50]}...")
+                if paper['comment']:
+                    logger.debug(f"  Comment: {paper['comment'][:100]}")
+            return None
+        
+        paper['conference'] = conference_info['conference']
+        paper['conference_year'] = conference_info.get('year', '')
+        paper['confidence'] = conference_info['confidence']
+        
+        # 统计置信度分布
+        stats['matched'] += 1
+        if conference_info['confidence'] >= 0.9:
+            stats['high_confidence'] += 1
+        elif conference_info['confidence'] >= 0.75:
+            stats['medium_confidence'] += 1
+        else:
+            stats['low_confidence'] += 1
+        
+        if self.debug:
+            logger.debug(f"匹配: {paper['title'][:50]}... -> {conference_info['conference']} (置信度: {conference_info['confidence']:.2f})")
+        
+        return paper
+    
+    def _end_page(self, category: str, cursor: Optional[str], pending: List[Dict[str, Any]],
+                  on_papers, progress: UpdateProgress, cancel_token: Optional[CancellationToken],
+                  checkpoints: Optional[UpdateCheckpoints], completed: bool = False):
+        """一页结束：提交该页匹配的论文，再记录断点（先提交后记录，中断后最多重取一页）"""
+        if on_papers and pending:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            with progress.timed('persist', len(pending)):
+                on_papers(list(pending))
+            progress.papers_saved(len(pending))
+            pending.clear()
+        
+        if checkpoints:
+            checkpoints.save(category, progress.category_results, cursor, completed)
+    
     def search_by_conference_fuzzy(self, conference_query: str, days_back: int = 90) -> List[Dict[str, Any]]:
         """
         使用模糊匹配搜索特定会议的论文
         支持各种会议名称变体
         """
+        import arxiv
+        
         # 先用模糊匹配器标准化会议名称
         match_result = self.matcher.fuzzy_match_conference(conference_query)
         if not match_result:
@@ -203,8 +325,9 @@ class FuzzyArxivFetcher:
                     sort_order=arxiv.SortOrder.Descending
                 )
                 
-                for result in search.results():
-                    if result.entry_id in seen_ids:
+                for result in profiling.timed_iter('network', search.results()):
+                    paper_id, version = parse_arxiv_id(result.entry_id)
+                    if paper_id in seen_ids:
                         continue
                     
                     # 验证是否真的是该会议的论文
@@ -216,7 +339,8 @@ class FuzzyArxivFetcher:
                     
                     if conference_info and conference_info['conference'] == conference_name:
                         paper = {
-                            'id': result.entry_id,
+                            'id': paper_id,
+                            'version': version,
                             'title': result.title,
                             'authors': ', '.join([author.name for author in result.authors]),
                             'abstract': result.summary,
@@ -229,7 +353,7 @@ class FuzzyArxivFetcher:
                             'comment': result.comment if hasattr(result, 'comment') else "",
                         }
                         papers.append(paper)
-                        seen_ids.add(result.entry_id)
+                        seen_ids.add(paper_id)
                 
             except Exception as e:
                 logger.error(f"搜索 '{term}' 时出错: {e}")
@@ -237,31 +361,52 @@ class FuzzyArxivFetcher:
         logger.info(f"找到 {len(papers)} 篇 {conference_name} 论文")
         return papers
     
+    @profiling.profiled('db')
+    @writes_database
     def save_papers_to_cache(self, papers: List[Dict[str, Any]]):
-        """保存论文到缓存数据库"""
-        conn = sqlite3.connect(self.db_path)
+        """保存论文到缓存数据库，论文出现新版本时原地更新"""
+        conn = self.db.connect()
         cursor = conn.cursor()
         
+        # 跳过比缓存更旧的版本
+        papers = select_newer_versions(cursor, papers)
+        
         for paper in papers:
             cursor.execute('''
-                INSERT OR REPLACE INTO papers 
-                (id, title, authors, abstract, published, pdf_url, 
-                 conference, conference_year, confidence, categories, comment)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO papers 
+                (id, version, title, authors, published, pdf_url, 
+                 conference, conference_year, confidence, categories)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    version = excluded.version,
+                    title = excluded.title,
+                    authors = excluded.authors,
+                    published = excluded.published,
+                    pdf_url = excluded.pdf_url,
+                    conference = excluded.conference,
+                    conference_year = excluded.conference_year,
+                    confidence = excluded.confidence,
+                    categories = excluded.categories
             ''', (
                 paper['id'],
+                paper.get('version', 0),
                 paper['title'],
                 paper['authors'],
-                paper['abstract'],
                 paper['published'],
                 paper['pdf_url'],
                 paper.get('conference'),
                 paper.get('conference_year', ''),
                 paper.get('confidence', 0.0),
-                paper['categories'],
-                paper.get('comment', '')
+                paper['categories']
             ))
         
+        # 摘要和评论压缩存放在paper_texts
+        save_texts(cursor, [
+            (paper['id'], paper['abstract'], paper.get('comment', ''))
+            for paper in papers
+        ])
+        author_index.index_paper_authors(cursor, [(paper['id'], paper['authors']) for paper in papers])
+        
         # 更新会议统计
         self._update_conference_stats(cursor)
         
@@ -281,9 +426,10 @@ class FuzzyArxivFetcher:
             GROUP BY conference
         ''')
     
+    @profiling.profiled('db')
     def get_conference_statistics(self) -> Dict[str, Dict[str, Any]]:
         """获取详细的会议统计信息"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.db.connect()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -317,17 +463,21 @@ class FuzzyArxivFetcher:
         conn.close()
         return stats
     
-    def get_random_papers(self, count: int = 5, min_confidence: float = 0.7) -> List[Dict[str, Any]]:
+    @profiling.profiled('db')
+    def get_random_papers(self, count: int = 5, min_confidence: float = 0.7,
+                          followed_only: bool = False) -> List[Dict[str, Any]]:
         """
         获取随机论文，可设置最低置信度阈值
+        followed_only: 只从已关注作者的论文中抽样
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self.db.connect()
         cursor = conn.cursor()
         
-        cursor.execute('''
+        follow_filter = f"AND {author_index.FOLLOWED_FILTER_SQL}" if followed_only else ""
+        cursor.execute(f'''
             SELECT id, title, authors, published, pdf_url, conference, confidence
             FROM papers
-            WHERE conference IS NOT NULL AND confidence >= ?
+            WHERE conference IS NOT NULL AND confidence >= ? {follow_filter}
             ORDER BY RANDOM()
             LIMIT ?
         ''', (min_confidence, count))
@@ -347,6 +497,56 @@ class FuzzyArxivFetcher:
         conn.close()
         return papers
     
+    def get_paper_texts(self, paper_ids: List[str]) -> Dict[str, Dict[str, str]]:
+        """
+        读取论文的摘要和评论（自动解压）
+        返回：{论文id: {'abstract': ..., 'comment': ...}}
+        """
+        conn = self.db.connect()
+        cursor = conn.cursor()
+        texts = load_texts(cursor, list(paper_ids))
+        conn.close()
+        return texts
+    
+    def get_papers_by_author(self, name: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """按作者查询缓存中的论文（作者名自动标准化）"""
+        conn = self.db.connect()
+        papers = author_index.query_papers_by_author(conn.cursor(), name, limit)
+        conn.close()
+        return papers
+    
+    def get_coauthors(self, name: str, limit: int = 20) -> List[Tuple[str, int]]:
+        """查询共同作者及合作论文数"""
+        conn = self.db.connect()
+        coauthors = author_index.query_coauthors(conn.cursor(), name, limit)
+        conn.close()
+        return coauthors
+    
+    @writes_database
+    def follow_author(self, name: str) -> bool:
+        """关注作者，随机抽样时可以只看关注作者的论文"""
+        conn = self.db.connect()
+        followed = author_index.follow_author(conn.cursor(), name)
+        conn.commit()
+        conn.close()
+        return followed
+    
+    @writes_database
+    def unfollow_author(self, name: str) -> bool:
+        """取消关注作者"""
+        conn = self.db.connect()
+        removed = author_index.unfollow_author(conn.cursor(), name)
+        conn.commit()
+        conn.close()
+        return removed
+    
+    def get_followed_authors(self) -> List[str]:
+        """获取已关注的作者列表"""
+        conn = self.db.connect()
+        authors = author_index.list_followed_authors(conn.cursor())
+        conn.close()
+        return authors
+    
     def analyze_matching_quality(self):
         """分析匹配质量，帮助调优"""
         stats = self.get_conference_statistics()
@@ -365,6 +565,7 @@ class FuzzyArxivFetcher:
             print(f"    - 低(<0.75): {stat['low_confidence']} 篇 ({stat['low_confidence']/stat['total']*100:.1f}%)")
             print(f"  置信度范围: {stat['min_confidence']:.3f} - {stat['max_confidence']:.3f}")
     
+    @writes_database
     def clear_database(self, confirm: bool = False) -> bool:
         """
         清空数据库中的所有论文
@@ -378,15 +579,21 @@ class FuzzyArxivFetcher:
             return False
         
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.db.connect()
             cursor = conn.cursor()
             
+            # 先清空侧表，删除papers时触发器就无需逐行清理
+            cursor.execute('DELETE FROM paper_texts')
+            cursor.execute('DELETE FROM paper_authors')
+            
             # 清空papers表
             cursor.execute('DELETE FROM papers')
             deleted_papers = cursor.rowcount
             
-            # 清空conference_stats表
+            # 清空conference_stats表和更新断点（否则下次更新会跳过已完成的类别）
             cursor.execute('DELETE FROM conference_stats')
+            cursor.execute('DELETE FROM update_checkpoints')
+            author_index.prune_orphan_authors(cursor)
             
             # 如果存在unmatched_papers表，也清空
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='unmatched_papers'")
@@ -396,13 +603,16 @@ class FuzzyArxivFetcher:
             conn.commit()
             conn.close()
             
-            logger.info(f"数据库已清空，删除了 {deleted_papers} 篇论文")
+            reclaimed = retention.reclaim_free_pages(self.db)
+            logger.info(f"数据库已清空，删除了 {deleted_papers} 篇论文，回收 {reclaimed / 1024:.0f} KB")
             return True
             
         except Exception as e:
             logger.error(f"清空数据库失败: {e}")
             return False
     
+    @profiling.profiled('db')
+    @writes_database
     def clear_old_conference_papers(self, conference_name: str) -> int:
         """
         清除特定会议的论文（用于删除CRYPTO等不需要的会议）
@@ -412,14 +622,13 @@ class FuzzyArxivFetcher:
             删除的论文数量
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('DELETE FROM papers WHERE conference = ?', (conference_name,))
-            deleted_count = cursor.rowcount
-            
-            conn.commit()
-            conn.close()
+            # 按会议索引分批删除，不长时间占用写锁
+            deleted_count = retention.delete_in_batches(self.db, 'conference = ?', (conference_name,))
+            if deleted_count:
+                conn = self.db.connect()
+                author_index.prune_orphan_authors(conn.cursor())
+                conn.commit()
+                conn.close()
             
             logger.info(f"已删除 {conference_name} 的 {deleted_count} 篇论文")
             return deleted_count
@@ -428,6 +637,8 @@ class FuzzyArxivFetcher:
             logger.error(f"删除会议论文失败: {e}")
             return 0
     
+    @profiling.profiled('db')
+    @writes_database
     def clean_outdated_papers(self, days: int = None) -> int:
         """
         清理过时的论文
@@ -440,29 +651,34 @@ class FuzzyArxivFetcher:
             days = self.config['settings']['cache_days']
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
             
-            cursor.execute('DELETE FROM papers WHERE published < ?', (cutoff_date,))
-            deleted_count = cursor.rowcount
-            
-            conn.commit()
-            conn.close()
+            # 按日期索引分批删除，并回收空闲页
+            deleted_count, reclaimed = retention.apply_retention(self.db, cutoff_date)
             
-            logger.info(f"已清理 {deleted_count} 篇过时论文（{days}天前）")
+            logger.info(f"已清理 {deleted_count} 篇过时论文（{days}天前），回收 {reclaimed / 1024:.0f} KB")
             return deleted_count
             
         except Exception as e:
             logger.error(f"清理过时论文失败: {e}")
             return 0
     
-    def update_cache_with_clean(self):
+    @profiling.profiled_run('update')
+    def update_cache_with_clean(self, progress_callback: Optional[ProgressCallback] = None,
+                                cancel_token: Optional[CancellationToken] = None):
         """
         更新缓存，但先清理过时数据和不需要的会议
+        progress_callback: 接收进度快照（见 progress.UpdateProgress），在调用线程中回调
+        cancel_token: 取消令牌，取消后抛出 UpdateCancelled，已入库的论文和断点保留
+        新论文每取完一页就写入缓存并记录断点；中断的更新下次从断点继续
         """
         logger.info("开始智能更新缓存...")
+        progress = UpdateProgress(progress_callback)
+        progress.set_stage('clean')
+        
+        checkpoints = UpdateCheckpoints(self.db)
+        if checkpoints.load():
+            logger.info("发现未完成的更新，从断点继续")
         
         # 1. 先清理CRYPTO相关会议（如果存在）
         crypto_conferences = ['CRYPTO', 'EUROCRYPT']
@@ -474,14 +690,20 @@ class FuzzyArxivFetcher:
         # 2. 清理过时论文
         self.clean_outdated_papers()
         
-        # 3. 获取新论文
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        
+        # 3. 获取新论文（边获取边入库）
         logger.info("正在获取新论文...")
         matched_papers, _ = self.fetch_recent_papers(
-            self.config['settings']['cache_days']
+            self.config['settings']['cache_days'],
+            progress=progress,
+            on_papers=self.save_papers_to_cache,
+            cancel_token=cancel_token,
+            checkpoints=checkpoints
         )
         
         if matched_papers:
-            self.save_papers_to_cache(matched_papers)
             logger.info(f"已缓存 {len(matched_papers)} 篇新论文")
             
             # 显示统计信息
@@ -490,6 +712,11 @@ class FuzzyArxivFetcher:
             for conf, stat in stats.items():
                 logger.info(f"  {conf}: {stat['total']} 篇")
         
+        rates = progress.rates()
+        if rates:
+            logger.info("各阶段速度: " + ", ".join(f"{stage} {rate:.1f}篇/秒" for stage, rate in rates.items()))
+        
+        progress.finish()
         logger.info("缓存更新完成！")
 
 
@@ -0,0 +1,119 @@
+"""
+arXiv 论文id规范化
+arxiv库返回的 entry_id 带版本号（如 http://arxiv.org/abs/2501.01234v2），
+直接作为主键会让同一篇论文的 v1、v2 变成两行。
+缓存统一使用不带版本号的规范id作为主键，版本号单独存放在 version 列。
+"""
+
+import re
+from typing import Any, Dict, List, Tuple
+
+# 新格式 2501.01234v2，旧格式 cs/0101001v1 或 math.GT/0309136v3
+_ARXIV_ID_RE = re.compile(
+    r'(?P<id>\d{4}\.\d{4,5}|[a-z\-]+(?:\.[A-Z]{2})?/\d{7})(?:v(?P<version>\d+))?$',
+    re.IGNORECASE
+)
+
+
+def parse_arxiv_id(entry_id: str) -> Tuple[str, int]:
+    """
+    解析 entry_id，返回 (规范id, 版本号)
+    无法识别的id原样返回，版本号记为0
+    """
+    text = entry_id.strip()
+    # 去掉 URL 前缀和 arXiv: 前缀
+    text = re.sub(r'^https?://(?:export\.)?arxiv\.org/(?:abs|pdf)/', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'^arxiv:', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'\.pdf$', '', text, flags=re.IGNORECASE)
+
+    match = _ARXIV_ID_RE.search(text)
+    if not match:
+        return entry_id, 0
+
+    version = int(match.group('version')) if match.group('version') else 0
+    return match.group('id'), version
+
+
+def select_newer_versions(cursor, papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    过滤出需要写入的论文：批内同一论文只保留最高版本，
+    且版本不低于缓存中已有的版本
+    """
+    latest = {}
+    for paper in papers:
+        current = latest.get(paper['id'])
+        if current is None or paper.get('version', 0) > current.get('version', 0):
+            latest[paper['id']] = paper
+
+    ids = list(latest)
+    cached_versions = {}
+    for start in range(0, len(ids), 500):
+        batch = ids[start:start + 500]
+        placeholders = ','.join('?' * len(batch))
+        cursor.execute(f'SELECT id, version FROM papers WHERE id IN ({placeholders})', batch)
+        cached_versions.update(cursor.fetchall())
+
+    return [
+        paper for paper_id, paper in latest.items()
+        if paper.get('version', 0) >= (cached_versions.get(paper_id) or 0)
+    ]
+
+
+def collapse_versioned_ids(cursor) -> int:
+    """
+    一次性迁移：把旧数据中带版本号的id改写为规范id，
+    同一论文的多个版本只保留最高版本（版本相同时保留最近抓取的）
+    返回删除的重复行数量
+    """
+    cursor.execute('SELECT id, fetched_date FROM papers WHERE version IS NULL')
+    rows = cursor.fetchall()
+    if not rows:
+        return 0
+
+    groups: Dict[str, List[Tuple[str, int, str]]] = {}
+    for old_id, fetched in rows:
+        new_id, version = parse_arxiv_id(old_id)
+        groups.setdefault(new_id, []).append((old_id, version, fetched or ''))
+
+    # 已经迁移过的同一论文也要参与版本比较
+    cursor.execute('SELECT id, version, fetched_date FROM papers WHERE version IS NOT NULL')
+    for paper_id, version, fetched in cursor.fetchall():
+        if paper_id in groups:
+            groups[paper_id].append((paper_id, version, fetched or ''))
+
+    id_map = []
+    for new_id, members in groups.items():
+        members.sort(key=lambda m: (m[1], m[2]), reverse=True)
+        for rank, (old_id, version, _) in enumerate(members):
+            id_map.append((old_id, new_id, version, 1 if rank == 0 else 0))
+
+    cursor.execute('DROP TABLE IF EXISTS temp.id_map')
+    cursor.execute('''
+        CREATE TEMP TABLE id_map (
+            old_id TEXT PRIMARY KEY,
+            new_id TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            keep INTEGER NOT NULL
+        )
+    ''')
+    cursor.executemany('INSERT INTO id_map VALUES (?, ?, ?, ?)', id_map)
+
+    # 先删除旧版本（触发器会同步清理侧表），再批量改写保留行的主键
+    cursor.execute('DELETE FROM papers WHERE id IN (SELECT old_id FROM id_map WHERE keep = 0)')
+    removed = cursor.rowcount
+
+    cursor.execute('''
+        UPDATE papers
+        SET id = (SELECT new_id FROM id_map WHERE old_id = papers.id),
+            version = (SELECT version FROM id_map WHERE old_id = papers.id)
+        WHERE id IN (SELECT old_id FROM id_map WHERE keep = 1)
+    ''')
+    for table, column in (('paper_texts', 'id'), ('paper_authors', 'paper_id')):
+        cursor.execute(f'''
+            UPDATE {table}
+            SET {column} = (SELECT new_id FROM id_map WHERE old_id = {table}.{column})
+            WHERE {column} IN (SELECT old_id FROM id_map WHERE keep = 1 AND old_id != new_id)
+        ''')
+
+    cursor.execute('DROP TABLE temp.id_map')
+    return removed
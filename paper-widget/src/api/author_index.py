@@ -0,0 +1,247 @@
+"""
+作者索引
+papers.authors 是逗号拼接的字符串，按作者查询只能 LIKE 全表扫描。
+这里在入库时把作者拆分到 authors / paper_authors 两张表中，
+支持按作者查论文、共同作者查询，以及给随机抽样用的“关注作者”过滤。
+"""
+
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# 随机抽样时的关注作者过滤条件，走 paper_authors(author_id, paper_id) 索引
+FOLLOWED_FILTER_SQL = '''
+    id IN (
+        SELECT pa.paper_id
+        FROM followed_authors fa
+        JOIN paper_authors pa ON pa.author_id = fa.author_id
+    )
+'''
+
+
+def normalize_author_name(name: str) -> str:
+    """
+    标准化作者名，用于去重和查询
+    'José  García-López' / 'Jose Garcia-Lopez' / 'J. García' 的空白、大小写、重音统一处理
+    """
+    # 去除重音符号
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(ch for ch in name if not unicodedata.combining(ch))
+
+    name = name.lower()
+    # 句点和连字符视为分隔符
+    name = re.sub(r'[.\-‐]', ' ', name)
+    name = re.sub(r'\s+', ' ', name)
+    return name.strip()
+
+
+def split_authors(authors: str) -> List[str]:
+    """拆分逗号拼接的作者字符串"""
+    if not authors:
+        return []
+    return [name.strip() for name in authors.split(',') if name.strip()]
+
+
+def init_author_tables(cursor):
+    """创建作者相关表和索引"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS authors (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            normalized TEXT NOT NULL UNIQUE
+        )
+    ''')
+
+    # 主键 (paper_id, author_id) 用于按论文查作者，反向索引用于按作者查论文
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS paper_authors (
+            paper_id TEXT NOT NULL,
+            author_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            PRIMARY KEY (paper_id, author_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_paper_authors_author
+        ON paper_authors (author_id, paper_id)
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS followed_authors (
+            author_id INTEGER PRIMARY KEY,
+            followed_date DATE DEFAULT CURRENT_DATE
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS papers_delete_authors
+        AFTER DELETE ON papers
+        BEGIN
+            DELETE FROM paper_authors WHERE paper_id = OLD.id;
+        END
+    ''')
+
+
+def _get_author_ids(cursor, names: Iterable[str]) -> Dict[str, int]:
+    """确保作者存在，返回 {标准化名: 作者id}"""
+    display_names = {}
+    for name in names:
+        normalized = normalize_author_name(name)
+        if normalized and normalized not in display_names:
+            display_names[normalized] = name
+
+    cursor.executemany(
+        'INSERT OR IGNORE INTO authors (name, normalized) VALUES (?, ?)',
+        [(name, normalized) for normalized, name in display_names.items()]
+    )
+
+    author_ids = {}
+    keys = list(display_names)
+    for start in range(0, len(keys), 500):
+        batch = keys[start:start + 500]
+        placeholders = ','.join('?' * len(batch))
+        cursor.execute(
+            f'SELECT normalized, id FROM authors WHERE normalized IN ({placeholders})',
+            batch
+        )
+        author_ids.update(cursor.fetchall())
+    return author_ids
+
+
+def index_paper_authors(cursor, papers: Iterable[Tuple[str, str]]) -> int:
+    """
+    为 (论文id, 作者字符串) 建立作者关联，重复入库时覆盖旧关联
+    返回写入的关联数量
+    """
+    papers = [(paper_id, split_authors(authors)) for paper_id, authors in papers]
+    if not papers:
+        return 0
+
+    author_ids = _get_author_ids(cursor, (name for _, names in papers for name in names))
+
+    cursor.executemany('DELETE FROM paper_authors WHERE paper_id = ?',
+                       [(paper_id,) for paper_id, _ in papers])
+
+    links = []
+    for paper_id, names in papers:
+        seen = set()
+        for position, name in enumerate(names):
+            author_id = author_ids.get(normalize_author_name(name))
+            if author_id is None or author_id in seen:
+                continue
+            seen.add(author_id)
+            links.append((paper_id, author_id, position))
+
+    cursor.executemany(
+        'INSERT OR IGNORE INTO paper_authors (paper_id, author_id, position) VALUES (?, ?, ?)',
+        links
+    )
+    return len(links)
+
+
+def backfill_author_index(cursor) -> int:
+    """为尚未建立作者关联的旧论文补建索引，返回处理的论文数量"""
+    cursor.execute('''
+        SELECT id, authors FROM papers p
+        WHERE NOT EXISTS (SELECT 1 FROM paper_authors pa WHERE pa.paper_id = p.id)
+    ''')
+    rows = cursor.fetchall()
+    if rows:
+        index_paper_authors(cursor, rows)
+    return len(rows)
+
+
+def prune_orphan_authors(cursor) -> int:
+    """删除既没有论文也没有被关注的作者"""
+    cursor.execute('''
+        DELETE FROM authors
+        WHERE NOT EXISTS (SELECT 1 FROM paper_authors pa WHERE pa.author_id = authors.id)
+          AND NOT EXISTS (SELECT 1 FROM followed_authors fa WHERE fa.author_id = authors.id)
+    ''')
+    return cursor.rowcount
+
+
+def find_author_id(cursor, name: str) -> Optional[int]:
+    """按标准化名查找作者id"""
+    cursor.execute('SELECT id FROM authors WHERE normalized = ?', (normalize_author_name(name),))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def query_papers_by_author(cursor, name: str, limit: int = 50) -> List[Dict[str, Any]]:
+    """按作者查询论文，按发布日期倒序"""
+    author_id = find_author_id(cursor, name)
+    if author_id is None:
+        return []
+
+    cursor.execute('''
+        SELECT p.id, p.title, p.authors, p.published, p.pdf_url, p.conference
+        FROM paper_authors pa
+        JOIN papers p ON p.id = pa.paper_id
+        WHERE pa.author_id = ?
+        ORDER BY p.published DESC
+        LIMIT ?
+    ''', (author_id, limit))
+
+    return [
+        {
+            'id': row[0],
+            'title': row[1],
+            'authors': row[2],
+            'published': row[3],
+            'pdf_url': row[4],
+            'conference': row[5]
+        }
+        for row in cursor.fetchall()
+    ]
+
+
+def query_coauthors(cursor, name: str, limit: int = 20) -> List[Tuple[str, int]]:
+    """
+    共同作者邻域：与该作者合作过的作者及合作论文数
+    返回：[(作者名, 合作论文数), ...]
+    """
+    author_id = find_author_id(cursor, name)
+    if author_id is None:
+        return []
+
+    cursor.execute('''
+        SELECT a.name, COUNT(*) AS shared
+        FROM paper_authors mine
+        JOIN paper_authors other ON other.paper_id = mine.paper_id
+        JOIN authors a ON a.id = other.author_id
+        WHERE mine.author_id = ? AND other.author_id != mine.author_id
+        GROUP BY other.author_id
+        ORDER BY shared DESC, a.name
+        LIMIT ?
+    ''', (author_id, limit))
+    return cursor.fetchall()
+
+
+def follow_author(cursor, name: str) -> bool:
+    """关注作者（作者不存在时也会创建，便于先关注后入库）"""
+    author_ids = _get_author_ids(cursor, [name])
+    author_id = author_ids.get(normalize_author_name(name))
+    if author_id is None:
+        return False
+    cursor.execute('INSERT OR IGNORE INTO followed_authors (author_id) VALUES (?)', (author_id,))
+    return True
+
+
+def unfollow_author(cursor, name: str) -> bool:
+    """取消关注作者"""
+    author_id = find_author_id(cursor, name)
+    if author_id is None:
+        return False
+    cursor.execute('DELETE FROM followed_authors WHERE author_id = ?', (author_id,))
+    return cursor.rowcount > 0
+
+
+def list_followed_authors(cursor) -> List[str]:
+    """列出已关注的作者"""
+    cursor.execute('''
+        SELECT a.name FROM followed_authors fa
+        JOIN authors a ON a.id = fa.author_id
+        ORDER BY a.name
+    ''')
+    return [row[0] for row in cursor.fetchall()]
@@ -0,0 +1,115 @@
+"""
+数据库更新断点
+每个 arXiv 类别取完一页（并提交该页匹配的论文）后记录进度：已处理的页数、结果数
+和最后一条结果的id（cursor）。更新被取消、程序退出或崩溃后，下次更新从断点继续，
+已完成的类别直接跳过；所有类别都完成后清除断点。
+结果按提交时间倒序排列，期间的新投稿会让位置后移，因此继续时先退回一页，
+再跳过 cursor 及其之前的结果（见 FuzzyArxivFetcher._skip_to_cursor）。
+断点通过共享的数据库管理器读写，写入持有它的写锁，不会与清理、清空同时写库。
+"""
+
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+try:
+    from .progress import ARXIV_PAGE_SIZE
+except ImportError:
+    from progress import ARXIV_PAGE_SIZE
+
+# 断点超过该时间视为过期，重新完整获取（arXiv上的新论文太多，按 cursor 也难以对齐）
+CHECKPOINT_MAX_AGE = timedelta(hours=24)
+
+# 继续时最多向后查找 cursor 的页数，找不到（如论文被撤回）时扫描过的结果照常处理
+RESUME_SCAN_PAGES = 4
+
+
+def init_checkpoint_table(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS update_checkpoints (
+            category TEXT PRIMARY KEY,
+            last_page INTEGER NOT NULL DEFAULT 0,
+            results_seen INTEGER NOT NULL DEFAULT 0,
+            cursor TEXT,
+            completed INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT NOT NULL
+        )
+    ''')
+
+
+class UpdateCheckpoints:
+    """读写 update_checkpoints 表，每次写入单独提交"""
+
+    def __init__(self, db, max_age: timedelta = CHECKPOINT_MAX_AGE):
+        # 共享的 database.DatabaseManager（database 经 migrations 导入本模块，这里不反向导入）
+        self.db = db
+        self.max_age = max_age
+        self._states: Dict[str, Dict[str, Any]] = {}
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """读取未过期的断点（过期的直接删除）"""
+        cutoff = (datetime.now() - self.max_age).isoformat(timespec='seconds')
+        conn = self.db.connect()
+        try:
+            with self.db.write_lock:
+                cursor = conn.cursor()
+                cursor.execute('DELETE FROM update_checkpoints WHERE updated_at < ?', (cutoff,))
+                cursor.execute('''
+                    SELECT category, last_page, results_seen, cursor, completed
+                    FROM update_checkpoints
+                ''')
+                self._states = {
+                    row[0]: {
+                        'last_page': row[1],
+                        'results_seen': row[2],
+                        'cursor': row[3],
+                        'completed': bool(row[4]),
+                    }
+                    for row in cursor.fetchall()
+                }
+                conn.commit()
+        finally:
+            conn.close()
+        return self._states
+
+    def get(self, category: str) -> Optional[Dict[str, Any]]:
+        return self._states.get(category)
+
+    def save(self, category: str, results_seen: int, cursor: Optional[str], completed: bool = False):
+        """记录某类别的进度（results_seen 为已处理的结果数，含时间范围外的）"""
+        state = {
+            'last_page': math.ceil(results_seen / ARXIV_PAGE_SIZE),
+            'results_seen': results_seen,
+            'cursor': cursor,
+            'completed': completed,
+        }
+        conn = self.db.connect()
+        try:
+            with self.db.write_lock:
+                conn.execute('''
+                    INSERT INTO update_checkpoints
+                    (category, last_page, results_seen, cursor, completed, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(category) DO UPDATE SET
+                        last_page = excluded.last_page,
+                        results_seen = excluded.results_seen,
+                        cursor = excluded.cursor,
+                        completed = excluded.completed,
+                        updated_at = excluded.updated_at
+                ''', (category, state['last_page'], results_seen, cursor, int(completed),
+                      datetime.now().isoformat(timespec='seconds')))
+                conn.commit()
+        finally:
+            conn.close()
+        self._states[category] = state
+
+    def clear(self):
+        """整轮更新完成（或数据库清空）后清除所有断点"""
+        conn = self.db.connect()
+        try:
+            with self.db.write_lock:
+                conn.execute('DELETE FROM update_checkpoints')
+                conn.commit()
+        finally:
+            conn.close()
+        self._states = {}
@@ -0,0 +1,53 @@
+"""
+进程内共享的数据库管理器
+所有获取器共用一个管理器：表结构迁移只执行一次，连接参数统一，
+写操作经同一把锁串行执行，界面、更新线程和首次初始化不会同时写库。
+"""
+
+import functools
+import sqlite3
+import threading
+from typing import Optional
+
+try:
+    from .migrations import migrate_database
+except ImportError:
+    from migrations import migrate_database
+
+# 等待其他连接释放写锁的秒数
+BUSY_TIMEOUT = 30
+
+
+class DatabaseManager:
+    """管理一个SQLite数据库文件的初始化、连接和写锁"""
+
+    def __init__(self, db_path: str):
+        self.path = db_path
+        # 可重入：写方法内部调用其他写方法（如清理时删除会议论文）不会死锁
+        self.write_lock = threading.RLock()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def initialize(self):
+        """按版本原地升级表结构（每个进程只执行一次）"""
+        with self._init_lock:
+            if not self._initialized:
+                migrate_database(self.path)
+                self._initialized = True
+
+    def connect(self, isolation_level: Optional[str] = '') -> sqlite3.Connection:
+        """
+        打开一个新连接（每个线程、每次操作各用各的连接）
+        isolation_level=None 时由调用方手动管理事务（如分批删除）
+        写操作应在 write_lock 内执行
+        """
+        return sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=isolation_level)
+
+
+def writes_database(method):
+    """装饰获取器的写方法：持有 self.db 的写锁执行"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.db.write_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
@@ -12,6 +12,11 @@ from typing import Optional, List, Tuple, Dict
 from datetime import datetime
 import difflib
 
+try:
+    from . import profiling
+except ImportError:
+    import profiling
+
 class ConferenceFuzzyMatcher:
     def __init__(self):
         self.current_year = datetime.now().year
@@ -242,6 +247,7 @@ class ConferenceFuzzyMatcher:
             'confidence': confidence
         }
     
+    @profiling.profiled('matching')
     def is_conference_paper(self, title: str, abstract: str, comment: str = "") -> Optional[Dict[str, str]]:
         """
         判断是否为会议论文并识别会议
@@ -0,0 +1,206 @@
+"""
+papers_cache.db 表结构版本迁移
+以 PRAGMA user_version 记录当前版本，启动时在一个事务内按顺序执行
+所有未应用的迁移，原地升级表结构，缓存数据无需清空重新下载。
+
+新增迁移时：在 MIGRATIONS 末尾追加 (版本号, 说明, 函数)，已发布的迁移不要修改。
+"""
+
+import os
+import re
+import sqlite3
+import logging
+from typing import Callable, List, Tuple
+
+try:
+    from .text_store import init_text_table, migrate_inline_texts
+    from . import author_index
+    from .arxiv_ids import collapse_versioned_ids
+    from .checkpoints import init_checkpoint_table
+except ImportError:
+    from text_store import init_text_table, migrate_inline_texts
+    import author_index
+    from arxiv_ids import collapse_versioned_ids
+    from checkpoints import init_checkpoint_table
+
+logger = logging.getLogger(__name__)
+
+# papers 主表的完整列定义（ArxivFetcher 和 FuzzyArxivFetcher 共用）
+PAPERS_COLUMNS = [
+    ('id', 'TEXT PRIMARY KEY'),
+    ('version', 'INTEGER'),
+    ('title', 'TEXT NOT NULL'),
+    ('authors', 'TEXT NOT NULL'),
+    ('published', 'DATE NOT NULL'),
+    ('pdf_url', 'TEXT'),
+    ('conference', 'TEXT'),
+    ('conference_year', 'TEXT'),
+    ('confidence', 'REAL'),
+    ('categories', 'TEXT'),
+    ('fetched_date', 'DATE DEFAULT CURRENT_DATE'),
+]
+
+
+def _table_columns(cursor, table: str) -> List[str]:
+    cursor.execute(f'PRAGMA table_info({table})')
+    return [row[1] for row in cursor.fetchall()]
+
+
+def _add_missing_columns(cursor, table: str, columns: List[Tuple[str, str]]):
+    """补充旧表缺少的列（ALTER TABLE 不支持 NOT NULL 无默认值和 CURRENT_DATE 默认值，去掉这些约束）"""
+    existing = set(_table_columns(cursor, table))
+    for name, definition in columns:
+        if name not in existing:
+            definition = re.sub(r'NOT NULL|DEFAULT CURRENT_\w+', '', definition).strip()
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {definition}')
+
+
+def _refresh_conference_stats(cursor):
+    cursor.execute('DELETE FROM conference_stats')
+    cursor.execute('''
+        INSERT INTO conference_stats (conference, total_papers, avg_confidence)
+        SELECT conference, COUNT(*), AVG(confidence)
+        FROM papers
+        WHERE conference IS NOT NULL
+        GROUP BY conference
+    ''')
+
+
+def _migrate_v1(cursor):
+    """统一两个获取器的 papers 表结构"""
+    # 旧版本的两个获取器建出的表列不同，这里统一补齐
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS papers (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            authors TEXT NOT NULL,
+            abstract TEXT,
+            published DATE NOT NULL,
+            pdf_url TEXT,
+            conference TEXT,
+            conference_year TEXT,
+            confidence REAL,
+            categories TEXT,
+            comment TEXT,
+            fetched_date DATE DEFAULT CURRENT_DATE
+        )
+    ''')
+    _add_missing_columns(cursor, 'papers', PAPERS_COLUMNS + [('abstract', 'TEXT'), ('comment', 'TEXT')])
+
+    # 基础版获取器没有置信度，按关键词命中视为完全可信
+    cursor.execute('UPDATE papers SET confidence = 1.0 WHERE confidence IS NULL AND conference IS NOT NULL')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS conference_stats (
+            conference TEXT PRIMARY KEY,
+            total_papers INTEGER,
+            avg_confidence REAL,
+            last_updated DATE DEFAULT CURRENT_DATE
+        )
+    ''')
+
+
+def _migrate_v2(cursor):
+    """摘要和评论移到压缩侧表"""
+    init_text_table(cursor)
+    migrated = migrate_inline_texts(cursor)
+    if migrated:
+        logger.info(f"已将 {migrated} 篇论文的摘要迁移到压缩存储")
+
+
+def _migrate_v3(cursor):
+    """建立作者索引"""
+    author_index.init_author_tables(cursor)
+    indexed = author_index.backfill_author_index(cursor)
+    if indexed:
+        logger.info(f"已为 {indexed} 篇论文建立作者索引")
+
+
+def _migrate_v4(cursor):
+    """合并同一论文的多个版本，主键改为规范id"""
+    collapsed = collapse_versioned_ids(cursor)
+    if collapsed:
+        _refresh_conference_stats(cursor)
+        logger.info(f"已合并 {collapsed} 篇重复版本的论文")
+
+
+def _migrate_v5(cursor):
+    """重建 papers 表，去掉已迁移到侧表的 abstract/comment 列"""
+    columns = ', '.join(f'{name} {definition}' for name, definition in PAPERS_COLUMNS)
+    names = ', '.join(name for name, _ in PAPERS_COLUMNS)
+
+    cursor.execute(f'CREATE TABLE papers_new ({columns})')
+    cursor.execute(f'INSERT INTO papers_new ({names}) SELECT {names} FROM papers')
+    cursor.execute('DROP TABLE papers')
+    cursor.execute('ALTER TABLE papers_new RENAME TO papers')
+
+    # 旧表上的触发器随表删除，需要重建
+    init_text_table(cursor)
+    author_index.init_author_tables(cursor)
+
+
+def _migrate_v6(cursor):
+    """保留策略和会议统计使用的索引"""
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_papers_published ON papers (published)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_papers_conference ON papers (conference)')
+
+
+def _migrate_v7(cursor):
+    """更新断点表"""
+    init_checkpoint_table(cursor)
+
+
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, '统一papers表结构', _migrate_v1),
+    (2, '摘要压缩存储', _migrate_v2),
+    (3, '作者索引', _migrate_v3),
+    (4, '规范arXiv id', _migrate_v4),
+    (5, '重建papers表', _migrate_v5),
+    (6, '日期和会议索引', _migrate_v6),
+    (7, '更新断点', _migrate_v7),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """读取数据库当前的表结构版本"""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate_database(db_path: str) -> int:
+    """
+    把数据库升级到最新版本
+    所有待执行的迁移在同一个事务中完成，任何一步失败都会整体回滚
+    返回：执行的迁移数量
+    """
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        if get_schema_version(conn) >= SCHEMA_VERSION:
+            return 0
+
+        cursor = conn.cursor()
+
+        # 新数据库在建表前启用增量回收（旧数据库由保留策略在后台切换）
+        if conn.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()[0] == 0:
+            cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+
+        # IMMEDIATE 先拿写锁，避免两个获取器同时升级；拿到锁后重新读取版本
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            current = get_schema_version(conn)
+            pending = [m for m in MIGRATIONS if m[0] > current]
+            for version, description, migrate in pending:
+                logger.info(f"数据库迁移 v{version}: {description}")
+                migrate(cursor)
+            cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            cursor.execute('COMMIT')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+
+        return len(pending)
+    finally:
+        conn.close()
@@ -0,0 +1,271 @@
+"""
+按需性能分析
+设置环境变量 PAPER_WIDGET_PROFILE=1（或在托盘菜单中打开）后，每次数据库更新和刷新论文
+都记录一次分析：按类别（网络、会议匹配、数据库、界面）统计耗时，并用 cProfile 记录入口线程
+的函数调用，结束时写入报告文件。
+埋点只计入本线程当前生效的分析；工作线程替某次分析执行任务时，由提交方把分析随任务交过去。
+没有生效的分析时各埋点只读取一次线程局部变量，几乎没有额外开销。
+"""
+
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV = "PAPER_WIDGET_PROFILE"
+
+# 报告中分类的显示名称
+CATEGORIES = {
+    'network': '网络（arXiv）',
+    'matching': '会议匹配',
+    'db': '数据库',
+    'tk': '界面（Tk）',
+    # 计过时但不属于以上类别的自身耗时（如 fetch_recent_papers 的解析和调度）
+    'other': '其他',
+}
+
+DEFAULT_REPORT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data", "profiles"
+)
+
+_enabled = os.environ.get(PROFILE_ENV, "") not in ("", "0")
+_report_dir = DEFAULT_REPORT_DIR
+
+# 每个线程当前所属的分析和进行中的埋点栈
+_local = threading.local()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(enabled: bool):
+    """打开或关闭分析模式（进行中的分析照常完成）"""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def set_report_dir(path: str):
+    global _report_dir
+    _report_dir = path
+
+
+class ProfileRun:
+    """
+    一次分析：只统计在该分析生效期间（见 activate）开始的埋点，
+    其他线程上无关的工作（如刷新时并行进行的数据库更新）不计入
+    """
+
+    def __init__(self, name: str, use_cprofile: bool = True):
+        self.name = name
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.finished = False
+        self.category_seconds: Dict[str, float] = {category: 0.0 for category in CATEGORIES}
+        # {埋点名称: [调用次数, 自身耗时]}
+        self.spans: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        # cProfile 只在开始分析的线程中启用（Profile 对象不能跨线程共用）
+        self._profile = cProfile.Profile() if use_cprofile else None
+        self._thread = threading.get_ident()
+        self._profile_depth = 0
+
+    def add(self, category: str, label: str, seconds: float):
+        with self._lock:
+            if self.finished:
+                return
+            self.category_seconds[category] += seconds
+            span = self.spans.setdefault(label, [0, 0.0])
+            span[0] += 1
+            span[1] += seconds
+
+    def report(self, elapsed: float) -> str:
+        lines = [
+            f"=== 性能分析: {self.name} ===",
+            f"开始时间: {self.started_at.isoformat(timespec='seconds')}",
+            f"总耗时: {elapsed:.3f} s",
+            "",
+            "分类耗时（自身耗时；后台线程与入口线程并行时合计可能超过总耗时）:",
+        ]
+        attributed = 0.0
+        for category in sorted(CATEGORIES, key=lambda name: -self.category_seconds[name]):
+            seconds = self.category_seconds[category]
+            attributed += seconds
+            share = seconds / elapsed * 100 if elapsed else 0.0
+            lines.append(f"  {CATEGORIES[category]:<14}{seconds:10.3f} s {share:6.1f}%")
+        untimed = max(0.0, elapsed - attributed)
+        lines.append(f"  {'未计时':<14}{untimed:10.3f} s {untimed / elapsed * 100 if elapsed else 0.0:6.1f}%")
+
+        lines += ["", f"{'埋点':<48}{'调用':>8}{'耗时(s)':>12}"]
+        for label, (calls, seconds) in sorted(self.spans.items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {label:<46}{calls:>8}{seconds:>12.3f}")
+
+        if self._profile is not None:
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=stream)
+            stats.sort_stats('cumulative').print_stats(30)
+            lines += ["", "cProfile（入口线程，按累计耗时前30）:", stream.getvalue()]
+        return "\n".join(lines)
+
+
+def start_run(name: str, use_cprofile: bool = True) -> Optional[ProfileRun]:
+    """
+    开始一次分析（分析模式关闭时返回None）
+    只创建分析，埋点在 activate(run) 的范围内才计入
+    """
+    if not _enabled:
+        return None
+    return ProfileRun(name, use_cprofile)
+
+
+def current_run() -> Optional[ProfileRun]:
+    """当前线程正在生效的分析（交给工作线程的任务应随任务一起带上）"""
+    return getattr(_local, 'run', None)
+
+
+@contextmanager
+def activate(run: Optional[ProfileRun]):
+    """
+    在当前线程中让分析生效：范围内开始的埋点计入该分析
+    在开始分析的线程中同时启用 cProfile；run 为None或已结束时什么也不做
+    """
+    if run is None or run.finished:
+        yield
+        return
+
+    previous = getattr(_local, 'run', None)
+    _local.run = run
+    profiling = run._profile is not None and run._thread == threading.get_ident()
+    if profiling and run._profile_depth == 0:
+        try:
+            run._profile.enable()
+        except ValueError:
+            # 该线程已有其他分析器在运行
+            run._profile = None
+            profiling = False
+    if profiling:
+        run._profile_depth += 1
+    try:
+        yield
+    finally:
+        if profiling:
+            run._profile_depth -= 1
+            if run._profile_depth == 0 and not run.finished:
+                run._profile.disable()
+        _local.run = previous
+
+
+def finish_run(run: Optional[ProfileRun]) -> Optional[str]:
+    """结束分析并写入报告（需在开始分析的线程中调用），返回报告路径；之后的埋点不再计入"""
+    if run is None:
+        return None
+    with run._lock:
+        run.finished = True
+    if run._profile is not None:
+        run._profile.disable()
+    elapsed = time.perf_counter() - run.start
+
+    os.makedirs(_report_dir, exist_ok=True)
+    path = os.path.join(_report_dir, f"{run.name}-{run.started_at.strftime('%Y%m%d-%H%M%S-%f')}.txt")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(run.report(elapsed))
+    logger.info(f"性能分析报告（{run.name}，{elapsed:.2f}s）: {path}")
+    return path
+
+
+def profiled_run(name: str) -> Callable:
+    """装饰同步执行的入口（如 update_cache_with_clean）：分析模式打开时整个调用记为一次分析"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            run = start_run(name)
+            if run is None:
+                return func(*args, **kwargs)
+            try:
+                with activate(run):
+                    return func(*args, **kwargs)
+            finally:
+                finish_run(run)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def _timing(run: ProfileRun, category: str, label: str):
+    """计时一段代码并计入 run；嵌套埋点的耗时从外层扣除，各类别记录的都是自身耗时"""
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    frame = [0.0]
+    stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stack.pop()
+        if stack:
+            stack[-1][0] += elapsed
+        run.add(category, label, elapsed - frame[0])
+
+
+@contextmanager
+def span(category: str, label: Optional[str] = None):
+    """把一段代码的耗时计入当前线程生效的分析（没有时不计时）"""
+    run = getattr(_local, 'run', None)
+    if run is None:
+        yield
+        return
+    with _timing(run, category, label or category):
+        yield
+
+
+def profiled(category: str, label: Optional[str] = None) -> Callable:
+    """装饰函数，把每次调用的耗时计入当前线程生效的分析（没有时直接调用）"""
+    def decorator(func):
+        name = label or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            run = getattr(_local, 'run', None)
+            if run is None:
+                return func(*args, **kwargs)
+            with _timing(run, category, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed_iter(category: str, iterable: Iterable, label: Optional[str] = None) -> Iterable:
+    """逐项计时迭代（如分页下载），只统计取下一项的时间"""
+    if current_run() is None:
+        return iterable
+    return _timed_iter(category, iterable, label or category)
+
+
+def _timed_iter(category, iterable, label):
+    iterator = iter(iterable)
+    while True:
+        run = getattr(_local, 'run', None)
+        if run is not None:
+            with _timing(run, category, label):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+        else:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
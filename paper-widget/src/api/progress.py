@@ -0,0 +1,189 @@
+"""
+数据库更新进度与取消
+更新过程中按阶段计时，生成进度事件交给回调。事件是累计快照（dict），
+调用方只需保留最新的一个；GUI 端合并后每秒最多重绘约10次。
+取消令牌在获取、匹配和写入之间检查，取消后抛出 UpdateCancelled。
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+# arxiv 库每页请求的结果数（arxiv.Client 默认值）
+ARXIV_PAGE_SIZE = 100
+
+# 计时的阶段：从arXiv获取、会议匹配、写入数据库
+STAGES = ('fetch', 'match', 'persist')
+
+STAGE_NAMES = {
+    'clean': '清理旧数据',
+    'fetch': '获取论文',
+    'done': '完成',
+}
+
+
+class UpdateCancelled(Exception):
+    """更新被用户取消"""
+
+
+class CancellationToken:
+    """协作式取消令牌：界面线程调用 cancel()，更新线程在检查点调用 raise_if_cancelled()"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise UpdateCancelled()
+
+
+class UpdateProgress:
+    """跟踪一次数据库更新的进度，每次状态变化时把快照交给回调"""
+
+    def __init__(self, callback: Optional[ProgressCallback] = None):
+        self.callback = callback
+        self.started = time.monotonic()
+        self.stage = 'clean'
+
+        self.categories: List[str] = []
+        self.max_per_category = 0
+        self.category = None
+        self.category_index = 0
+        self.category_results = 0
+
+        self.fetched = 0
+        self.matched = 0
+        self.saved = 0
+
+        self.stage_seconds = {stage: 0.0 for stage in STAGES}
+        self.stage_items = {stage: 0 for stage in STAGES}
+
+    def set_stage(self, stage: str):
+        self.stage = stage
+        self.emit()
+
+    def begin_fetch(self, categories: Iterable[str], max_per_category: int):
+        self.categories = list(categories)
+        self.max_per_category = max_per_category
+        self.set_stage('fetch')
+
+    def start_category(self, index: int, category: str, resumed_results: int = 0):
+        """开始处理一个类别（resumed_results: 从断点继续时已处理的结果数）"""
+        self.category_index = index
+        self.category = category
+        self.category_results = resumed_results
+        self.emit()
+
+    def result_fetched(self, in_range: bool = True, matched: bool = False):
+        """收到一条arXiv结果（in_range: 在时间范围内；matched: 匹配到会议）"""
+        self.category_results += 1
+        if in_range:
+            self.fetched += 1
+        if matched:
+            self.matched += 1
+        self.emit()
+
+    def results_skipped(self, count: int = 1):
+        """从断点继续时跳过了上次已处理的结果（计入位置，不计入获取数）"""
+        self.category_results += count
+
+    def papers_saved(self, count: int):
+        self.saved += count
+        self.emit()
+
+    def finish(self):
+        self.set_stage('done')
+
+    @contextmanager
+    def timed(self, stage: str, items: int = 1):
+        """统计一段代码在某阶段的耗时"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds[stage] += time.perf_counter() - start
+            self.stage_items[stage] += items
+
+    def timed_iter(self, stage: str, iterable: Iterable):
+        """逐项统计迭代（如分页下载）在某阶段的耗时"""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.stage_seconds[stage] += time.perf_counter() - start
+                return
+            self.stage_seconds[stage] += time.perf_counter() - start
+            self.stage_items[stage] += 1
+            yield item
+
+    def fraction(self) -> float:
+        """估算的总体完成比例（按类别数和每类最大结果数）"""
+        if self.stage == 'done':
+            return 1.0
+        if not self.categories:
+            return 0.0
+        within = min(1.0, self.category_results / self.max_per_category) if self.max_per_category else 0.0
+        return min(1.0, (self.category_index + within) / len(self.categories))
+
+    def eta(self) -> Optional[float]:
+        """按已用时间和完成比例估算的剩余秒数"""
+        fraction = self.fraction()
+        if fraction <= 0 or self.stage != 'fetch':
+            return None
+        elapsed = time.monotonic() - self.started
+        return elapsed * (1 - fraction) / fraction
+
+    def rates(self) -> Dict[str, float]:
+        """各阶段每秒处理的论文数"""
+        return {
+            stage: self.stage_items[stage] / seconds
+            for stage, seconds in self.stage_seconds.items()
+            if seconds > 0
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'stage': self.stage,
+            'category': self.category,
+            'category_index': self.category_index + 1,
+            'category_count': len(self.categories),
+            'pages': math.ceil(self.category_results / ARXIV_PAGE_SIZE),
+            'fetched': self.fetched,
+            'matched': self.matched,
+            'saved': self.saved,
+            'fraction': self.fraction(),
+            'elapsed': time.monotonic() - self.started,
+            'eta': self.eta(),
+            'rates': self.rates(),
+        }
+
+    def emit(self):
+        if self.callback is not None:
+            self.callback(self.snapshot())
+
+
+def describe_progress(event: Dict[str, Any]) -> str:
+    """把进度事件格式化为状态栏文本"""
+    if event['stage'] != 'fetch' or not event['category']:
+        return f"🔄 {STAGE_NAMES.get(event['stage'], event['stage'])}..."
+
+    text = (f"🔄 {event['category']} ({event['category_index']}/{event['category_count']}) "
+            f"第{event['pages']}页 | 匹配 {event['matched']}/{event['fetched']} | 已入库 {event['saved']}")
+    if 'fetch' in event['rates']:
+        text += f" | {event['rates']['fetch']:.0f}篇/秒"
+    if event['eta'] is not None:
+        text += f" | 剩余约 {int(event['eta'])}秒"
+    return text
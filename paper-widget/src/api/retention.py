@@ -0,0 +1,156 @@
+"""
+缓存保留策略
+过期论文按 published 索引分批删除，每批单独提交，避免长时间占用写锁让界面读取卡住；
+数据库使用 auto_vacuum=INCREMENTAL，删除后分批回收空闲页，文件体积随之缩小。
+所有连接都由共享的数据库管理器打开，写操作持有它的写锁（每批单独获取）。
+"""
+
+import os
+import sqlite3
+import logging
+from typing import Sequence, Tuple
+
+try:
+    from . import author_index
+    from .database import DatabaseManager
+except ImportError:
+    import author_index
+    from database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+# 每批删除的论文数量（连同触发器清理的侧表行，一批通常在几毫秒内完成）
+DELETE_BATCH_SIZE = 500
+
+# 每次增量回收的页数
+VACUUM_BATCH_PAGES = 256
+
+# 空闲页少于该数量时不回收
+MIN_FREE_PAGES = 64
+
+AUTO_VACUUM_NONE = 0
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+def _connect(db: DatabaseManager) -> sqlite3.Connection:
+    # 手动管理事务，每批删除单独提交
+    return db.connect(isolation_level=None)
+
+
+def ensure_incremental_vacuum(db: DatabaseManager) -> bool:
+    """
+    把旧数据库切换为 auto_vacuum=INCREMENTAL
+    从 NONE 切换需要一次完整 VACUUM，较慢，只应在后台线程中调用
+    返回：是否进行了切换
+    """
+    conn = _connect(db)
+    try:
+        with db.write_lock:
+            mode = conn.execute('PRAGMA auto_vacuum').fetchone()[0]
+            if mode == AUTO_VACUUM_INCREMENTAL:
+                return False
+
+            conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            if mode == AUTO_VACUUM_NONE:
+                conn.execute('VACUUM')
+        logger.info("数据库已切换为增量回收模式")
+        return True
+    finally:
+        conn.close()
+
+
+def delete_in_batches(db: DatabaseManager, where: str, params: Sequence = (),
+                      batch_size: int = DELETE_BATCH_SIZE) -> int:
+    """
+    按条件分批删除论文，where 条件应能命中索引
+    返回：删除的论文数量
+    """
+    conn = _connect(db)
+    deleted = 0
+    try:
+        while True:
+            # 每批单独持有写锁，批次之间其他写操作（如保存断点）可以插入
+            with db.write_lock:
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    cursor = conn.execute(f'''
+                        DELETE FROM papers WHERE rowid IN (
+                            SELECT rowid FROM papers WHERE {where} LIMIT ?
+                        )
+                    ''', (*params, batch_size))
+                    conn.execute('COMMIT')
+                except Exception:
+                    conn.execute('ROLLBACK')
+                    raise
+
+            deleted += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                break
+    finally:
+        conn.close()
+    return deleted
+
+
+def reclaim_free_pages(db: DatabaseManager, max_pages: int = None) -> int:
+    """
+    分批执行 incremental_vacuum 回收空闲页，直到回收够 max_pages 页或空闲页不再减少
+    返回：实际回收的字节数（按前后的空闲页数计算）
+    """
+    conn = _connect(db)
+    try:
+        if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+            return 0
+
+        page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+        free_before = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        if free_before < MIN_FREE_PAGES:
+            return 0
+
+        target = free_before if max_pages is None else min(free_before, max_pages)
+        free_pages = free_before
+        while free_before - free_pages < target:
+            step = min(VACUUM_BATCH_PAGES, target - (free_before - free_pages))
+            with db.write_lock:
+                # incremental_vacuum 每执行一步只释放一页，必须取完结果才会回收全部 step 页
+                conn.execute(f'PRAGMA incremental_vacuum({step})').fetchall()
+                remaining = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            if remaining >= free_pages:
+                break
+            free_pages = remaining
+        return (free_before - free_pages) * page_size
+    finally:
+        conn.close()
+
+
+def expire_papers(db: DatabaseManager, cutoff_date: str) -> int:
+    """删除发布日期早于 cutoff_date 的论文（走 idx_papers_published 索引）"""
+    return delete_in_batches(db, 'published < ?', (cutoff_date,))
+
+
+def apply_retention(db: DatabaseManager, cutoff_date: str) -> Tuple[int, int]:
+    """
+    执行一次完整的保留策略：分批删除过期论文、清理孤立作者、回收空闲页
+    返回：(删除的论文数量, 回收的字节数)
+    """
+    size_before = file_size(db.path)
+    ensure_incremental_vacuum(db)
+
+    deleted = expire_papers(db, cutoff_date)
+    if deleted:
+        conn = _connect(db)
+        try:
+            with db.write_lock:
+                author_index.prune_orphan_authors(conn.cursor())
+        finally:
+            conn.close()
+
+    reclaim_free_pages(db)
+    return deleted, max(0, size_before - file_size(db.path))
+
+
+def file_size(db_path: str) -> int:
+    """数据库文件大小（字节），文件不存在时为0"""
+    try:
+        return os.path.getsize(db_path)
+    except OSError:
+        return 0
@@ -0,0 +1,159 @@
+"""
+论文长文本压缩存储
+abstract 和 comment 是缓存中体积最大的字段，但只在匹配和重新分类时才会读取。
+这里把它们压缩后存放在 paper_texts 侧表中，papers 主表只保留抽样、统计
+和范围删除需要的短字段，读取时透明解压。
+"""
+
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 压缩数据的首字节标识编码方式，便于以后更换字典或算法
+CODEC_RAW = 0         # 未压缩的UTF-8文本（短文本压缩收益为负）
+CODEC_ZLIB = 1        # 普通zlib
+CODEC_ZLIB_DICT = 2   # 使用预置字典 v1 的zlib
+
+# 短于该长度的文本直接存原文
+MIN_COMPRESS_SIZE = 64
+
+# 预置字典：arXiv 摘要/评论中的高频短语
+# zlib 对字典末尾的内容引用代价最低，所以越常见的短语越靠后
+# 注意：字典内容一旦发布就不能修改，否则旧数据无法解压；需要调整时新增编码标识
+_ABSTRACT_PHRASES = [
+    "Camera-ready version. Code is available at https://github.com/",
+    "Accepted to NeurIPS 2025. Accepted at ICLR 2025. Accepted by ICML 2025. ",
+    "Accepted at CVPR 2025. Accepted to ACL 2025 Findings. EMNLP 2025 Main. ",
+    "Accepted at IEEE S&P 2025. USENIX Security 2025. ACM CCS 2025. NDSS 2025. ",
+    " pages, figures, tables, appendix. ",
+    "reinforcement learning, large language models (LLMs), vision-language models, ",
+    "diffusion models, graph neural networks, transformer architecture, ",
+    "adversarial attacks, privacy-preserving, differential privacy, federated learning, ",
+    "extensive experiments on benchmark datasets demonstrate that our method ",
+    "significantly outperforms existing approaches and achieves state-of-the-art performance ",
+    "In this paper, we propose a novel framework that ",
+    "we introduce a new approach to address this problem. ",
+    "Our results show that the proposed method ",
+    "However, existing methods ",
+    "Furthermore, we demonstrate ",
+    "training data, inference, generalization, robustness, efficiency, ",
+    "In this work, we propose ",
+    " the performance of the model ",
+    " state-of-the-art ",
+    " large language models ",
+    " of the ",
+    " in the ",
+    " and the ",
+    " to the ",
+    " we propose ",
+]
+
+ABSTRACT_DICTIONARY = "".join(_ABSTRACT_PHRASES).encode('utf-8')
+
+
+def compress_text(text: Optional[str]) -> Optional[bytes]:
+    """压缩文本，空文本返回None"""
+    if not text:
+        return None
+
+    raw = text.encode('utf-8')
+    if len(raw) < MIN_COMPRESS_SIZE:
+        return bytes([CODEC_RAW]) + raw
+
+    compressor = zlib.compressobj(level=9, zdict=ABSTRACT_DICTIONARY)
+    packed = compressor.compress(raw) + compressor.flush()
+    if len(packed) >= len(raw):
+        return bytes([CODEC_RAW]) + raw
+    return bytes([CODEC_ZLIB_DICT]) + packed
+
+
+def decompress_text(blob: Optional[bytes]) -> str:
+    """解压文本，兼容未压缩的旧数据"""
+    if blob is None:
+        return ""
+    if isinstance(blob, str):
+        # 迁移前遗留在papers表中的明文
+        return blob
+
+    codec, payload = blob[0], bytes(blob[1:])
+    if codec == CODEC_RAW:
+        return payload.decode('utf-8')
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(payload).decode('utf-8')
+    if codec == CODEC_ZLIB_DICT:
+        decompressor = zlib.decompressobj(zdict=ABSTRACT_DICTIONARY)
+        return (decompressor.decompress(payload) + decompressor.flush()).decode('utf-8')
+
+    raise ValueError(f"未知的文本编码标识: {codec}")
+
+
+def init_text_table(cursor):
+    """创建长文本侧表，并在删除论文时级联清理"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS paper_texts (
+            id TEXT PRIMARY KEY,
+            abstract BLOB,
+            comment BLOB
+        )
+    ''')
+
+    # INSERT OR REPLACE 默认不会触发删除触发器，所以更新论文时文本不会丢失
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS papers_delete_texts
+        AFTER DELETE ON papers
+        BEGIN
+            DELETE FROM paper_texts WHERE id = OLD.id;
+        END
+    ''')
+
+
+def save_texts(cursor, rows: Iterable[Tuple[str, Optional[str], Optional[str]]]):
+    """批量保存 (id, abstract, comment)"""
+    cursor.executemany('''
+        INSERT OR REPLACE INTO paper_texts (id, abstract, comment)
+        VALUES (?, ?, ?)
+    ''', [
+        (paper_id, compress_text(abstract), compress_text(comment))
+        for paper_id, abstract, comment in rows
+    ])
+
+
+def load_texts(cursor, paper_ids: List[str]) -> Dict[str, Dict[str, str]]:
+    """按id批量读取并解压摘要和评论"""
+    texts = {}
+    # SQLite 默认最多999个参数，分批查询
+    for start in range(0, len(paper_ids), 500):
+        batch = paper_ids[start:start + 500]
+        placeholders = ','.join('?' * len(batch))
+        cursor.execute(
+            f'SELECT id, abstract, comment FROM paper_texts WHERE id IN ({placeholders})',
+            batch
+        )
+        for paper_id, abstract, comment in cursor.fetchall():
+            texts[paper_id] = {
+                'abstract': decompress_text(abstract),
+                'comment': decompress_text(comment)
+            }
+    return texts
+
+
+def migrate_inline_texts(cursor) -> int:
+    """
+    把旧版本直接存在papers表中的abstract/comment搬到侧表
+    返回迁移的论文数量
+    """
+    cursor.execute('PRAGMA table_info(papers)')
+    columns = {row[1] for row in cursor.fetchall()}
+    text_columns = [name for name in ('abstract', 'comment') if name in columns]
+    if not text_columns:
+        return 0
+
+    comment_expr = 'comment' if 'comment' in columns else 'NULL'
+    where = ' OR '.join(f'{name} IS NOT NULL' for name in text_columns)
+    cursor.execute(f'SELECT id, abstract, {comment_expr} FROM papers WHERE {where}')
+    rows = cursor.fetchall()
+    if not rows:
+        return 0
+
+    save_texts(cursor, rows)
+    cursor.execute(f"UPDATE papers SET {', '.join(f'{name} = NULL' for name in text_columns)} WHERE {where}")
+    return len(rows)
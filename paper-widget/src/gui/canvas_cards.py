@@ -0,0 +1,194 @@
+import itertools
+
+from .paper_card import display_texts
+
+
+class CanvasPaperCard:
+    """
+    轻量级论文卡片 - 直接在Canvas上绘制矩形和文本项，不创建任何Tk控件
+    接口与 PaperCard 相同（bind / place_at / hide / slot_height），
+    由 VirtualCardList 统一回收复用；换主题、滚动只是Canvas项的配置和移动。
+    在 config.json 中设置 "card_renderer": "canvas" 启用。
+    """
+
+    _ids = itertools.count()
+
+    def __init__(self, canvas, theme_manager, layout, on_open):
+        self.canvas = canvas
+        self.theme_manager = theme_manager
+        self.layout = layout
+        self.on_open = on_open
+        self.paper = None
+        self.colors = None
+        self.visible = False
+
+        self.tag = f"paper_card_{next(self._ids)}"
+        self._y = 0
+        self._width = None
+        self._height = 0
+        self._show_separator = False
+        self._apply_scale(layout.scale)
+
+        # 文本项使用主题管理器的共享字体，缩放时自动更新
+        caption_font = theme_manager.get_font('caption')
+        tags = (self.tag,)
+        self.background = canvas.create_rectangle(0, 0, 0, 0, width=1, tags=tags)
+        self.badge = canvas.create_rectangle(0, 0, 0, 0, width=0, tags=tags)
+        self.badge_text = canvas.create_text(0, 0, anchor="nw", fill="white",
+                                             font=caption_font, tags=tags)
+        self.date_text = canvas.create_text(0, 0, anchor="ne", font=caption_font, tags=tags)
+        self.title_text = canvas.create_text(0, 0, anchor="nw", font=theme_manager.get_font('subtitle'),
+                                             width=layout.wrap_length, tags=tags + (self.tag + "_title",))
+        self.authors_text = canvas.create_text(0, 0, anchor="nw", font=theme_manager.get_font('body'),
+                                               width=layout.wrap_length, tags=tags)
+        self.separator = canvas.create_line(0, 0, 0, 0, tags=tags)
+
+        # 悬停和点击读取当前绑定的论文，换绑后无需重新绑定事件
+        title_tag = self.tag + "_title"
+        canvas.tag_bind(title_tag, "<Button-1>", self._on_click)
+        canvas.tag_bind(title_tag, "<Enter>", self._on_enter)
+        canvas.tag_bind(title_tag, "<Leave>", self._on_leave)
+
+        canvas.itemconfigure(self.tag, state="hidden")
+
+        # 切换主题时原地更新各项颜色，调整窗口大小时原地重新布局
+        theme_manager.add_theme_listener(self._apply_colors)
+        layout.add_listener(self._on_layout_changed)
+
+    def bind(self, paper, scale, show_separator):
+        """绑定新的论文数据，更新文本、配色并重新计算纵向布局"""
+        self.paper = paper
+        self._show_separator = show_separator
+
+        canvas = self.canvas
+
+        title_text, authors = display_texts(paper, scale)
+
+        canvas.itemconfigure(self.badge_text, text=f" {paper['conference']} ")
+        canvas.itemconfigure(self.date_text, text=f"📅 {paper['published']}")
+        canvas.itemconfigure(self.title_text, text=title_text)
+        canvas.itemconfigure(self.authors_text, text=f"👥 {authors}")
+        self._apply_colors()
+
+        # 宽度未变时也要重新布局（文本高度可能变化）
+        self._width = None
+        self._layout(self._y)
+
+    def _apply_scale(self, scale):
+        """按缩放因子计算内边距 (外边距x, 外边距y, 内边距) 和间距 (标题前, 作者前, 卡片底部)"""
+        self._padding = (max(15, int(20 * scale)), max(8, int(12 * scale)), max(16, int(20 * scale)))
+        self._badge_padding = (max(6, int(10 * scale)), max(3, int(4 * scale)))
+        self._gaps = (max(10, int(15 * scale)), max(6, int(10 * scale)), max(4, int(6 * scale)))
+
+    def _on_layout_changed(self, scale, wrap_length):
+        """窗口尺寸变化：更新换行宽度和内边距，显示中的卡片原地重新布局"""
+        self._apply_scale(scale)
+        self.canvas.itemconfigure(self.title_text, width=wrap_length)
+        self.canvas.itemconfigure(self.authors_text, width=wrap_length)
+        # 空闲池中的卡片在下次 bind() 时布局
+        if self.visible:
+            self._layout(self._y)
+
+    def _apply_colors(self):
+        """按当前主题和会议类型设置各项颜色"""
+        if self.paper is None:
+            return
+
+        theme_manager = self.theme_manager
+        canvas = self.canvas
+        colors = theme_manager.get_current_colors()
+        self.colors = colors
+        conference_type = theme_manager.get_conference_type(self.paper['conference'])
+        conf_colors = theme_manager.get_conference_colors(conference_type)
+
+        canvas.itemconfigure(self.background,
+                             fill=conf_colors.get("bg", colors["card_bg"]),
+                             outline=colors["border"])
+        canvas.itemconfigure(self.badge, fill=conf_colors.get("border", colors["primary"]))
+        canvas.itemconfigure(self.date_text, fill=colors["text_secondary"])
+        canvas.itemconfigure(self.title_text, fill=colors["primary"])
+        canvas.itemconfigure(self.authors_text, fill=colors["text_secondary"])
+        canvas.itemconfigure(self.separator, fill=colors["border"])
+
+    def _layout(self, y):
+        """按当前文本尺寸摆放所有项，y为卡片槽位顶部"""
+        canvas = self.canvas
+        width = max(1, canvas.winfo_width())
+        padding_x, padding_y, card_padding = self._padding
+        badge_pad_x, badge_pad_y = self._badge_padding
+        header_gap, title_gap, authors_gap = self._gaps
+
+        left = padding_x
+        right = width - padding_x
+        top = y + padding_y
+        inner_left = left + card_padding
+        cursor_y = top + card_padding
+
+        # 隐藏的项没有bbox，测量期间临时显示（空闲时才重绘，不会闪烁）
+        if not self.visible:
+            canvas.itemconfigure(self.tag, state="normal")
+
+        # 顶部：会议标签和发布日期
+        canvas.coords(self.badge_text, inner_left + badge_pad_x, cursor_y + badge_pad_y)
+        x1, y1, x2, y2 = canvas.bbox(self.badge_text)
+        canvas.coords(self.badge, inner_left, cursor_y, x2 + badge_pad_x, y2 + badge_pad_y)
+        canvas.coords(self.date_text, right - card_padding, cursor_y + badge_pad_y)
+        cursor_y = y2 + badge_pad_y + header_gap
+
+        # 标题和作者
+        canvas.coords(self.title_text, inner_left, cursor_y)
+        cursor_y = canvas.bbox(self.title_text)[3] + title_gap
+        canvas.coords(self.authors_text, inner_left, cursor_y)
+        cursor_y = canvas.bbox(self.authors_text)[3] + authors_gap + card_padding
+
+        canvas.coords(self.background, left, top, right, cursor_y)
+
+        # 底部分隔线
+        if self._show_separator:
+            canvas.coords(self.separator, left, cursor_y + 8, right, cursor_y + 8)
+            cursor_y += 9
+
+        self._apply_visibility()
+        self._y = y
+        self._width = width
+        self._height = cursor_y + padding_y - y
+
+    def place_at(self, y):
+        """移动到列表中的y位置；Canvas宽度变化时重新横向布局"""
+        if self.canvas.winfo_width() != self._width:
+            self._layout(y)
+        elif y != self._y:
+            self.canvas.move(self.tag, 0, y - self._y)
+            self._y = y
+
+        if not self.visible:
+            self.visible = True
+            self._apply_visibility()
+
+    def hide(self):
+        if self.visible:
+            self.visible = False
+            self._apply_visibility()
+
+    def _apply_visibility(self):
+        self.canvas.itemconfigure(self.tag, state="normal" if self.visible else "hidden")
+        if not self._show_separator:
+            self.canvas.itemconfigure(self.separator, state="hidden")
+
+    def slot_height(self):
+        """卡片在列表中占用的高度（含上下外边距）"""
+        return self._height
+
+    def _on_click(self, event):
+        if self.paper:
+            self.on_open(self.paper['pdf_url'])
+
+    def _on_enter(self, event):
+        if self.colors:
+            self.canvas.itemconfigure(self.title_text, fill=self.colors["secondary"])
+            self.canvas.configure(cursor="hand2")
+
+    def _on_leave(self, event):
+        if self.colors:
+            self.canvas.itemconfigure(self.title_text, fill=self.colors["primary"])
+            self.canvas.configure(cursor="")
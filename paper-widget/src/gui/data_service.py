@@ -0,0 +1,197 @@
+import itertools
+import queue
+import threading
+from collections import deque
+
+from api import profiling
+
+from .paper_card import display_texts
+
+
+class PaperDataService:
+    """
+    界面数据服务
+    数据库查询在单独的工作线程中执行，结果通过界面调度队列交回Tk主线程，
+    后台更新占用写锁或数据库较大时界面也不会卡住。
+    每次请求带递增的序号，用户再次刷新后，旧请求尚未执行的直接跳过，已返回的结果丢弃。
+
+    随机论文额外预取后面的一到两批（已抽样、已算好截断文本），
+    刷新时直接换上现成的数据；数据库更新或筛选条件变化后预取作废。
+
+    获取器（数据库初始化、匹配器）由工作线程在处理第一个请求前创建，启动时不阻塞界面。
+
+    提交请求时主线程上生效的性能分析随请求交给工作线程，查询的耗时计入该分析；预取不计入。
+    """
+
+    # 预取的批次数量
+    PREFETCH_BATCHES = 2
+
+    # 工作线程按优先级处理：用户请求先于预取
+    USER_PRIORITY = 0
+    PREFETCH_PRIORITY = 1
+
+    def __init__(self, dispatcher, fetcher_factory):
+        """
+        Args:
+            dispatcher: 界面调度队列，查询结果经它交回主线程
+            fetcher_factory: 创建获取器的无参函数，在工作线程中调用
+        """
+        self.dispatcher = dispatcher
+        self._fetcher_factory = fetcher_factory
+        self._fetcher = None
+        self._fetcher_error = None
+        self._fetcher_ready = threading.Event()
+        self._requests = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._generation = 0
+
+        # 预取状态（只在主线程中修改）
+        self._prefetched = deque()
+        self._prefetch_key = None
+        self._prefetch_epoch = 0
+        self._prefetch_inflight = 0
+        self._scale = 1.0
+
+        self._worker = threading.Thread(target=self._run, name="paper-data-service", daemon=True)
+        self._worker.start()
+
+    def get_fetcher(self):
+        """
+        返回获取器，尚未创建完成时等待（只在后台线程中调用，不要在Tk主线程中调用）
+        创建失败时抛出创建时的异常
+        """
+        self._fetcher_ready.wait()
+        if self._fetcher_error is not None:
+            raise self._fetcher_error
+        return self._fetcher
+
+    def submit(self, query, on_result, on_error=None):
+        """
+        提交一个查询（在主线程调用）
+        query: 在工作线程中执行的无参函数
+        on_result(result) / on_error(exception): 在Tk主线程中回调，过期请求不回调
+        返回：请求序号
+        """
+        self._generation += 1
+        generation = self._generation
+
+        def is_current():
+            return generation == self._generation
+
+        self._put(self.USER_PRIORITY, query, is_current, on_result, on_error, profiling.current_run())
+        return generation
+
+    def request_random_papers(self, count, followed_only, on_result, on_error=None, scale=1.0):
+        """
+        随机抽取论文：有预取好的批次时立即回调，否则在后台查询；之后补充预取
+        scale: 当前缩放因子，用于预先计算卡片的截断文本
+        """
+        self._set_prefetch_key(count, followed_only, scale)
+
+        if self._prefetched:
+            # 作废加载中的请求，换上现成的批次
+            self.cancel_pending()
+            papers = self._prefetched.popleft()
+            self._refill_prefetch()
+            on_result(papers)
+            return self._generation
+
+        generation = self.submit(self._random_query(count, followed_only, scale), on_result, on_error)
+        self._refill_prefetch()
+        return generation
+
+    def prefetch(self, count, followed_only, scale=1.0):
+        """只在后台预取随机论文（如启动时界面已按快照显示），下次刷新直接使用"""
+        self._set_prefetch_key(count, followed_only, scale)
+        self._refill_prefetch()
+
+    def _set_prefetch_key(self, count, followed_only, scale):
+        key = (count, followed_only)
+        if key != self._prefetch_key:
+            self.invalidate_prefetch()
+            self._prefetch_key = key
+        self._scale = scale
+
+    def cancel_pending(self):
+        """作废所有未完成的请求"""
+        self._generation += 1
+
+    def invalidate_prefetch(self):
+        """丢弃预取的批次（数据库更新、清空或筛选条件变化后调用）"""
+        self._prefetch_epoch += 1
+        self._prefetched.clear()
+        self._prefetch_inflight = 0
+
+    def _random_query(self, count, followed_only, scale):
+        def query():
+            papers = self.get_fetcher().get_random_papers(count, followed_only=followed_only)
+            for paper in papers:
+                display_texts(paper, scale)
+            return papers
+
+        return query
+
+    def _refill_prefetch(self):
+        if self._prefetch_key is None:
+            return
+
+        missing = self.PREFETCH_BATCHES - len(self._prefetched) - self._prefetch_inflight
+        if missing <= 0:
+            return
+
+        epoch = self._prefetch_epoch
+
+        def is_current():
+            return epoch == self._prefetch_epoch
+
+        query = self._random_query(*self._prefetch_key, self._scale)
+        for _ in range(missing):
+            self._prefetch_inflight += 1
+            self._put(self.PREFETCH_PRIORITY, query, is_current,
+                      self._store_prefetched, self._prefetch_failed)
+
+    def _store_prefetched(self, papers):
+        self._prefetch_inflight -= 1
+        self._prefetched.append(papers)
+
+    def _prefetch_failed(self, error):
+        # 预取失败不提示，下次刷新时按普通请求查询
+        self._prefetch_inflight -= 1
+
+    def _put(self, priority, query, is_current, on_result, on_error, run=None):
+        task = (query, is_current, on_result, on_error, run)
+        self._requests.put((priority, next(self._sequence), task))
+
+    def _create_fetcher(self):
+        try:
+            self._fetcher = self._fetcher_factory()
+        except Exception as e:
+            # 之后的查询和 get_fetcher() 都抛出该异常，由各自的 on_error 提示
+            self._fetcher_error = e
+        finally:
+            self._fetcher_ready.set()
+
+    def _run(self):
+        self._create_fetcher()
+        while True:
+            _, _, (query, is_current, on_result, on_error, run) = self._requests.get()
+
+            # 排队期间已有更新的请求或预取已作废，跳过过期查询
+            if not is_current():
+                continue
+
+            try:
+                with profiling.activate(run):
+                    result = query()
+            except Exception as e:
+                if on_error is not None:
+                    self._deliver(is_current, on_error, e)
+            else:
+                self._deliver(is_current, on_result, result)
+
+    def _deliver(self, is_current, callback, value):
+        def deliver():
+            if is_current():
+                callback(value)
+
+        self.dispatcher.post(deliver)
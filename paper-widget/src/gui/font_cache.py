@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import sys
+
+try:
+    from tkinter import font
+except ImportError:
+    import tkFont as font
+
+# 缓存格式版本，候选字体或格式变化时递增
+FONT_CACHE_VERSION = 1
+
+# 各类字体的候选列表（按优先级），都不可用时使用Tk的默认字体
+FONT_PREFERENCES = {
+    'sans': ['Segoe UI', 'Arial', 'Microsoft YaHei UI', 'Helvetica Neue', 'Helvetica',
+             'Noto Sans', 'DejaVu Sans', 'Liberation Sans'],
+    'mono': ['Consolas', 'Courier New', 'Menlo', 'DejaVu Sans Mono', 'Liberation Mono'],
+}
+
+# 候选都不可用时回退的Tk命名字体
+_FALLBACK_NAMED_FONTS = {'sans': 'TkDefaultFont', 'mono': 'TkFixedFont'}
+
+
+def font_directories():
+    """当前平台的系统和用户字体目录"""
+    home = os.path.expanduser('~')
+    if sys.platform.startswith('win'):
+        windir = os.environ.get('WINDIR', r'C:\Windows')
+        local = os.environ.get('LOCALAPPDATA', os.path.join(home, 'AppData', 'Local'))
+        return [os.path.join(windir, 'Fonts'), os.path.join(local, 'Microsoft', 'Windows', 'Fonts')]
+    if sys.platform == 'darwin':
+        return ['/System/Library/Fonts', '/Library/Fonts', os.path.join(home, 'Library', 'Fonts')]
+    return ['/usr/share/fonts', '/usr/local/share/fonts',
+            os.path.join(home, '.fonts'), os.path.join(home, '.local', 'share', 'fonts')]
+
+
+def font_fingerprint(directories=None):
+    """
+    字体目录指纹：各目录及其下一层子目录的修改时间
+    安装或删除字体会改变所在目录的修改时间，指纹变化后重新检测字体
+    """
+    parts = [sys.platform, str(FONT_CACHE_VERSION)]
+    for directory in directories if directories is not None else font_directories():
+        try:
+            parts.append(f"{directory}:{os.stat(directory).st_mtime_ns}")
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        parts.append(f"{entry.path}:{entry.stat(follow_symlinks=False).st_mtime_ns}")
+        except OSError:
+            parts.append(f"{directory}:-")
+    return hashlib.sha1("\n".join(sorted(parts)).encode('utf-8')).hexdigest()
+
+
+def discover_fonts(root, preferences=FONT_PREFERENCES):
+    """枚举系统字体（较慢），为每类字体选出第一个可用的候选"""
+    available = set(font.families(root))
+    chosen = {}
+    for font_type, candidates in preferences.items():
+        for name in candidates:
+            if name in available:
+                chosen[font_type] = name
+                break
+        else:
+            # 候选都不可用：使用Tk默认字体的实际字体族，避免每次绘制都走回退查找
+            chosen[font_type] = font.nametofont(_FALLBACK_NAMED_FONTS[font_type], root=root).actual('family')
+    return chosen
+
+
+class FontCache:
+    """
+    字体检测结果缓存
+    font.families() 在字体很多的机器上要几百毫秒，检测结果按字体目录指纹保存到JSON文件，
+    指纹不变时直接使用缓存，不再枚举系统字体。
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self, fingerprint):
+        """读取与指纹匹配的缓存，没有或已失效时返回None"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(data, dict) or data.get('fingerprint') != fingerprint:
+            return None
+        families = data.get('families')
+        if not isinstance(families, dict) or set(families) != set(FONT_PREFERENCES):
+            return None
+        return families
+
+    def save(self, fingerprint, families):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': fingerprint, 'families': families}, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def get_families(self, root):
+        """返回 {'sans': 字体族, 'mono': 字体族}：优先使用缓存，指纹变化时重新检测并保存"""
+        fingerprint = font_fingerprint()
+        families = self.load(fingerprint)
+        if families is None:
+            families = discover_fonts(root)
+            try:
+                self.save(fingerprint, families)
+            except OSError as e:
+                print(f"保存字体缓存失败: {e}")
+        return families
@@ -0,0 +1,243 @@
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import tkinter as tk
+from tkinter import ttk
+
+# 延迟直方图的桶上限（毫秒），最后一个桶收集更大的值
+LAG_BUCKETS = (5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class LoopMonitor:
+    """
+    Tk主循环卡顿监视器
+    用 after 定时发送心跳，实际触发时间与预期时间之差即事件循环延迟，按直方图累计；
+    登记过的处理函数（如 refresh_paper_display、create_paper_card、handle_window_resize）
+    每次执行都计时，延迟超过阈值时把卡顿归因于两次心跳之间耗时最多的处理函数。
+    统计数据在调试面板中显示，也可以写入滚动日志文件。
+    """
+
+    # 心跳间隔（毫秒）
+    INTERVAL_MS = 50
+
+    # 心跳延迟超过该值（毫秒）记为一次卡顿
+    STALL_MS = 100
+
+    # 计算百分位数保留的最近延迟样本数、保留的最近卡顿数
+    RECENT_SAMPLES = 1200
+    RECENT_STALLS = 50
+
+    # 写入日志的汇总间隔（秒）
+    SUMMARY_INTERVAL = 60
+
+    def __init__(self, root, log_path=None):
+        self.root = root
+        self.started = time.perf_counter()
+
+        self.beats = 0
+        self.max_lag = 0.0
+        self.histogram = [0] * (len(LAG_BUCKETS) + 1)
+        self.recent_lags = deque(maxlen=self.RECENT_SAMPLES)
+        self.stalls = deque(maxlen=self.RECENT_STALLS)
+        self.stall_count = 0
+
+        # 处理函数统计 {名称: [调用次数, 总耗时, 最大耗时]}
+        self.handlers = {}
+        self._since_beat = {}
+        self._active = []
+
+        self._expected = None
+        self._timer = None
+        self._last_summary = time.monotonic()
+
+        self._log = None
+        if log_path:
+            os.makedirs(os.path.dirname(log_path) or '.', exist_ok=True)
+            self._log = logging.getLogger(f"{__name__}.{id(self)}")
+            self._log.propagate = False
+            self._log.setLevel(logging.INFO)
+            handler = logging.handlers.RotatingFileHandler(
+                log_path, maxBytes=1024 * 1024, backupCount=3, encoding='utf-8'
+            )
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self._log.addHandler(handler)
+
+    def start(self):
+        if self._timer is None:
+            self._expected = time.perf_counter() + self.INTERVAL_MS / 1000
+            self._timer = self.root.after(self.INTERVAL_MS, self._beat)
+
+    def stop(self):
+        """停止心跳并写入最后一次汇总（窗口已销毁时也可调用）"""
+        if self._timer is not None:
+            try:
+                self.root.after_cancel(self._timer)
+            except tk.TclError:
+                pass
+            self._timer = None
+        self._write_summary()
+
+    @contextmanager
+    def track(self, name):
+        """统计一段处理的耗时；嵌套时只把自身耗时记在该名称下"""
+        start = time.perf_counter()
+        self._active.append([name, 0.0])
+        try:
+            yield
+        finally:
+            _, nested = self._active.pop()
+            elapsed = (time.perf_counter() - start) * 1000
+            own = elapsed - nested
+            if self._active:
+                self._active[-1][1] += elapsed
+
+            stats = self.handlers.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += own
+            stats[2] = max(stats[2], own)
+            self._since_beat[name] = self._since_beat.get(name, 0.0) + own
+
+    def instrument(self, obj, method_name, label=None):
+        """把对象上的方法替换为计时的包装（在方法被登记为回调之前调用）"""
+        method = getattr(obj, method_name)
+        name = label or method_name
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            with self.track(name):
+                return method(*args, **kwargs)
+
+        setattr(obj, method_name, wrapper)
+
+    def _beat(self):
+        now = time.perf_counter()
+        lag = max(0.0, (now - self._expected) * 1000)
+
+        self.beats += 1
+        self.max_lag = max(self.max_lag, lag)
+        self.recent_lags.append(lag)
+        for index, limit in enumerate(LAG_BUCKETS):
+            if lag < limit:
+                self.histogram[index] += 1
+                break
+        else:
+            self.histogram[-1] += 1
+
+        if lag >= self.STALL_MS:
+            culprit = max(self._since_beat, key=self._since_beat.get) if self._since_beat else None
+            self._record_stall(lag, culprit, dict(self._since_beat))
+        self._since_beat = {}
+
+        if self._log is not None and time.monotonic() - self._last_summary >= self.SUMMARY_INTERVAL:
+            self._write_summary()
+
+        self._expected = time.perf_counter() + self.INTERVAL_MS / 1000
+        self._timer = self.root.after(self.INTERVAL_MS, self._beat)
+
+    def _record_stall(self, lag, culprit, breakdown):
+        """记录一次卡顿，归因于两次心跳之间自身耗时最多的处理函数"""
+        stall = {
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'ms': round(lag, 1),
+            'handler': culprit or '未登记的处理',
+        }
+        if breakdown:
+            stall['handlers'] = {name: round(ms, 1) for name, ms in breakdown.items()}
+        self.stall_count += 1
+        self.stalls.append(stall)
+        if self._log is not None:
+            self._log.info(json.dumps({'event': 'stall', **stall}, ensure_ascii=False))
+
+    def _write_summary(self):
+        self._last_summary = time.monotonic()
+        if self._log is not None and self.beats:
+            self._log.info(json.dumps({'event': 'summary', **self.stats()}, ensure_ascii=False))
+
+    def stats(self):
+        """当前统计快照（延迟单位为毫秒）"""
+        lags = sorted(self.recent_lags)
+        return {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'uptime': round(time.perf_counter() - self.started, 1),
+            'beats': self.beats,
+            'lag_p50': round(_percentile(lags, 0.50), 1),
+            'lag_p95': round(_percentile(lags, 0.95), 1),
+            'lag_p99': round(_percentile(lags, 0.99), 1),
+            'lag_max': round(self.max_lag, 1),
+            'histogram': dict(zip([f"<{limit}" for limit in LAG_BUCKETS] + [f">={LAG_BUCKETS[-1]}"],
+                                  self.histogram)),
+            'stalls': self.stall_count,
+            'handlers': {
+                name: {'calls': calls, 'total_ms': round(total, 1), 'max_ms': round(longest, 1)}
+                for name, (calls, total, longest) in self.handlers.items()
+            },
+        }
+
+
+class LoopMonitorPanel:
+    """调试面板：每秒刷新一次事件循环延迟、直方图、处理函数耗时和最近的卡顿"""
+
+    REFRESH_MS = 1000
+
+    def __init__(self, root, monitor):
+        self.monitor = monitor
+        self.window = tk.Toplevel(root)
+        self.window.title("🩺 事件循环监视器")
+        self.window.geometry("560x520")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        frame = ttk.Frame(self.window, padding="10")
+        frame.pack(fill="both", expand=True)
+
+        self.text = tk.Text(frame, wrap="none", font="TkFixedFont", relief="flat")
+        self.text.pack(fill="both", expand=True)
+
+        self._timer = None
+        self._refresh()
+
+    def close(self):
+        if self._timer is not None:
+            self.window.after_cancel(self._timer)
+            self._timer = None
+        self.window.destroy()
+
+    def _refresh(self):
+        stats = self.monitor.stats()
+        lines = [
+            f"运行 {stats['uptime']:.0f}s   心跳 {stats['beats']}   卡顿 {stats['stalls']}",
+            f"延迟 p50 {stats['lag_p50']:.1f} ms   p95 {stats['lag_p95']:.1f} ms   "
+            f"p99 {stats['lag_p99']:.1f} ms   最大 {stats['lag_max']:.1f} ms",
+            "",
+            "延迟分布:",
+        ]
+        peak = max(stats['histogram'].values()) or 1
+        for bucket, count in stats['histogram'].items():
+            lines.append(f"  {bucket:>7} ms {count:7d} {'█' * int(30 * count / peak)}")
+
+        lines += ["", f"{'处理函数':<28}{'调用':>7}{'总耗时ms':>11}{'最大ms':>9}"]
+        handlers = sorted(stats['handlers'].items(), key=lambda item: -item[1]['total_ms'])
+        for name, handler in handlers:
+            lines.append(f"  {name:<26}{handler['calls']:>7}{handler['total_ms']:>11.1f}{handler['max_ms']:>9.1f}")
+
+        lines += ["", "最近的卡顿:"]
+        for stall in reversed(self.monitor.stalls):
+            lines.append(f"  {stall['time'][11:]}  {stall['ms']:7.1f} ms  {stall['handler']}")
+
+        self.text.config(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", "\n".join(lines))
+        self.text.config(state="disabled")
+        self._timer = self.window.after(self.REFRESH_MS, self._refresh)
@@ -1,45 +1,84 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import webbrowser
-import json
 import threading
+import time
 from datetime import datetime
 import sys
 import os
-from .theme_manager import ThemeManager
 
-# 添加父目录到路径以导入其他模块
+# 添加父目录到路径以导入其他模块（数据服务等模块同样依赖 api 包）
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-try:
-    # 优先使用模糊匹配版本
-    from api.arxiv_fetcher_fuzzy import FuzzyArxivFetcher as ArxivFetcher
-except ImportError:
-    from api.arxiv_fetcher import ArxivFetcher
+from api.app_context import get_app_context
+from api.progress import describe_progress, CancellationToken, UpdateCancelled
+from api import profiling
+
+from .theme_manager import ThemeManager
+from .paper_card import PaperCard
+from .canvas_cards import CanvasPaperCard
+from .virtual_list import VirtualCardList
+from .responsive_layout import ResponsiveLayout
+from .data_service import PaperDataService
+from .progress_channel import ProgressChannel
+from .ui_dispatcher import UIDispatcher
+from .view_snapshot import ViewSnapshot, parse_geometry_size
+from .loop_monitor import LoopMonitor, LoopMonitorPanel
 
 class PaperWidget:
-    def __init__(self):
+    # 检查 config.json 是否被修改的间隔（毫秒）
+    CONFIG_POLL_MS = 2000
+    
+    def __init__(self, started_at=None):
+        # 启动计时起点（main.py 传入进程启动时刻），用于统计首张卡片的显示耗时
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.startup_metrics = {}
+        
         self.root = tk.Tk()
         self.root.title("✨ 论文推送桌面组件")
         
-        # 加载配置
-        config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "config.json")
-        with open(config_path, 'r', encoding='utf-8') as f:
-            self.config = json.load(f)
+        # 进程共享的配置、数据库管理器和获取器（配置文件修改后热重载）
+        self.context = get_app_context()
+        self.config = self.context.config
+        
+        # 上次退出时的界面快照（与数据库放在同一目录）：先按它绘制，数据库和获取器在后台初始化
+        self.view_snapshot = ViewSnapshot(os.path.join(os.path.dirname(self.context.db.path), "last_view.json"))
         
-        # 初始化主题管理器
-        self.theme_manager = ThemeManager(self.root)
+        # 性能分析报告同样放在数据目录下（分析模式由环境变量或托盘菜单打开）
+        profiling.set_report_dir(os.path.join(os.path.dirname(self.context.db.path), "profiles"))
+        self._refresh_run = None
+        snapshot = self.view_snapshot.load() or {}
         
-        # 设置窗口（增大默认尺寸）
+        # 初始化主题管理器（沿用上次的主题）
+        theme = snapshot.get('theme') if self.config['settings'].get('save_theme_preference', True) else None
+        self.theme_manager = ThemeManager(self.root, theme or self.config['settings'].get('default_theme', 'light'))
+        
+        # 设置窗口（增大默认尺寸，有快照时恢复上次的大小和位置）
         width = max(600, self.config['settings']['window_width'])
         height = max(700, self.config['settings']['window_height'])
-        self.root.geometry(f"{width}x{height}")
+        geometry = f"{width}x{height}"
+        saved_size = parse_geometry_size(snapshot.get('geometry'))
+        if saved_size is not None:
+            width, height = max(500, saved_size[0]), max(600, saved_size[1])
+            geometry = snapshot['geometry']
+        self.root.geometry(geometry)
         self.root.minsize(500, 600)  # 增大最小尺寸
         
         # 设置窗口图标（可选）
         self.root.iconbitmap(default='')
         
-        # 初始化数据获取器
-        self.fetcher = ArxivFetcher()
+        # 后台线程（更新、清空、数据查询、托盘）的界面操作统一经调度队列回到主线程
+        self.dispatcher = UIDispatcher(self.root)
+        self.dispatcher.start()
+        
+        # 数据库查询在后台线程执行，界面不因磁盘或写锁阻塞；
+        # 获取器（数据库初始化、匹配器）也在该线程中创建，不推迟首次绘制
+        self.data_service = PaperDataService(self.dispatcher, self.context.get_fetcher)
+        
+        # 更新数据库时的进度（合并后每秒最多重绘约10次）
+        self.progress_channel = ProgressChannel(self.root, self._on_update_progress)
+        self.is_updating = False
+        self._saved_during_update = 0
+        self.cancel_token = None
         
         # 当前显示的论文
         self.current_papers = []
@@ -48,22 +87,60 @@ class PaperWidget:
         self.current_scale_factor = 1.0
         self.min_card_width = 400
         
+        # 随窗口宽度换行的标签和随缩放变化的内边距，调整大小时原地更新
+        self.layout = ResponsiveLayout(self.current_scale_factor, self._wrap_length_for(width))
+        
         # 性能优化参数
         self.resize_timer = None
         self.last_window_size = (width, height)
         self.is_resizing = False
         
+        # 设置窗口置顶（可通过右键菜单切换）
+        self.is_topmost = False
+        
+        # 事件循环卡顿监视：心跳延迟直方图，卡顿归因于登记的处理函数（需在回调登记前包装）
+        self.loop_monitor = None
+        self.loop_monitor_panel = None
+        if self.config['settings'].get('loop_monitor', True):
+            self.loop_monitor = LoopMonitor(self.root, log_path=self._loop_monitor_log_path())
+            for name in ('refresh_paper_display', 'create_paper_card', 'handle_window_resize',
+                         '_show_papers', 'toggle_theme'):
+                self.loop_monitor.instrument(self, name)
+        
         # 创建UI
         self.setup_ui()
         
+        if self.loop_monitor is not None:
+            self.loop_monitor.instrument(self.card_list, 'update_viewport', 'card_list.update_viewport')
+            self.loop_monitor.instrument(self.card_list, '_render_chunk', 'card_list.render_chunk')
+            self.loop_monitor.instrument(self.dispatcher, '_pump', 'dispatcher')
+            # 主循环开始后再发出第一个心跳，启动耗时不计为卡顿
+            self.root.after_idle(self.loop_monitor.start)
+        
+        # Ctrl+Shift+D 打开事件循环监视面板
+        self.root.bind('<Control-Shift-D>', lambda event: self.show_loop_monitor())
+        
         # 绑定窗口尺寸变化事件（使用防抖）
         self.root.bind('<Configure>', self.on_window_resize_debounced)
         
-        # 首次加载论文
-        self.refresh_papers()
+        # 关闭窗口时退出主循环，由 run() 保存快照
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         
-        # 设置窗口置顶（可通过右键菜单切换）
-        self.is_topmost = False
+        if snapshot.get('topmost'):
+            self.toggle_topmost()
+        
+        # 首次加载论文：有快照时直接显示上次的论文，后台预取下一批；否则查询数据库
+        if snapshot.get('papers'):
+            self._show_snapshot(snapshot)
+        else:
+            self.refresh_papers()
+        
+        # 首次绘制后在空闲时预热另一套主题，首次切换主题不再卡顿
+        self.theme_manager.schedule_preload()
+        
+        # 定时检查配置文件，修改后热重载
+        self.context.add_config_listener(self._on_config_changed)
+        self.root.after(self.CONFIG_POLL_MS, self._poll_config)
         
     def setup_ui(self):
         # 主框架
@@ -90,7 +167,7 @@ class PaperWidget:
         # 主题切换按钮（增加内边距）
         self.theme_btn = ttk.Button(
             title_frame,
-            text="🌙 深色主题",
+            text=self._theme_button_text(),
             command=self.toggle_theme,
             style="Secondary.TButton"
         )
@@ -122,6 +199,16 @@ class PaperWidget:
         )
         self.update_btn.pack(side=tk.LEFT, padx=(0, 12), pady=2, ipady=4)
         
+        # 取消更新按钮（仅在更新时可用，已入库的论文和断点保留）
+        self.cancel_update_btn = ttk.Button(
+            btn_frame,
+            text="⏹ 取消更新",
+            command=self.cancel_update,
+            style="Secondary.TButton",
+            state="disabled"
+        )
+        self.cancel_update_btn.pack(side=tk.LEFT, padx=(0, 12), pady=2, ipady=4)
+        
         # 置顶按钮
         self.topmost_btn = ttk.Button(
             btn_frame,
@@ -164,19 +251,36 @@ class PaperWidget:
         # 保存canvas引用以便后续更新
         self.canvas = canvas
         
-        def on_frame_configure(event):
-            """scrollable_frame尺寸变化时更新滚动区域"""
-            canvas.configure(scrollregion=canvas.bbox("all"))
+        # 画布背景随主题原地切换
+        self.theme_manager.register_themed_widget(canvas, bg="bg")
+        
+        # 卡片渲染方式："widgets" 使用ttk控件，"canvas" 直接在Canvas上绘制
+        self.use_canvas_cards = self.config['settings'].get('card_renderer', 'widgets') == 'canvas'
         
+        # 滚动区域由虚拟列表按全部卡片的总高度维护（scrollable_frame 只有可见的卡片那么高）
         def on_canvas_configure(event):
-            """canvas尺寸变化时更新内部框架宽度"""
-            canvas.itemconfig(canvas_window, width=event.width)
+            """canvas尺寸变化时更新内部框架宽度，并重新计算可见卡片"""
+            if canvas_window is not None:
+                canvas.itemconfig(canvas_window, width=event.width)
+            self.card_list.schedule_update()
         
-        self.scrollable_frame.bind("<Configure>", on_frame_configure)
         canvas.bind("<Configure>", on_canvas_configure)
         
-        canvas_window = canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        # Canvas绘制模式下不嵌入scrollable_frame（窗口项会盖住其他Canvas项）
+        if self.use_canvas_cards:
+            canvas_window = None
+        else:
+            canvas_window = canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
+        
+        # 虚拟化列表：只创建视口附近的卡片，滚动时回收复用
+        self.card_list = VirtualCardList(
+            canvas,
+            None if self.use_canvas_cards else self.scrollable_frame,
+            scrollbar,
+            create_card=self._new_paper_card,
+            bind_card=self.create_paper_card,
+            window_item=canvas_window
+        )
         
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -217,192 +321,258 @@ class PaperWidget:
         )
         self.info_label.pack(side=tk.LEFT)
         
-    def create_paper_card(self, paper, index):
-        """创建单个论文卡片 - Material Design风格（响应式优化版本）"""
-        # 获取当前缩放因子（不缓存scale，确保响应式）
-        scale = getattr(self, 'current_scale_factor', 1.0)
-        
-        # 缓存颜色计算（但不缓存scale）
-        if not hasattr(self, '_cached_colors'):
-            self._cached_colors = self.theme_manager.get_current_colors()
+        # 更新进度条（仅在更新数据库时显示）
+        self.progress_bar = ttk.Progressbar(info_frame, mode="determinate", maximum=100, length=160)
         
-        colors = self._cached_colors
-        conference_type = self.theme_manager.get_conference_type(paper['conference'])
-        conf_colors = self.theme_manager.get_conference_colors(conference_type)
+    def create_paper_card(self, card, index):
+        """把第index篇论文绑定到卡片上 - 卡片由虚拟列表从池中复用，只更新文本、颜色和换行宽度"""
+        paper = self.current_papers[index]
         
-        # 计算动态内边距和间距（优化版本）
-        padding_x = max(15, int(20 * scale))
-        padding_y = max(8, int(12 * scale))
-        card_padding = max(16, int(20 * scale))
+        # 换行宽度和内边距由 ResponsiveLayout 维护，这里只需缩放因子决定截断长度
+        card.bind(
+            paper,
+            self.current_scale_factor,
+            show_separator=index < len(self.current_papers) - 1
+        )
+    
+    def _new_paper_card(self):
+        """创建一张空卡片供虚拟列表复用"""
+        if self.use_canvas_cards:
+            return CanvasPaperCard(self.canvas, self.theme_manager, self.layout, self.open_paper)
+        return PaperCard(self.scrollable_frame, self.theme_manager, self.layout, self.open_paper)
+    
+    def _wrap_length_for(self, window_width):
+        """标题和作者的动态换行宽度"""
+        return max(self.min_card_width, int(window_width * 0.75))
+    
+    def render_cards(self):
+        """显示当前论文列表，只有视口附近的卡片会真正创建和绑定"""
+        self.card_list.set_count(len(self.current_papers))
+    
+    def refresh_papers(self):
+        """
+        刷新显示的论文
+        有预取好的批次时立即显示；否则在后台线程查询，结果返回后显示，加载中再次刷新会丢弃旧结果
+        """
+        self.status_label.config(text="⏳ 正在加载...")
         
-        # 主卡片容器
-        card_container = ttk.Frame(self.scrollable_frame)
-        card_container.pack(fill="x", pady=padding_y, padx=padding_x)
+        # 分析模式下每次刷新记为一次分析，结果显示（或出错）后写报告；被新的刷新取代时提前结束
+        self._finish_refresh_run()
+        self._refresh_run = profiling.start_run('refresh')
+        
+        # 分析只在本次刷新自己的代码中生效（数据服务把它随查询交给工作线程），
+        # 期间并行的数据库更新等不计入
+        with profiling.activate(self._refresh_run):
+            self.data_service.request_random_papers(
+                self.config['settings']['papers_per_refresh'],
+                followed_only=self.config['settings'].get('followed_authors_only', False),
+                on_result=self._on_refresh_result,
+                on_error=self._on_refresh_error,
+                scale=self.current_scale_factor
+            )
+    
+    def _on_refresh_result(self, papers):
+        with profiling.activate(self._refresh_run), profiling.span('tk', 'show_papers'):
+            self._show_papers(papers)
+        self._finish_refresh_run()
+    
+    def _on_refresh_error(self, error):
+        self._finish_refresh_run()
+        self._show_load_error(error)
+    
+    def _finish_refresh_run(self):
+        run, self._refresh_run = self._refresh_run, None
+        profiling.finish_run(run)
+    
+    def _show_papers(self, papers):
+        """显示后台查询返回的论文"""
+        self.current_papers = papers
+        
+        if not self.current_papers:
+            # 如果缓存为空，先更新缓存
+            self.render_cards()
+            self.update_cache_async()
+            return
         
-        # 创建卡片样式
-        card_style = self.theme_manager.create_card_style(conference_type)
+        # 显示论文（复用卡片池中的控件）
+        self.render_cards()
+        self._mark_first_card("数据库")
         
-        # 论文卡片框架（动态内边距）
-        card_frame = ttk.Frame(
-            card_container,
-            style=card_style,
-            padding=str(card_padding)
-        )
-        card_frame.pack(fill="x", expand=True)
-        
-        # 顶部：会议标签和发布日期
-        header_frame = ttk.Frame(card_frame)
-        header_frame.pack(fill="x", pady=(0, max(10, int(15 * scale))))
-        
-        # 会议标签（动态大小）
-        label_padding = max(6, int(10 * scale))
-        conference_label = tk.Label(
-            header_frame,
-            text=f" {paper['conference']} ",
-            font=self.theme_manager.get_font('caption', scale),
-            bg=conf_colors.get("border", colors["primary"]),
-            fg="white",
-            padx=label_padding,
-            pady=max(3, int(4 * scale))
-        )
-        conference_label.pack(side=tk.LEFT)
-        
-        # 发布日期
-        date_label = ttk.Label(
-            header_frame,
-            text=f"📅 {paper['published']}",
-            font=self.theme_manager.get_font('caption', scale),
-            style="Subtitle.TLabel"
+        # 更新信息
+        self.info_label.config(
+            text=f"📊 显示 {len(self.current_papers)} 篇论文 | 最后刷新: {datetime.now().strftime('%H:%M:%S')}"
         )
-        date_label.pack(side=tk.RIGHT)
-        
-        # 标题（可点击）（动态换行宽度）
-        window_width = self.root.winfo_width()
-        wrap_length = max(400, int(window_width * 0.75))
-        title_length = max(80, int(120 * scale))
-        title_text = paper['title'][:title_length] + ("..." if len(paper['title']) > title_length else "")
-        
-        title_label = tk.Label(
-            card_frame,
-            text=title_text,
-            font=self.theme_manager.get_font('subtitle', scale),
-            fg=colors["primary"],
-            bg=colors["card_bg"],
-            cursor="hand2",
-            wraplength=wrap_length,
-            justify="left",
-            anchor="w"
+        self.status_label.config(text="✅ 就绪")
+    
+    def _show_snapshot(self, snapshot):
+        """按上次退出时的快照显示论文，同时在后台预取，下次刷新即可换上新的一批"""
+        self.current_papers = snapshot['papers']
+        self.render_cards()
+        self.card_list.canvas.yview_moveto(snapshot.get('scroll') or 0)
+        self._mark_first_card("快照")
+        
+        saved_at = snapshot.get('saved_at', '')[:16].replace('T', ' ')
+        self.info_label.config(
+            text=f"📊 显示 {len(self.current_papers)} 篇论文 | 上次显示于: {saved_at}"
         )
-        title_label.pack(fill="x", pady=(0, max(6, int(10 * scale))))
-        
-        # 绑定点击事件和悬停效果
-        title_label.bind("<Button-1>", lambda e: self.open_paper(paper['pdf_url']))
-        title_label.bind("<Enter>", lambda e: title_label.config(fg=colors["secondary"]))
-        title_label.bind("<Leave>", lambda e: title_label.config(fg=colors["primary"]))
-        
-        # 作者信息（动态换行）
-        authors = paper['authors']
-        author_length = max(60, int(100 * scale))
-        if len(authors) > author_length:
-            authors = authors[:author_length] + "..."
-        authors_label = ttk.Label(
-            card_frame,
-            text=f"👥 {authors}",
-            font=self.theme_manager.get_font('body', scale),
-            style="Subtitle.TLabel",
-            wraplength=wrap_length
+        
+        self.data_service.prefetch(
+            self.config['settings']['papers_per_refresh'],
+            followed_only=self.config['settings'].get('followed_authors_only', False),
+            scale=self.current_scale_factor
         )
-        authors_label.pack(fill="x", pady=(0, max(4, int(6 * scale))))
+    
+    def _mark_first_card(self, source):
+        """首次显示论文时，在本轮绘制完成后记录首张卡片的显示耗时"""
+        if self.startup_metrics or not self.current_papers:
+            return
+        self.startup_metrics['first_card_source'] = source
+        self.root.after_idle(self._report_first_card)
+    
+    def _report_first_card(self):
+        elapsed_ms = (time.perf_counter() - self.started_at) * 1000
+        self.startup_metrics['first_card_ms'] = elapsed_ms
+        print(f"⏱ 首张卡片显示耗时: {elapsed_ms:.0f}ms（来源: {self.startup_metrics['first_card_source']}）")
+    
+    def _show_load_error(self, error):
+        messagebox.showerror("错误", f"加载论文失败: {str(error)}")
+        self.status_label.config(text="❌ 错误")
+    
+    def update_cache_async(self):
+        """
+        异步更新论文缓存（智能更新版本），进度实时显示，新论文入库后即可刷新到
+        更新可以取消；取消或中断后再次更新会从断点继续
+        """
+        if self.is_updating:
+            return
+        self.is_updating = True
         
-        # 底部分隔线
-        if index < len(self.current_papers) - 1:
-            separator = ttk.Separator(card_container, orient='horizontal')
-            separator.pack(fill="x", pady=(8, 0))
+        supports_cancel = hasattr(self.context.fetcher_class, 'update_cache_with_clean')
+        self.cancel_token = CancellationToken()
         
-    def refresh_papers(self):
-        """刷新显示的论文"""
-        self.status_label.config(text="⏳ 正在加载...")
-        self.refresh_btn.config(state="disabled")
+        self.update_btn.config(state="disabled")
+        if supports_cancel:
+            self.cancel_update_btn.config(state="normal")
+        self.status_label.config(text="🔄 正在智能更新数据库...")
+        self._begin_update_progress()
         
-        # 清空当前显示
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+        cancel_token = self.cancel_token
         
-        # 获取随机论文
-        try:
-            self.current_papers = self.fetcher.get_random_papers(
-                self.config['settings']['papers_per_refresh']
-            )
-            
-            if not self.current_papers:
-                # 如果缓存为空，先更新缓存
-                self.update_cache_async()
-                return
-            
-            # 显示论文
-            for i, paper in enumerate(self.current_papers):
-                self.create_paper_card(paper, i)
-            
-            # 更新信息
-            self.info_label.config(
-                text=f"📊 显示 {len(self.current_papers)} 篇论文 | 最后刷新: {datetime.now().strftime('%H:%M:%S')}"
-            )
-            self.status_label.config(text="✅ 就绪")
-            
-        except Exception as e:
-            messagebox.showerror("错误", f"加载论文失败: {str(e)}")
-            self.status_label.config(text="❌ 错误")
-        finally:
-            self.refresh_btn.config(state="normal")
-    
-    def update_cache_async(self):
-        """异步更新论文缓存（智能更新版本）"""
         def update():
-            self.update_btn.config(state="disabled")
-            self.status_label.config(text="🔄 正在智能更新数据库...")
-            
+            error = None
+            cancelled = False
             try:
+                # 获取器可能仍在后台初始化，在本线程中等待
+                fetcher = self.data_service.get_fetcher()
                 # 优先使用智能更新方法（如果存在）
-                if hasattr(self.fetcher, 'update_cache_with_clean'):
-                    self.fetcher.update_cache_with_clean()
+                if supports_cancel:
+                    fetcher.update_cache_with_clean(self.progress_channel.post, cancel_token)
                 else:
-                    self.fetcher.update_cache()
-                self.root.after(0, lambda: self.status_label.config(text="✅ 更新完成"))
-                self.root.after(0, self.refresh_papers)
+                    fetcher.update_cache()
+            except UpdateCancelled:
+                cancelled = True
             except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror("错误", f"更新失败: {str(e)}"))
-                self.root.after(0, lambda: self.status_label.config(text="❌ 更新失败"))
-            finally:
-                self.root.after(0, lambda: self.update_btn.config(state="normal"))
+                error = e
+            
+            # 结果作为一条消息交给主线程处理
+            self.dispatcher.post(self._finish_update, error, cancelled)
         
         thread = threading.Thread(target=update, daemon=True)
         thread.start()
     
+    def _finish_update(self, error, cancelled):
+        """更新线程结束后在主线程显示结果"""
+        # 先停止进度重绘，再显示结果
+        self._end_update_progress()
+        if error is None:
+            if cancelled:
+                self.status_label.config(text="⏹ 更新已取消，下次更新将从断点继续")
+            else:
+                self.status_label.config(text="✅ 更新完成")
+            # 预取的批次来自更新前的数据，作废后再刷新（取消时已入库的论文同样可见）
+            self.data_service.invalidate_prefetch()
+            self.refresh_papers()
+        else:
+            messagebox.showerror("错误", f"更新失败: {str(error)}")
+            self.status_label.config(text="❌ 更新失败")
+        self.update_btn.config(state="normal")
+    
+    def cancel_update(self):
+        """请求取消正在进行的更新（在下一个检查点停止）"""
+        if self.is_updating and self.cancel_token is not None:
+            self.cancel_token.cancel()
+            self.cancel_update_btn.config(state="disabled")
+            self.status_label.config(text="⏳ 正在取消更新...")
+    
+    def _begin_update_progress(self):
+        self._saved_during_update = 0
+        self.progress_bar.config(value=0)
+        self.progress_bar.pack(side=tk.RIGHT)
+        self.progress_channel.open()
+    
+    def _end_update_progress(self):
+        self.progress_channel.close()
+        self.progress_bar.pack_forget()
+        self.cancel_update_btn.config(state="disabled")
+        self.is_updating = False
+    
+    @profiling.profiled('tk')
+    def _on_update_progress(self, event):
+        """显示合并后的最新进度；有新论文入库时作废预取，空列表时立即刷新"""
+        self.progress_bar.config(value=event['fraction'] * 100)
+        if not self.cancel_token.cancelled:
+            self.status_label.config(text=describe_progress(event))
+        
+        if event['saved'] > self._saved_during_update:
+            self._saved_during_update = event['saved']
+            self.data_service.invalidate_prefetch()
+            if not self.current_papers:
+                self.refresh_papers()
+    
+    def _loop_monitor_log_path(self):
+        """卡顿日志路径：环境变量 PAPER_WIDGET_LOOP_LOG 或配置 loop_monitor_log（相对路径放在数据目录下）"""
+        path = os.environ.get('PAPER_WIDGET_LOOP_LOG') or self.config['settings'].get('loop_monitor_log')
+        if not path:
+            return None
+        return os.path.join(os.path.dirname(self.context.db.path), path)
+    
+    def show_loop_monitor(self):
+        """打开（或前置）事件循环监视面板"""
+        if self.loop_monitor is None:
+            messagebox.showinfo("提示", "事件循环监视未启用（配置 loop_monitor）")
+            return
+        if self.loop_monitor_panel is not None and self.loop_monitor_panel.window.winfo_exists():
+            self.loop_monitor_panel.window.lift()
+            return
+        self.loop_monitor_panel = LoopMonitorPanel(self.root, self.loop_monitor)
+    
+    def _poll_config(self):
+        self.context.reload_if_changed()
+        self.root.after(self.CONFIG_POLL_MS, self._poll_config)
+    
+    def _on_config_changed(self, changed):
+        """config.json 重新加载后：筛选条件或每批数量可能变化，预取的批次作废"""
+        self.data_service.invalidate_prefetch()
+        self.status_label.config(text="⚙️ 配置已重新加载")
+    
     def open_paper(self, url):
         """在浏览器中打开论文"""
         webbrowser.open(url)
     
     def toggle_theme(self):
-        """切换深色/浅色主题（性能优化版本）"""
+        """切换深色/浅色主题 - 只更新样式定义并原地重新着色，不重建卡片"""
+        # 先取消进行中的分块渲染，着色完成后再补齐余量区
+        self.card_list.cancel_render()
         current_theme = self.theme_manager.toggle_theme()
+        self.card_list.schedule_update()
         
         # 更新主题按钮文本
-        if current_theme == "dark":
-            self.theme_btn.config(text="☀️ 浅色主题")
-        else:
-            self.theme_btn.config(text="🌙 深色主题")
-        
-        # 清除缓存的颜色
-        if hasattr(self, '_cached_colors'):
-            del self._cached_colors
-        
-        # 更新画布背景颜色
-        colors = self.theme_manager.get_current_colors()
-        if hasattr(self, 'canvas'):
-            self.canvas.config(bg=colors["bg"])
-        
-        # 使用异步刷新避免阻塞UI
-        self.root.after_idle(self.refresh_paper_display)
+        self.theme_btn.config(text=self._theme_button_text())
+    
+    def _theme_button_text(self):
+        if self.theme_manager.current_theme == "dark":
+            return "☀️ 浅色主题"
+        return "🌙 深色主题"
     
     def toggle_topmost(self):
         """切换窗口置顶状态"""
@@ -427,55 +597,68 @@ class PaperWidget:
             self.clear_database_async()
     
     def clear_database_async(self):
-        """异步清空数据库"""
+        """异步清空数据库（界面更新通过调度队列回到主线程）"""
+        self.clear_btn.config(state="disabled")
+        self.status_label.config(text="🗑️ 正在清空数据库...")
+        
         def clear():
-            self.clear_btn.config(state="disabled")
-            self.status_label.config(text="🗑️ 正在清空数据库...")
-            
+            error = None
+            success = False
+            message = "数据库已清空！"
             try:
                 # 调用清空数据库方法
-                if hasattr(self.fetcher, 'clear_database'):
-                    success = self.fetcher.clear_database(confirm=True)
-                    if success:
-                        self.root.after(0, lambda: self.status_label.config(text="✅ 数据库已清空"))
-                        self.root.after(0, lambda: messagebox.showinfo("成功", "数据库已清空！\n\n请点击【更新数据库】获取新论文。"))
-                        # 清空当前显示
-                        self.root.after(0, self.clear_display)
-                    else:
-                        self.root.after(0, lambda: messagebox.showerror("错误", "清空数据库失败"))
-                        self.root.after(0, lambda: self.status_label.config(text="❌ 清空失败"))
+                fetcher = self.data_service.get_fetcher()
+                if hasattr(fetcher, 'clear_database'):
+                    success = fetcher.clear_database(confirm=True)
+                    message = "数据库已清空！\n\n请点击【更新数据库】获取新论文。"
                 else:
                     # 如果使用的是基础版本，手动清空
-                    import sqlite3
-                    import os
-                    db_path = os.path.join("data", "papers_cache.db")
+                    db_path = self.context.db.path
                     if os.path.exists(db_path):
-                        conn = sqlite3.connect(db_path)
-                        cursor = conn.cursor()
-                        cursor.execute('DELETE FROM papers')
-                        conn.commit()
-                        conn.close()
-                        self.root.after(0, lambda: self.status_label.config(text="✅ 数据库已清空"))
-                        self.root.after(0, lambda: messagebox.showinfo("成功", "数据库已清空！"))
-                        self.root.after(0, self.clear_display)
+                        with self.context.db.write_lock:
+                            conn = self.context.db.connect()
+                            cursor = conn.cursor()
+                            cursor.execute('DELETE FROM papers')
+                            conn.commit()
+                            conn.close()
+                        success = True
+                    else:
+                        # 没有数据库文件时保持原行为：不提示
+                        message = None
             except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror("错误", f"清空失败: {str(e)}"))
-                self.root.after(0, lambda: self.status_label.config(text="❌ 清空失败"))
-            finally:
-                self.root.after(0, lambda: self.clear_btn.config(state="normal"))
+                error = e
+            
+            self.dispatcher.post(self._finish_clear, success, error, message)
         
         thread = threading.Thread(target=clear, daemon=True)
         thread.start()
     
+    def _finish_clear(self, success, error, message):
+        """清空线程结束后在主线程显示结果"""
+        if error is not None:
+            messagebox.showerror("错误", f"清空失败: {str(error)}")
+            self.status_label.config(text="❌ 清空失败")
+        elif success:
+            self.status_label.config(text="✅ 数据库已清空")
+            messagebox.showinfo("成功", message)
+            # 清空当前显示
+            self.clear_display()
+        elif message is not None:
+            messagebox.showerror("错误", "清空数据库失败")
+            self.status_label.config(text="❌ 清空失败")
+        self.clear_btn.config(state="normal")
+    
     def clear_display(self):
         """清空当前显示的论文"""
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+        # 清空前发出的刷新请求和预取的批次不再显示
+        self.data_service.cancel_pending()
+        self.data_service.invalidate_prefetch()
         self.current_papers = []
+        self.render_cards()
         self.info_label.config(text="📋 数据库已清空，请更新数据库获取新论文")
     
     def on_window_resize_debounced(self, event):
-        """窗口大小变化时的防抖响应函数"""
+        """窗口大小变化时的响应函数：同一轮事件中的多次变化合并到一次空闲回调"""
         # 只响应主窗口的大小变化
         if event.widget != self.root:
             return
@@ -483,15 +666,11 @@ class PaperWidget:
         # 标记正在调整大小
         self.is_resizing = True
         
-        # 取消之前的定时器
-        if self.resize_timer:
-            self.root.after_cancel(self.resize_timer)
-        
-        # 设置新的定时器（防抖延迟200ms）
-        self.resize_timer = self.root.after(200, self.handle_window_resize)
+        if self.resize_timer is None:
+            self.resize_timer = self.root.after_idle(self.handle_window_resize)
     
     def handle_window_resize(self):
-        """实际处理窗口大小变化"""
+        """实际处理窗口大小变化：原地更新字号、换行宽度和内边距，不重建卡片"""
         try:
             # 获取当前窗口尺寸
             window_width = self.root.winfo_width()
@@ -508,79 +687,66 @@ class PaperWidget:
             base_width = 600  # 基准宽度
             scale_factor = max(0.8, min(2.0, window_width / base_width))
             
-            # 如果缩放因子变化显著，更新界面
+            # 缩放因子变化显著时才调整字号，避免拖动时文字抖动
             if abs(scale_factor - self.current_scale_factor) > 0.1:
                 self.current_scale_factor = scale_factor
-                self.update_responsive_layout()
+                self.theme_manager.set_scale_factor(scale_factor)
+            
+            # 换行宽度每次都跟随窗口宽度；有变化时重新测量显示中的卡片
+            if self.layout.update(self.current_scale_factor, self._wrap_length_for(window_width)):
+                self.card_list.remeasure()
         
         finally:
             # 重置调整大小标记
             self.is_resizing = False
             self.resize_timer = None
     
-    def update_responsive_layout(self):
-        """更新响应式布局（性能优化版本）"""
-        try:
-            # 避免在调整大小过程中频繁更新
-            if self.is_resizing:
-                return
-            
-            # 更新字体缩放
-            self.theme_manager.current_scale_factor = self.current_scale_factor
-            
-            # 清除颜色缓存（但不清除scale缓存，因为我们不再缓存scale）
-            if hasattr(self, '_cached_colors'):
-                del self._cached_colors
-            
-            # 清除主题管理器中的字体缓存，确保新的scale生效
-            if hasattr(self.theme_manager, '_font_cache'):
-                self.theme_manager._font_cache.clear()
-            
-            # 重新刷新论文卡片以应用新的缩放（使用异步更新）
-            if self.current_papers:
-                self.root.after_idle(self.refresh_paper_display)
-                
-        except Exception as e:
-            print(f"响应式布局更新警告: {e}")
-    
     def refresh_paper_display(self):
-        """仅刷新论文显示（不重新获取数据）- 性能优化版本"""
+        """仅刷新论文显示（不重新获取数据）：重新绑定可见卡片，更新截断长度"""
         # 避免在调整大小时重复刷新
         if self.is_resizing:
             return
         
         try:
-            # 暂停canvas更新以提高性能
-            if hasattr(self, 'canvas'):
-                self.canvas.configure(scrollregion=(0, 0, 0, 0))
-            
-            # 批量销毁旧控件
-            children = self.scrollable_frame.winfo_children()
-            for widget in children:
-                widget.destroy()
-            
-            # 清除颜色缓存，准备重新创建
-            if hasattr(self, '_cached_colors'):
-                del self._cached_colors
-                
-            # 清除主题管理器中的字体缓存，确保响应式字体生效
-            if hasattr(self.theme_manager, '_font_cache'):
-                self.theme_manager._font_cache.clear()
-            
-            # 重新显示论文（使用当前的scale因子）
-            for i, paper in enumerate(self.current_papers):
-                self.create_paper_card(paper, i)
-            
-            # 恢复canvas滚动区域
-            if hasattr(self, 'canvas'):
-                self.root.after_idle(lambda: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+            # 重新绑定可见卡片（使用当前的scale因子，不销毁控件）
+            self.card_list.invalidate()
         
         except Exception as e:
             print(f"刷新显示警告: {e}")
     
+    def close(self):
+        """关闭窗口：退出主循环，run() 随后保存界面快照"""
+        self.root.quit()
+    
+    def save_view_snapshot(self):
+        """把当前显示的论文和窗口状态写入快照，供下次启动时立即显示"""
+        try:
+            geometry = self.root.geometry()
+            scroll = self.canvas.yview()[0]
+        except tk.TclError:
+            # 窗口已销毁，使用最后记录的尺寸
+            geometry = f"{self.last_window_size[0]}x{self.last_window_size[1]}"
+            scroll = 0.0
+        
+        try:
+            self.view_snapshot.save(
+                self.current_papers,
+                geometry=geometry,
+                theme=self.theme_manager.current_theme,
+                topmost=self.is_topmost,
+                scroll=scroll
+            )
+        except OSError as e:
+            print(f"保存界面快照失败: {e}")
+    
     def run(self):
-        """运行应用"""
-        self.root.mainloop()
+        """运行应用，退出主循环后保存界面快照"""
+        try:
+            self.root.mainloop()
+        finally:
+            self.save_view_snapshot()
+            if self.loop_monitor is not None:
+                self.loop_monitor.stop()
 
 if __name__ == "__main__":
     app = PaperWidget()
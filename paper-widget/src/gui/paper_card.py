@@ -0,0 +1,175 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+def display_texts(paper, scale):
+    """
+    卡片显示用的标题和作者文本（截断长度随缩放变化）
+    结果按缩放因子缓存在论文字典中，后台预取时已算好的直接复用
+    """
+    cached = paper.get('display_texts')
+    if cached is not None and cached[0] == scale:
+        return cached[1], cached[2]
+
+    title_length = max(80, int(120 * scale))
+    title_text = paper['title'][:title_length] + ("..." if len(paper['title']) > title_length else "")
+
+    authors = paper['authors']
+    author_length = max(60, int(100 * scale))
+    if len(authors) > author_length:
+        authors = authors[:author_length] + "..."
+
+    paper['display_texts'] = (scale, title_text, authors)
+    return title_text, authors
+
+
+class PaperCard:
+    """
+    可复用的论文卡片 - Material Design风格
+    控件只在创建时构建一次，刷新时通过 bind() 原地更新文本和颜色；
+    换行宽度和内边距登记在 ResponsiveLayout 中，调整窗口大小时原地更新，不再销毁重建。
+    卡片由 VirtualCardList 用 place 摆放在 scrollable_frame 中。
+    """
+
+    def __init__(self, parent, theme_manager, layout, on_open):
+        self.theme_manager = theme_manager
+        self.on_open = on_open
+        self.paper = None
+        self.visible = False
+
+        # 上次应用的缩放因子和会议类型，未变化时跳过重复配置
+        self._padding_scale = None
+        self._style_key = None
+        self._container_padding = (15, 8)
+
+        # 主卡片容器
+        self.container = ttk.Frame(parent)
+
+        # 论文卡片框架
+        self.card_frame = ttk.Frame(self.container)
+        self.card_frame.pack(fill="x", expand=True)
+
+        # 顶部：会议标签和发布日期
+        self.header_frame = ttk.Frame(self.card_frame)
+        self.header_frame.pack(fill="x")
+
+        # 字体使用主题管理器的共享字体，缩放时自动更新
+        self.conference_label = tk.Label(self.header_frame, fg="white",
+                                         font=theme_manager.get_font('caption'))
+        self.conference_label.pack(side=tk.LEFT)
+
+        self.date_label = ttk.Label(self.header_frame, style="Subtitle.TLabel",
+                                    font=theme_manager.get_font('caption'))
+        self.date_label.pack(side=tk.RIGHT)
+
+        # 标题（可点击）
+        self.title_label = tk.Label(
+            self.card_frame,
+            cursor="hand2",
+            font=theme_manager.get_font('subtitle'),
+            justify="left",
+            anchor="w"
+        )
+        self.title_label.pack(fill="x")
+
+        # 悬停和点击读取当前绑定的论文，换绑后无需重新绑定事件
+        self.title_label.bind("<Button-1>", self._on_click)
+        self.title_label.bind("<Enter>", self._on_enter)
+        self.title_label.bind("<Leave>", self._on_leave)
+
+        # 作者信息
+        self.authors_label = ttk.Label(self.card_frame, style="Subtitle.TLabel",
+                                       font=theme_manager.get_font('body'))
+        self.authors_label.pack(fill="x")
+
+        # 底部分隔线
+        self.separator = ttk.Separator(self.container, orient='horizontal')
+        self.has_separator = False
+
+        # 标题和作者随窗口宽度换行，内边距随缩放变化
+        layout.register_wrap_label(self.title_label)
+        layout.register_wrap_label(self.authors_label)
+        layout.add_listener(self._on_layout_changed)
+        self._apply_padding(layout.scale)
+
+    def bind(self, paper, scale, show_separator):
+        """绑定新的论文数据并更新显示"""
+        self.paper = paper
+
+        self._apply_style(paper['conference'])
+
+        # 文本截断长度随缩放变化
+        title_text, authors = display_texts(paper, scale)
+
+        self.conference_label.config(text=f" {paper['conference']} ")
+        self.date_label.config(text=f"📅 {paper['published']}")
+        self.title_label.config(text=title_text)
+        self.authors_label.config(text=f"👥 {authors}")
+
+        if show_separator != self.has_separator:
+            if show_separator:
+                self.separator.pack(fill="x", pady=(8, 0))
+            else:
+                self.separator.pack_forget()
+            self.has_separator = show_separator
+
+    def _on_layout_changed(self, scale, wrap_length):
+        self._apply_padding(scale)
+
+    def _apply_padding(self, scale):
+        """更新内边距和间距（仅在缩放因子变化时；字号由共享字体统一缩放）"""
+        if scale == self._padding_scale:
+            return
+        self._padding_scale = scale
+
+        padding_x = max(15, int(20 * scale))
+        padding_y = max(8, int(12 * scale))
+        card_padding = max(16, int(20 * scale))
+
+        self._container_padding = (padding_x, padding_y)
+        self.card_frame.configure(padding=str(card_padding))
+        self.header_frame.pack_configure(pady=(0, max(10, int(15 * scale))))
+
+        self.conference_label.config(
+            padx=max(6, int(10 * scale)),
+            pady=max(3, int(4 * scale))
+        )
+        self.title_label.pack_configure(pady=(0, max(6, int(10 * scale))))
+        self.authors_label.pack_configure(pady=(0, max(4, int(6 * scale))))
+
+    def _apply_style(self, conference):
+        """更新会议配色（仅在会议类型变化时；主题切换由ThemeManager原地着色）"""
+        conference_type = self.theme_manager.get_conference_type(conference)
+        if conference_type == self._style_key:
+            return
+        self._style_key = conference_type
+
+        self.card_frame.configure(style=self.theme_manager.create_card_style(conference_type))
+        self.theme_manager.register_themed_widget(self.conference_label, bg=(conference_type, "border"))
+        self.theme_manager.register_themed_widget(self.title_label, fg="primary", bg="card_bg")
+
+    def place_at(self, y):
+        """把卡片摆放在列表中的y位置（y为卡片槽位顶部，含外边距）"""
+        padding_x, padding_y = self._container_padding
+        self.container.place(x=padding_x, y=y + padding_y, relwidth=1.0, width=-2 * padding_x)
+        self.visible = True
+
+    def hide(self):
+        if self.visible:
+            self.container.place_forget()
+            self.visible = False
+
+    def slot_height(self):
+        """卡片在列表中占用的高度（含上下外边距）"""
+        return self.container.winfo_reqheight() + 2 * self._container_padding[1]
+
+    def _on_click(self, event):
+        if self.paper:
+            self.on_open(self.paper['pdf_url'])
+
+    def _on_enter(self, event):
+        # 读取当前主题颜色，主题切换后无需重新绑定
+        self.title_label.config(fg=self.theme_manager.get_current_colors()["secondary"])
+
+    def _on_leave(self, event):
+        self.title_label.config(fg=self.theme_manager.get_current_colors()["primary"])
@@ -0,0 +1,51 @@
+import threading
+
+from api import profiling
+
+
+class ProgressChannel:
+    """
+    后台线程到界面的进度通道
+    工作线程随时 post() 最新的进度快照，通道只保留最新一个；主线程用 after 定时取出
+    并重绘，每秒最多约10次，进度事件再密集也不会拖慢界面。工作线程不调用任何Tk方法。
+    快照随提交线程上生效的性能分析一起保存，重绘耗时计入该分析（如数据库更新）。
+    """
+
+    # 重绘间隔（毫秒）
+    INTERVAL_MS = 100
+
+    def __init__(self, root, on_progress):
+        self.root = root
+        self.on_progress = on_progress
+        self._lock = threading.Lock()
+        self._latest = None
+        self._timer = None
+
+    def open(self):
+        """开始定时重绘（在主线程调用）"""
+        if self._timer is None:
+            self._timer = self.root.after(self.INTERVAL_MS, self._pump)
+
+    def post(self, event):
+        """提交进度快照（可在任意线程调用）"""
+        with self._lock:
+            self._latest = (event, profiling.current_run())
+
+    def close(self):
+        """停止定时重绘并交付最后一个快照（在主线程调用）"""
+        if self._timer is not None:
+            self.root.after_cancel(self._timer)
+            self._timer = None
+        self._drain()
+
+    def _drain(self):
+        with self._lock:
+            latest, self._latest = self._latest, None
+        if latest is not None:
+            event, run = latest
+            with profiling.activate(run):
+                self.on_progress(event)
+
+    def _pump(self):
+        self._drain()
+        self._timer = self.root.after(self.INTERVAL_MS, self._pump)
@@ -0,0 +1,53 @@
+import tkinter as tk
+
+
+class ResponsiveLayout:
+    """
+    响应式布局登记表
+    登记随窗口宽度换行的标签和随缩放调整内边距的回调。窗口尺寸变化时由
+    PaperWidget 在一次空闲回调中调用 update()，原地更新 wraplength 和内边距，
+    不销毁、不重新绑定任何控件。
+    """
+
+    def __init__(self, scale=1.0, wrap_length=400):
+        self.scale = scale
+        self.wrap_length = wrap_length
+        self._wrap_labels = set()
+        self._listeners = []
+
+    def register_wrap_label(self, widget):
+        """登记需要随窗口宽度换行的标签，并立即应用当前换行宽度"""
+        self._wrap_labels.add(widget)
+        widget.configure(wraplength=self.wrap_length)
+
+    def add_listener(self, callback):
+        """登记布局变化回调 callback(scale, wrap_length)，用于内边距和Canvas文本项"""
+        self._listeners.append(callback)
+
+    def update(self, scale, wrap_length):
+        """
+        应用新的缩放因子和换行宽度
+        返回：是否有变化（有变化时卡片高度需要重新测量）
+        """
+        if scale == self.scale and wrap_length == self.wrap_length:
+            return False
+
+        wrap_changed = wrap_length != self.wrap_length
+        self.scale = scale
+        self.wrap_length = wrap_length
+
+        if wrap_changed:
+            for widget in list(self._wrap_labels):
+                try:
+                    widget.configure(wraplength=wrap_length)
+                except tk.TclError:
+                    # 控件已销毁
+                    self._wrap_labels.discard(widget)
+
+        for callback in self._listeners:
+            callback(scale, wrap_length)
+        return True
+
+    def get_wrap_label_count(self):
+        """已登记的换行标签和回调数量"""
+        return len(self._wrap_labels) + len(self._listeners)
@@ -0,0 +1,107 @@
+import builtins
+import importlib.util
+import os
+import sys
+import threading
+import time
+
+# 设置该环境变量（或使用 --profile-startup 参数）启用启动分析
+PROFILE_ENV = "PAPER_WIDGET_PROFILE_STARTUP"
+PROFILE_FLAG = "--profile-startup"
+
+
+def profiling_requested(argv=None, environ=None):
+    """是否启用启动分析模式"""
+    argv = sys.argv if argv is None else argv
+    environ = os.environ if environ is None else environ
+    return PROFILE_FLAG in argv or environ.get(PROFILE_ENV, "") not in ("", "0")
+
+
+class ImportProfiler:
+    """
+    启动分析：统计每个模块首次导入的耗时
+    替换 builtins.__import__，只记录主线程中尚未加载的模块（后台线程里的延迟导入不在启动路径上）；
+    嵌套导入按层级记录，自身耗时 = 总耗时 - 其中嵌套导入的耗时。只依赖标准库，需在其他导入之前安装。
+    """
+
+    def __init__(self):
+        self.records = []   # (层级, 模块名, 总耗时, 自身耗时)，按完成顺序
+        self.phases = []    # (阶段名, 耗时)
+        self._original = None
+        self._thread_id = threading.get_ident()
+        self._depth = 0
+        self._child_time = [0.0]
+        self._phase_start = time.perf_counter()
+
+    def install(self):
+        if self._original is None:
+            self._original = builtins.__import__
+            builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def mark(self, phase):
+        """结束一个启动阶段（如"导入模块"、"创建窗口"），记录其耗时"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._phase_start))
+        self._phase_start = now
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        full_name = name
+        if level:
+            try:
+                full_name = importlib.util.resolve_name('.' * level + name, (globals or {}).get('__package__'))
+            except (ImportError, ValueError):
+                pass
+
+        if full_name in sys.modules or threading.get_ident() != self._thread_id:
+            return self._original(name, globals, locals, fromlist, level)
+
+        depth = self._depth
+        self._depth += 1
+        self._child_time.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._child_time.pop()
+            self._child_time[-1] += elapsed
+            self._depth -= 1
+            self.records.append((depth, full_name, elapsed, elapsed - children))
+
+    def report(self, top=15, max_depth=1):
+        """返回导入耗时报告文本：各阶段耗时、按总耗时排序的顶层导入（含下一层）和自身耗时最多的模块"""
+        lines = ["", "=== 启动分析 ==="]
+        for phase, seconds in self.phases:
+            lines.append(f"{phase:<16}{seconds * 1000:8.1f} ms")
+
+        total = sum(elapsed for depth, _, elapsed, _ in self.records if depth == 0)
+        lines.append("")
+        lines.append(f"导入耗时（合计 {total * 1000:.1f} ms，共 {len(self.records)} 个模块）")
+        lines.append(f"{'总耗时':>10}{'自身':>10}  模块")
+
+        # 记录按完成顺序排列，子模块在父模块之前完成，顺序扫描即可把子模块归到父模块下
+        groups = []
+        children = []
+        for record in self.records:
+            depth = record[0]
+            if depth == 0:
+                groups.append((record, sorted(children, key=lambda r: -r[2])))
+                children = []
+            elif depth <= max_depth:
+                children.append(record)
+
+        for (depth, name, elapsed, own), subs in sorted(groups, key=lambda g: -g[0][2])[:top]:
+            lines.append(f"{elapsed * 1000:10.1f}{own * 1000:10.1f}  {name}")
+            for _, sub_name, sub_elapsed, sub_own in subs[:5]:
+                lines.append(f"{sub_elapsed * 1000:10.1f}{sub_own * 1000:10.1f}    └ {sub_name}")
+
+        lines.append("")
+        lines.append("自身耗时最多的模块:")
+        for _, name, _, own in sorted(self.records, key=lambda r: -r[3])[:top]:
+            lines.append(f"{own * 1000:10.1f}  {name}")
+        return "\n".join(lines)
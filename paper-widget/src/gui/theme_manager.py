@@ -1,31 +1,67 @@
 import tkinter as tk
 from tkinter import ttk
-import sv_ttk
 import sys
 import os
 try:
     from tkinter import font
 except ImportError:
     import tkFont as font
+from .font_cache import FontCache
 
 class ThemeManager:
     """现代化主题管理器"""
     
-    def __init__(self, root):
+    # sv-ttk 注册的 ttk 主题名
+    SV_THEMES = {"light": "sun-valley-light", "dark": "sun-valley-dark"}
+    
+    # 首次绘制后等待多久再预热另一套主题（毫秒）
+    PRELOAD_DELAY = 300
+    
+    # 各角色字体在缩放因子为1.0时的配置（增大字体大小，提升可读性，特别加大按钮字体）
+    # 第一项为字体类别，实际字体族由启动时检测（并缓存）的结果决定
+    BASE_FONTS = {
+        'title': ('sans', 16, 'bold'),      # 12 -> 16
+        'subtitle': ('sans', 13, 'bold'),   # 10 -> 13  
+        'body': ('sans', 11, 'normal'),     # 9 -> 11
+        'caption': ('sans', 10, 'normal'),  # 8 -> 10
+        'button': ('sans', 14, 'normal'),   # 9 -> 11 -> 14 (大幅增加)
+        'status': ('sans', 11, 'normal')    # 8 -> 10 -> 11
+    }
+    DEFAULT_FONT = ('sans', 11, 'normal')
+    
+    # 字体检测结果缓存文件
+    FONT_CACHE_PATH = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        "data", "font_cache.json"
+    )
+    
+    def __init__(self, root, theme="light"):
         self.root = root
-        self.current_theme = "light"
+        self.current_theme = theme if theme in ("light", "dark") else "light"
         self.style = ttk.Style()
         
         # 性能优化：缓存配置结果
-        self._font_cache = {}
         self._color_cache = {}
         
+        # 每个字体角色一个共享的命名字体，缩放时只调整字号
+        self._named_fonts = {}
+        
+        # 切换主题时原地重新着色的控件和回调（不再重建卡片）
+        self._themed_widgets = {}
+        self._theme_listeners = []
+        self._card_styles = {"ai", "security", "default"}
+        
+        # ttk样式按主题分别保存：已配置过样式的主题、会议卡片样式
+        self._prepared_themes = set()
+        self._configured_card_styles = set()
+        self._preload_pending = None
+        
+        # 获取最佳字体（按字体目录指纹缓存，不必每次启动都枚举系统字体）
+        self.font_families = FontCache(self.FONT_CACHE_PATH).get_families(self.root)
+        
         # 配置高DPI支持
         self._configure_high_dpi()
         
-        # 获取最佳字体设置
-        self.fonts = self._get_optimal_fonts()
-        
         # 缩放因子
         self.current_scale_factor = 1.0
         
@@ -99,19 +135,19 @@ class ThemeManager:
                 # 启用字体平滑和ClearType
                 try:
                     # 设置字体平滑选项
-                    self.root.option_add('*Font', 'Arial')
+                    self.root.option_add('*Font', self.font_families['sans'])
                     self.root.option_add('*foreground', 'black')
                     
                     # 启用字体抗锯齿
                     import tkinter.font as tkfont
                     default_font = tkfont.nametofont("TkDefaultFont")
-                    default_font.configure(family="Arial")
+                    default_font.configure(family=self.font_families['sans'])
                     
                     text_font = tkfont.nametofont("TkTextFont")
-                    text_font.configure(family="Arial")
+                    text_font.configure(family=self.font_families['sans'])
                     
                     fixed_font = tkfont.nametofont("TkFixedFont")
-                    fixed_font.configure(family="Consolas")
+                    fixed_font.configure(family=self.font_families['mono'])
                     
                 except Exception as font_error:
                     print(f"字体配置警告: {font_error}")
@@ -119,53 +155,6 @@ class ThemeManager:
         except Exception as e:
             print(f"DPI配置警告: {e}")
     
-    def _get_optimal_fonts(self):
-        """获取最佳字体配置"""
-        try:
-            # 检测系统可用字体
-            available_fonts = font.families()
-            
-            # 优选字体列表（按优先级）
-            font_preferences = {
-                'sans': ['Segoe UI', 'Arial', 'Microsoft YaHei UI'],
-                'mono': ['Consolas', 'Courier New']
-            }
-            
-            # 选择最佳字体
-            best_fonts = {}
-            for font_type, font_list in font_preferences.items():
-                for font_name in font_list:
-                    if font_name in available_fonts:
-                        best_fonts[font_type] = font_name
-                        break
-                else:
-                    # 默认字体
-                    best_fonts[font_type] = font_list[-1]
-            
-            # 创建字体对象，启用抗锯齿
-            fonts = {
-                'title': font.Font(family=best_fonts['sans'], size=12, weight='bold'),
-                'subtitle': font.Font(family=best_fonts['sans'], size=10, weight='bold'),
-                'body': font.Font(family=best_fonts['sans'], size=9, weight='normal'),
-                'caption': font.Font(family=best_fonts['sans'], size=8, weight='normal'),
-                'button': font.Font(family=best_fonts['sans'], size=9, weight='normal'),
-                'status': font.Font(family=best_fonts['sans'], size=8, weight='normal')
-            }
-            
-            return fonts
-            
-        except Exception as e:
-            print(f"字体配置警告: {e}")
-            # 返回默认字体（更大尺寸，特别加大按钮字体）
-            return {
-                'title': ('Arial', 16, 'bold'),
-                'subtitle': ('Arial', 13, 'bold'),
-                'body': ('Arial', 11, 'normal'),
-                'caption': ('Arial', 10, 'normal'),
-                'button': ('Arial', 14, 'normal'),  # 大幅增加按钮字体
-                'status': ('Arial', 11, 'normal')
-            }
-    
     def get_current_colors(self):
         """获取当前主题颜色（带缓存）"""
         if self.current_theme not in self._color_cache:
@@ -177,14 +166,34 @@ class ThemeManager:
         return self.conference_colors.get(conference_type, {}).get(self.current_theme, {})
     
     def apply_theme(self):
-        """应用当前主题"""
+        """应用当前主题（样式已预热时只是按名称切换ttk主题）"""
         colors = self.get_current_colors()
         
         # 应用 sv-ttk 主题
-        if self.current_theme == "dark":
-            sv_ttk.set_theme("dark")
+        self._use_theme(self.current_theme)
+        
+        # ttk样式属于各自的主题，每个主题只需配置一次
+        if self.current_theme not in self._prepared_themes:
+            self._configure_styles(self.current_theme)
+        
+        # 设置窗口背景
+        self.root.configure(bg=colors["bg"])
+        
+        # 原地重新着色已登记的控件
+        self._recolor_registered()
+    
+    def _use_theme(self, theme):
+        """切换ttk主题；sv-ttk 的Tcl文件只在第一次调用时加载"""
+        if hasattr(self.root, "_sv_ttk_loaded"):
+            self.style.theme_use(self.SV_THEMES[theme])
         else:
-            sv_ttk.set_theme("light")
+            # 首次应用主题时才导入 sv_ttk
+            import sv_ttk
+            sv_ttk.set_theme(theme)
+    
+    def _configure_styles(self, theme):
+        """在当前激活的ttk主题中配置自定义样式（调用前需已切换到 theme）"""
+        colors = self.colors[theme]
         
         # 自定义样式（使用更大的字体）
         self.style.configure("Card.TFrame", 
@@ -223,15 +232,43 @@ class ThemeManager:
                            foreground=colors["text_secondary"],
                            font=self.get_font('status'))
         
-        # 设置窗口背景
-        self.root.configure(bg=colors["bg"])
+        # 各会议类型的卡片样式
+        for conference_type in self._card_styles:
+            self._configure_card_style(conference_type, theme)
+        
+        self._prepared_themes.add(theme)
+    
+    def schedule_preload(self):
+        """首次绘制完成后，在空闲时预热其余主题"""
+        def preload_when_idle():
+            self._preload_pending = self.root.after_idle(self.preload_themes)
+        self._preload_pending = self.root.after(self.PRELOAD_DELAY, preload_when_idle)
+    
+    def preload_themes(self):
+        """
+        预先加载两套 sv-ttk 主题并配置全部样式
+        之后每次切换都只是 theme_use + 原地着色，首次切换不再额外加载Tcl主题
+        """
+        self._preload_pending = None
+        pending = [theme for theme in self.SV_THEMES if theme not in self._prepared_themes]
+        if not pending:
+            return
+        
+        # 在同一个回调里切过去再切回来，中间不会重绘，界面不闪烁
+        for theme in pending:
+            self._use_theme(theme)
+            self._configure_styles(theme)
+        self._use_theme(self.current_theme)
+        
+        # 切换主题会触发 sv-ttk 重设经典控件的调色板，恢复登记过的颜色
+        self.root.configure(bg=self.get_current_colors()["bg"])
+        self._recolor_registered()
     
     def toggle_theme(self):
-        """切换主题（优化版本）"""
+        """切换主题（原地重新着色，不重建控件）"""
         self.current_theme = "dark" if self.current_theme == "light" else "light"
-        # 清除缓存以强制重新加载
+        # 清除颜色缓存以强制重新加载（字体与主题无关，保留）
         self._color_cache.clear()
-        self._font_cache.clear()
         self.apply_theme()
         return self.current_theme
     
@@ -239,56 +276,98 @@ class ThemeManager:
         """设置指定主题"""
         if theme_name in self.colors:
             self.current_theme = theme_name
+            self._color_cache.clear()
             self.apply_theme()
     
-    def create_card_style(self, conference_type="default"):
-        """创建卡片样式"""
-        colors = self.get_current_colors()
-        conf_colors = self.get_conference_colors(conference_type)
+    def register_themed_widget(self, widget, **options):
+        """
+        登记带颜色的控件，切换主题时原地更新
+        options: 控件选项=颜色名，颜色名为配色方案中的键（如 fg="primary"），
+                 或 (会议类型, 键) 表示会议配色（如 bg=("ai", "border")）
+        再次登记同一控件会覆盖之前的设置（卡片换绑到其他会议时）
+        """
+        self._themed_widgets[widget] = options
+        self._configure_colors(widget, options)
+    
+    def add_theme_listener(self, callback):
+        """登记主题切换回调（如Canvas绘制的卡片），回调无参数"""
+        self._theme_listeners.append(callback)
+    
+    def _resolve_color(self, spec):
+        if isinstance(spec, tuple):
+            conference_type, key = spec
+            conf_colors = self.get_conference_colors(conference_type)
+            return conf_colors.get(key, self.get_current_colors()["primary"])
+        return self.get_current_colors()[spec]
+    
+    def _configure_colors(self, widget, options):
+        widget.configure(**{option: self._resolve_color(spec) for option, spec in options.items()})
+    
+    def _recolor_registered(self):
+        """遍历已登记的控件重新着色，已销毁的控件自动移除"""
+        for widget, options in list(self._themed_widgets.items()):
+            try:
+                self._configure_colors(widget, options)
+            except tk.TclError:
+                del self._themed_widgets[widget]
         
+        for callback in self._theme_listeners:
+            callback()
+    
+    def get_themed_widget_count(self):
+        """已登记的着色控件和回调数量"""
+        return len(self._themed_widgets) + len(self._theme_listeners)
+    
+    def create_card_style(self, conference_type="default"):
+        """获取卡片样式名（当前主题中尚未配置时才配置）"""
         style_name = f"{conference_type.title()}.Card.TFrame"
+        self._card_styles.add(conference_type)
         
-        if conf_colors:
-            self.style.configure(style_name,
-                               background=conf_colors["bg"],
-                               relief="solid",
-                               borderwidth=1)
-        else:
-            self.style.configure(style_name,
-                               background=colors["card_bg"],
-                               relief="solid",
-                               borderwidth=1)
+        if (self.current_theme, conference_type) not in self._configured_card_styles:
+            self._configure_card_style(conference_type, self.current_theme)
         
         return style_name
     
-    def get_font(self, font_type, scale_factor=1.0):
-        """获取指定类型的字体，支持动态缩放（带缓存）"""
-        # 创建缓存键
-        cache_key = (font_type, scale_factor)
-        
-        if cache_key in self._font_cache:
-            return self._font_cache[cache_key]
-        
-        # 增大字体大小，提升可读性（特别加大按钮字体）
-        base_font_configs = {
-            'title': ('Arial', 16, 'bold'),      # 12 -> 16
-            'subtitle': ('Arial', 13, 'bold'),   # 10 -> 13  
-            'body': ('Arial', 11, 'normal'),     # 9 -> 11
-            'caption': ('Arial', 10, 'normal'),  # 8 -> 10
-            'button': ('Arial', 14, 'normal'),   # 9 -> 11 -> 14 (大幅增加)
-            'status': ('Arial', 11, 'normal')    # 8 -> 10 -> 11
-        }
+    def _configure_card_style(self, conference_type, theme):
+        """在当前激活的ttk主题中配置会议卡片样式"""
+        conf_colors = self.conference_colors.get(conference_type, {}).get(theme)
+        background = conf_colors["bg"] if conf_colors else self.colors[theme]["card_bg"]
         
-        base_config = base_font_configs.get(font_type, ('Arial', 11, 'normal'))
-        family, size, weight = base_config
-        
-        # 应用缩放因子
-        scaled_size = max(8, int(size * scale_factor))
-        
-        result = (family, scaled_size, weight)
-        # 缓存结果
-        self._font_cache[cache_key] = result
-        return result
+        self.style.configure(f"{conference_type.title()}.Card.TFrame",
+                           background=background,
+                           relief="solid",
+                           borderwidth=1)
+        self._configured_card_styles.add((theme, conference_type))
+    
+    def get_font(self, font_type):
+        """
+        获取指定角色的共享字体（tkinter.font.Font）
+        同一角色的控件共用一个字体对象，缩放由 set_scale_factor 统一调整字号，
+        所有控件随之自动重新布局。
+        """
+        named_font = self._named_fonts.get(font_type)
+        if named_font is None:
+            category, _, weight = self.BASE_FONTS.get(font_type, self.DEFAULT_FONT)
+            named_font = font.Font(
+                root=self.root,
+                family=self.font_families[category],
+                size=self._scaled_size(font_type, self.current_scale_factor),
+                weight=weight
+            )
+            self._named_fonts[font_type] = named_font
+        return named_font
+    
+    def set_scale_factor(self, scale_factor):
+        """按新的缩放因子调整所有共享字体的字号（不重建任何控件）"""
+        if scale_factor == self.current_scale_factor:
+            return
+        self.current_scale_factor = scale_factor
+        for font_type, named_font in self._named_fonts.items():
+            named_font.configure(size=self._scaled_size(font_type, scale_factor))
+    
+    def _scaled_size(self, font_type, scale_factor):
+        size = self.BASE_FONTS.get(font_type, self.DEFAULT_FONT)[1]
+        return max(8, int(size * scale_factor))
     
     def get_conference_type(self, conference_name):
         """根据会议名称判断类型"""
@@ -1,14 +1,16 @@
-import pystray
-from PIL import Image, ImageDraw
 import threading
 
+from api import profiling
+
 class TrayIcon:
     def __init__(self, main_window):
         self.main_window = main_window
         self.icon = None
-        
+    
     def create_image(self):
         """创建托盘图标"""
+        from PIL import Image, ImageDraw
+        
         # 创建一个简单的图标
         width = 64
         height = 64
@@ -24,50 +26,69 @@ class TrayIcon:
         
         return image
     
+    # 菜单回调运行在 pystray 线程中，界面操作都投递到主窗口的调度队列
+    
     def show_window(self, icon, item):
         """显示主窗口"""
+        self.main_window.dispatcher.post(self._show_window)
+    
+    def _show_window(self):
         self.main_window.root.deiconify()
         self.main_window.root.lift()
     
     def refresh_papers(self, icon, item):
         """刷新论文"""
-        self.main_window.root.after(0, self.main_window.refresh_papers)
+        self.main_window.dispatcher.post(self.main_window.refresh_papers)
     
     def update_cache(self, icon, item):
         """更新缓存"""
-        self.main_window.root.after(0, self.main_window.update_cache_async)
+        self.main_window.dispatcher.post(self.main_window.update_cache_async)
+    
+    def show_loop_monitor(self, icon, item):
+        """打开事件循环监视面板"""
+        self.main_window.dispatcher.post(self.main_window.show_loop_monitor)
+    
+    def toggle_profiling(self, icon, item):
+        """打开或关闭性能分析模式（只切换开关，不涉及界面）"""
+        profiling.set_enabled(not profiling.is_enabled())
     
     def quit_app(self, icon, item):
         """退出应用"""
         if self.icon:
             self.icon.stop()
-        self.main_window.root.quit()
+        self.main_window.dispatcher.post(self.main_window.root.quit)
     
     def create_menu(self):
         """创建托盘菜单"""
+        import pystray
+        
         return pystray.Menu(
             pystray.MenuItem("显示窗口", self.show_window, default=True),
             pystray.MenuItem("-", None),
             pystray.MenuItem("刷新论文", self.refresh_papers),
             pystray.MenuItem("更新数据库", self.update_cache),
             pystray.MenuItem("-", None),
+            pystray.MenuItem("事件循环监视器", self.show_loop_monitor),
+            pystray.MenuItem("性能分析模式", self.toggle_profiling,
+                             checked=lambda item: profiling.is_enabled()),
             pystray.MenuItem("退出", self.quit_app)
         )
     
     def run(self):
-        """运行托盘图标"""
-        image = self.create_image()
-        menu = self.create_menu()
-        
-        self.icon = pystray.Icon(
-            "paper_widget",
-            image,
-            "论文推送助手",
-            menu
-        )
-        
+        """
+        运行托盘图标（图标和菜单也在托盘线程中创建）
+        pystray 和 PIL 只在托盘线程中导入，不占用启动时间
+        """
         # 在新线程中运行托盘图标
         def run_icon():
+            import pystray
+            
+            self.icon = pystray.Icon(
+                "paper_widget",
+                self.create_image(),
+                "论文推送助手",
+                self.create_menu()
+            )
             self.icon.run()
         
         thread = threading.Thread(target=run_icon, daemon=True)
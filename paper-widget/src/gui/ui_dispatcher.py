@@ -0,0 +1,56 @@
+import queue
+import traceback
+
+
+class UIDispatcher:
+    """
+    线程安全的界面调度队列
+    后台线程（数据库更新、清空、数据服务、托盘图标）只调用 post() 投递回调，
+    不直接调用任何Tk方法；主线程用一个 after 定时泵批量取出并执行。
+    """
+
+    # 泵的轮询间隔（毫秒）
+    INTERVAL_MS = 30
+
+    # 每轮最多执行的回调数，避免大量消息时长时间占用主线程
+    MAX_BATCH = 200
+
+    def __init__(self, root):
+        self.root = root
+        self._queue = queue.SimpleQueue()
+        self._timer = None
+
+    def start(self):
+        """启动调度泵（在主线程调用）"""
+        if self._timer is None:
+            self._timer = self.root.after(self.INTERVAL_MS, self._pump)
+
+    def stop(self):
+        if self._timer is not None:
+            self.root.after_cancel(self._timer)
+            self._timer = None
+
+    def post(self, callback, *args):
+        """投递一个在主线程执行的回调（可在任意线程调用）"""
+        self._queue.put((callback, args))
+
+    def pending(self):
+        """队列中尚未执行的回调数量（近似值）"""
+        return self._queue.qsize()
+
+    def _pump(self):
+        for _ in range(self.MAX_BATCH):
+            try:
+                callback, args = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            try:
+                callback(*args)
+            except Exception:
+                # 单个回调出错不影响后续消息
+                traceback.print_exc()
+
+        # 队列未清空时尽快继续，否则按间隔轮询
+        delay = 1 if not self._queue.empty() else self.INTERVAL_MS
+        self._timer = self.root.after(delay, self._pump)
@@ -0,0 +1,64 @@
+import json
+import os
+import re
+from datetime import datetime
+
+# 快照格式版本，字段变化时递增，旧版本快照直接忽略
+SNAPSHOT_VERSION = 1
+
+# 论文中只在内存里使用的字段，不写入快照
+_TRANSIENT_PAPER_KEYS = ('display_texts',)
+
+
+class ViewSnapshot:
+    """
+    上次显示的界面快照
+    退出时把最后显示的一批论文和窗口状态（大小位置、主题、置顶、滚动位置）写入小的JSON文件；
+    下次启动时先按快照绘制窗口和卡片，数据库和获取器在后台初始化，首张卡片不必等待它们。
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        """读取快照；文件不存在、损坏或版本不符时返回None"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(state, dict) or state.get('version') != SNAPSHOT_VERSION:
+            return None
+        if not isinstance(state.get('papers'), list):
+            state['papers'] = []
+        return state
+
+    def save(self, papers, geometry=None, theme=None, topmost=False, scroll=0.0):
+        """写入快照（先写临时文件再替换，退出时被中断也不会留下半个文件）"""
+        state = {
+            'version': SNAPSHOT_VERSION,
+            'saved_at': datetime.now().isoformat(timespec='seconds'),
+            'geometry': geometry,
+            'theme': theme,
+            'topmost': bool(topmost),
+            'scroll': scroll,
+            'papers': [
+                {key: value for key, value in paper.items() if key not in _TRANSIENT_PAPER_KEYS}
+                for paper in papers
+            ],
+        }
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, default=str)
+        os.replace(temp_path, self.path)
+
+
+def parse_geometry_size(geometry):
+    """从 "宽x高+x+y" 形式的几何字符串中取出 (宽, 高)，格式不对时返回None"""
+    match = re.match(r'^(\d+)x(\d+)', geometry or '')
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2))
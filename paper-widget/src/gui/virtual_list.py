@@ -0,0 +1,256 @@
+from bisect import bisect_left, bisect_right
+
+
+class VirtualCardList:
+    """
+    虚拟化论文列表
+    基于现有的 Canvas + scrollable_frame：Canvas 的滚动区域为全部卡片的总高度（未测量的按估算高度），
+    但只有视口附近的卡片才真正绑定数据。scrollable_frame 只有这些卡片那么高，它在 Canvas 中的
+    窗口项随滚动移到第一张卡片的位置，卡片相对它用 place 摆放。X11 的窗口尺寸和坐标是16位的，
+    若让 frame 与整个列表一样高，几百张卡片之后就会溢出。
+    滚动时移出视口的卡片回收到空闲池，再绑定给新进入视口的论文。
+    视口内的卡片立即绑定，视口上下余量区的卡片分块在后续回调中绑定，不阻塞输入；
+    新的刷新、调整大小或主题切换会取消尚未完成的分块渲染。
+    """
+
+    # 视口上下各多渲染多少个视口高度，滚动时不露白
+    OVERSCAN = 1.0
+
+    # 余量区每个回调绑定的卡片数
+    CHUNK_SIZE = 3
+
+    # 尚未测量的卡片使用的估算高度（有测量值后改用平均值）
+    DEFAULT_HEIGHT = 160
+
+    def __init__(self, canvas, frame, scrollbar, create_card, bind_card, window_item=None):
+        """
+        Args:
+            canvas: 承载列表的Canvas
+            frame: Canvas中的scrollable_frame（Canvas绘制模式下为None）
+            scrollbar: 纵向滚动条
+            create_card: 创建一张空卡片的函数
+            bind_card: bind_card(card, index) 把第index篇论文绑定到卡片上
+            window_item: 嵌入 frame 的 Canvas 窗口项（随可见范围移动）
+        """
+        self.canvas = canvas
+        self.frame = frame
+        self.scrollbar = scrollbar
+        self.create_card = create_card
+        self.bind_card = bind_card
+        self.window_item = window_item
+
+        self.count = 0
+        self.heights = []      # 已测量的高度，未测量为None
+        self.offsets = [0]     # offsets[i] 为第i张卡片的顶部位置
+        self.active = {}       # 正在显示的 {索引: 卡片}
+        self.free = []         # 空闲卡片池
+        self.origin = 0        # frame 顶部在 Canvas 中的y位置（卡片相对它摆放）
+
+        self._measured_total = 0
+        self._measured_count = 0
+        self._update_pending = None
+        self._render_pending = None
+        self._pending_indices = []
+
+        # 滚动位置变化时更新可见范围
+        canvas.configure(yscrollcommand=self.on_yscroll)
+
+    @property
+    def cards(self):
+        """所有已创建的卡片（显示中和空闲的）"""
+        return list(self.active.values()) + self.free
+
+    def set_count(self, count):
+        """换成新的一批论文：回收全部卡片，回到顶部"""
+        self.cancel_render()
+        self._recycle(list(self.active))
+        self.count = count
+        self.heights = [None] * count
+        self._measured_total = 0
+        self._measured_count = 0
+        self._rebuild_offsets()
+        self.canvas.yview_moveto(0)
+        self.update_viewport()
+
+    def invalidate(self):
+        """布局参数（缩放、主题）变化：重新绑定可见卡片并重新测量"""
+        self.cancel_render()
+        self.heights = [None] * self.count
+        self._measured_total = 0
+        self._measured_count = 0
+        indices = list(self.active)
+        self._recycle(indices)
+        self._rebuild_offsets()
+        self.update_viewport()
+
+    def remeasure(self):
+        """卡片尺寸原地变化（换行宽度、字号）后重新测量显示中的卡片，不重新绑定"""
+        self.cancel_render()
+        if not self.active:
+            return
+
+        # 视口外卡片的旧高度按旧宽度测得，改用新的平均高度估算
+        self.heights = [None] * self.count
+        self._measured_total = 0
+        self._measured_count = 0
+        self._measure(list(self.active), min(self.active))
+
+        self._layout_active()
+        self.schedule_update()
+
+    def on_yscroll(self, first, last):
+        """Canvas的yscrollcommand：同步滚动条并安排可见范围更新"""
+        self.scrollbar.set(first, last)
+        self.schedule_update()
+
+    def schedule_update(self):
+        """合并同一轮事件中的多次更新请求"""
+        if self._update_pending is None:
+            self._update_pending = self.canvas.after_idle(self.update_viewport)
+
+    def cancel_render(self):
+        """取消尚未完成的分块渲染（之后由 update_viewport 重新安排）"""
+        if self._render_pending is not None:
+            self.canvas.after_cancel(self._render_pending)
+            self._render_pending = None
+        self._pending_indices = []
+
+    def update_viewport(self):
+        """绑定并摆放视口附近的卡片，回收视口外的卡片"""
+        self._update_pending = None
+        if self.count == 0:
+            return
+
+        first, last = self._visible_range()
+        view_first, view_last = self._visible_range(overscan=0)
+
+        # 回收移出范围的卡片
+        self._recycle([i for i in self.active if i < first or i > last])
+
+        # 视口内的卡片立即绑定，第一屏马上出现
+        self._bind_indices([i for i in range(view_first, view_last + 1) if i not in self.active],
+                           view_first)
+
+        # 余量区的卡片由近及远分块绑定（按实测高度重新计算范围）
+        first, last = self._visible_range()
+        center = (view_first + view_last) / 2
+        self._pending_indices = sorted(
+            (i for i in range(first, last + 1) if i not in self.active),
+            key=lambda i: abs(i - center)
+        )
+        if self._pending_indices and self._render_pending is None:
+            self._render_pending = self.canvas.after(0, self._render_chunk)
+
+        self._layout_active()
+
+    def _render_chunk(self):
+        """绑定下一块余量区卡片，剩余的留给下一个回调"""
+        self._render_pending = None
+        if self.count == 0:
+            return
+
+        first, last = self._visible_range()
+        # 滚动后 update_viewport 尚未执行时，先回收远处的卡片，frame 只覆盖当前范围
+        self._recycle([i for i in self.active if i < first or i > last])
+        pending = [i for i in self._pending_indices if first <= i <= last and i not in self.active]
+        chunk = pending[:self.CHUNK_SIZE]
+        self._pending_indices = pending[self.CHUNK_SIZE:]
+
+        self._bind_indices(chunk, self._visible_range(overscan=0)[0])
+        self._layout_active()
+
+        if self._pending_indices:
+            self._render_pending = self.canvas.after(0, self._render_chunk)
+
+    def _bind_indices(self, indices, anchor_index):
+        """从空闲池取卡片绑定到指定索引并测量高度"""
+        if not indices:
+            return
+
+        for index in indices:
+            card = self.free.pop() if self.free else self.create_card()
+            self.bind_card(card, index)
+            self.active[index] = card
+
+        # 先按估算位置摆放（frame 随之移到新的范围），再测量实际高度
+        self._layout_active()
+        self._measure(indices, anchor_index)
+
+    def _visible_range(self, overscan=None):
+        if overscan is None:
+            overscan = self.OVERSCAN
+        view_height = max(1, self.canvas.winfo_height())
+        top = self.canvas.canvasy(0)
+        margin = view_height * overscan
+
+        first = max(0, bisect_right(self.offsets, top - margin) - 1)
+        last = min(self.count - 1, bisect_left(self.offsets, top + view_height + margin))
+        return first, max(first, last)
+
+    def _measure(self, indices, anchor_index):
+        """测量新绑定卡片的实际高度，高度变化时保持锚点卡片位置不跳动"""
+        if self.frame is not None:
+            self.frame.update_idletasks()
+
+        changed = False
+        for index in indices:
+            height = self.active[index].slot_height()
+            old = self.heights[index]
+            if old != height:
+                if old is None:
+                    self._measured_count += 1
+                else:
+                    self._measured_total -= old
+                self._measured_total += height
+                self.heights[index] = height
+                changed = True
+
+        if not changed:
+            return
+
+        anchor_before = self.offsets[anchor_index]
+        top = self.canvas.canvasy(0)
+        self._rebuild_offsets()
+
+        # 锚点上方的估算高度被替换为实测值时，补偿滚动位置
+        delta = self.offsets[anchor_index] - anchor_before
+        if delta and top > 0:
+            self.canvas.yview_moveto((top + delta) / max(1, self.offsets[-1]))
+
+    def _rebuild_offsets(self):
+        estimate = (self._measured_total / self._measured_count
+                    if self._measured_count else self.DEFAULT_HEIGHT)
+        offsets = [0]
+        total = 0
+        for height in self.heights:
+            total += height if height is not None else estimate
+            offsets.append(int(total))
+        self.offsets = offsets
+        # 滚动区域由列表维护（Canvas坐标不受16位限制），不随 scrollable_frame 的大小变化
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), max(1, offsets[-1])))
+
+    def _layout_active(self):
+        """
+        摆放显示中的卡片
+        widgets 模式下先把 frame 移到第一张显示中卡片的位置、高度设为这些卡片的总高度，
+        卡片的 place 坐标相对 frame，不会超出16位范围
+        """
+        if self.frame is not None:
+            if self.active:
+                origin = self.offsets[min(self.active)]
+                height = self.offsets[max(self.active) + 1] - origin
+            else:
+                origin, height = self.offsets[0], 0
+            if origin != self.origin and self.window_item is not None:
+                self.canvas.coords(self.window_item, 0, origin)
+            self.origin = origin
+            self.frame.configure(height=max(1, height))
+
+        for index, card in self.active.items():
+            card.place_at(self.offsets[index] - self.origin)
+
+    def _recycle(self, indices):
+        for index in indices:
+            card = self.active.pop(index)
+            card.hide()
+            self.free.append(card)